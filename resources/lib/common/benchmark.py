@@ -0,0 +1,413 @@
+"""
+Developer benchmarks for hot code paths.
+Run with plugin://plugin.video.seren/?action=runBenchmark&action_args=<benchmark name>
+"""
+import copy
+import json
+import os
+import random
+import time
+
+import xbmcgui
+import xbmcvfs
+
+from resources.lib.modules.globals import g
+
+CORPUS_LIMIT = 50000
+
+
+def _corpus_path(file_name):
+    return os.path.join(g.ADDON_USERDATA_PATH, "benchmarks", file_name)
+
+
+def _time_call(func, *args, repeat=3):
+    """
+    Runs a callable several times and returns the best run time
+    :param func: Callable to time
+    :param args: Arguments to pass to the callable
+    :param repeat: Number of runs
+    :return: Best run time in seconds
+    :rtype: float
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def load_release_titles(limit=CORPUS_LIMIT):
+    """
+    Loads a corpus of release titles, one title per line from userdata/benchmarks/release_titles.txt.
+    Falls back to the release titles stored in the local torrent cache
+    :param limit: Maximum number of titles to load
+    :return: List of release titles
+    :rtype: list
+    """
+    corpus_file = _corpus_path("release_titles.txt")
+    if xbmcvfs.exists(corpus_file):
+        titles = [i.strip() for i in g.read_all_text(corpus_file).splitlines() if i.strip()]
+        return titles[:limit]
+
+    from resources.lib.database.torrentCache import TorrentCache
+
+    torrents = TorrentCache().fetchall(
+        f"SELECT torrent_object FROM movies UNION ALL SELECT torrent_object FROM tvshows LIMIT {int(limit)}"
+    )
+    return [i["torrent_object"]["release_title"] for i in torrents if i["torrent_object"].get("release_title")]
+
+
+def release_title_parser():
+    """
+    Benchmarks get_quality/get_info over the release title corpus, uncached and memoised
+    :return: Lines of results
+    :rtype: list
+    """
+    from resources.lib.common import source_utils
+
+    titles = load_release_titles()
+    if not titles:
+        return ["No release titles available to benchmark"]
+
+    def _parse_uncached(corpus):
+        for title in corpus:
+            source_utils._get_quality(title)
+            source_utils._get_info(title)
+
+    def _parse_memoised(corpus):
+        for title in corpus:
+            source_utils.get_quality(title)
+            source_utils.get_info(title)
+
+    source_utils._parse_release_title.cache_clear()
+    uncached = _time_call(_parse_uncached, titles)
+    cold = _time_call(_parse_memoised, titles, repeat=1)
+    warm = _time_call(_parse_memoised, titles)
+    unique = len(set(titles))
+
+    return [
+        f"Release titles: {len(titles)} ({unique} unique)",
+        f"Single pass parse: {uncached:.3f}s ({uncached / len(titles) * 1e6:.1f}us per title)",
+        f"Memoised, cold: {cold:.3f}s",
+        f"Memoised, warm: {warm:.3f}s ({warm / len(titles) * 1e6:.1f}us per title)",
+    ]
+
+
+def build_sources(count=5000):
+    """
+    Builds a list of synthetic sources from the release title corpus
+    :param count: Number of sources to build
+    :return: List of sources
+    :rtype: list
+    """
+    from resources.lib.common import source_utils
+
+    titles = load_release_titles(count) or ["Seren.Benchmark.2020.1080p.WEB.H264-SEREN"]
+    rand = random.Random(count)
+    sources = []
+    for idx in range(count):
+        release_title = titles[idx % len(titles)]
+        source_type = rand.choice(["torrent", "hoster", "cloud", "adaptive", "direct"])
+        source = {
+            "type": source_type,
+            "release_title": release_title,
+            "quality": source_utils.get_quality(release_title),
+            "info": source_utils.get_info(release_title),
+            "size": rand.randint(100, 40000) if source_type != "adaptive" else "Variable",
+            "provider": "BENCHMARK",
+            "source": "BENCHMARK",
+        }
+        if source_type in ["torrent", "hoster", "cloud"]:
+            source["debrid_provider"] = rand.choice(["premiumize", "real_debrid", "all_debrid"])
+        sources.append(source)
+    return sources
+
+
+def source_sorter():
+    """
+    Benchmarks SourceSorter filtering and sorting over 5,000 sources
+    :return: Lines of results
+    :rtype: list
+    """
+    from resources.lib.modules.source_sorter import SourceSorter
+
+    sources = build_sources()
+    item_information = {"info": {"mediatype": g.MEDIA_MOVIE}}
+
+    def _filter(sorter):
+        list(sorter.filter_sources(sources))
+
+    def _progress_updates(sorter):
+        for _ in range(50):
+            list(sorter.filter_sources(sources))
+
+    sorter = SourceSorter(item_information)
+    first_filter = _time_call(_filter, sorter, repeat=1)
+    progress_updates = _time_call(_progress_updates, sorter, repeat=1)
+    sort = _time_call(lambda: SourceSorter(item_information).sort_sources(sources))
+
+    return [
+        f"Sources: {len(sources)}",
+        f"First filter (builds features): {first_filter:.3f}s",
+        f"50 progress update filters: {progress_updates:.3f}s",
+        f"Filter and sort with a new sorter: {sort:.3f}s",
+    ]
+
+
+def _scrape_replay(delay_scale):
+    from resources.lib.common import scrape_replay
+
+    fixtures = scrape_replay.load_fixtures()
+    if not fixtures:
+        return [f"No recorded scrapes in {scrape_replay.fixtures_path()}, enable scrape recording to create them"]
+
+    results = [f"Version: {g.VERSION}, delay scale: {delay_scale}"]
+    for file_name, fixture in fixtures:
+        replay = scrape_replay.replay(fixture, delay_scale)
+        first_source = f"{replay['first_source']:.3f}s" if replay['first_source'] is not None else "none"
+        results.append(
+            f"{file_name} (recorded on {fixture['addon_version']}): {replay['sources']} sources, "
+            f"{replay['sorted']} after sorting, wall {replay['wall']:.3f}s, cpu {replay['cpu']:.3f}s, "
+            f"first source {first_source}, {replay['sources'] / max(replay['wall'], 1e-6):.0f} sources/s"
+        )
+    return results
+
+
+def scrape_replay_compressed():
+    """
+    Replays every recorded scrape without provider or debrid delays, measuring pipeline throughput and CPU time
+    :return: Lines of results
+    :rtype: list
+    """
+    return _scrape_replay(0)
+
+
+def scrape_replay_realtime():
+    """
+    Replays every recorded scrape with the recorded provider and debrid delays, measuring time to first source
+    :return: Lines of results
+    :rtype: list
+    """
+    return _scrape_replay(1.0)
+
+
+# Representative payloads used when no recorded payloads are available, keyed by indexer then table
+SAMPLE_PAYLOADS = {
+    "trakt": {
+        "show": {
+            "type": "show",
+            "title": "Benchmark Show",
+            "year": 2015,
+            "ids": {"trakt": 1, "slug": "benchmark-show", "tvdb": 2, "imdb": "tt0000003", "tmdb": 4},
+            "overview": "A show used to benchmark normalisation.",
+            "first_aired": "2015-06-01T01:00:00.000Z",
+            "runtime": 45,
+            "certification": "TV-MA",
+            "network": "HBO",
+            "country": "us",
+            "updated_at": "2021-03-04T05:06:07.000Z",
+            "trailer": "https://youtube.com/watch?v=abcdefg",
+            "status": "returning series",
+            "rating": 8.51234,
+            "votes": 12345,
+            "language": "en",
+            "available_translations": ["en", "de", "fr"],
+            "genres": ["drama", "fantasy"],
+            "aired_episodes": 50,
+        },
+        "episode": {
+            "type": "episode",
+            "season": 1,
+            "number": 2,
+            "title": "Benchmark Episode",
+            "ids": {"trakt": 5, "tvdb": 6, "imdb": "tt0000007", "tmdb": 8},
+            "show": {"ids": {"trakt": 1}},
+            "overview": "An episode used to benchmark normalisation.",
+            "rating": 8.1,
+            "votes": 1234,
+            "first_aired": "2015-06-08T01:00:00.000Z",
+            "updated_at": "2021-03-04T05:06:07.000Z",
+            "available_translations": ["en", "de"],
+            "runtime": 55,
+        },
+        "movie": {
+            "type": "movie",
+            "title": "Benchmark Movie",
+            "year": 2019,
+            "ids": {"trakt": 9, "slug": "benchmark-movie", "imdb": "tt0000010", "tmdb": 11},
+            "tagline": "Benchmarking",
+            "overview": "A movie used to benchmark normalisation.",
+            "released": "2019-10-04",
+            "runtime": 122,
+            "country": "us",
+            "trailer": "https://youtube.com/watch?v=hijklmn",
+            "rating": 7.9,
+            "votes": 54321,
+            "updated_at": "2021-03-04T05:06:07.000Z",
+            "language": "en",
+            "available_translations": ["en", "de", "fr"],
+            "genres": ["crime", "drama"],
+            "certification": "R",
+        },
+    },
+    "tmdb": {
+        "tvshow": {
+            "mediatype": "tvshow",
+            "id": 4,
+            "name": "Benchmark Show",
+            "original_name": "Benchmark Show",
+            "overview": "A show used to benchmark normalisation.",
+            "first_air_date": "2015-06-01",
+            "episode_run_time": [45],
+            "genres": [{"id": 1, "name": "Drama"}, {"id": 2, "name": "Sci-Fi & Fantasy"}],
+            "networks": [{"name": "HBO"}],
+            "number_of_seasons": 5,
+            "status": "Returning Series",
+            "vote_average": 8.5,
+            "vote_count": 1234,
+            "external_ids": {"imdb_id": "tt0000003", "tvdb_id": 2},
+            "keywords": {"keywords": [{"name": "magic"}, {"name": "dragons"}]},
+            "origin_country": ["us"],
+            "credits": {
+                "crew": [{"name": "A Director", "job": "Director"}, {"name": "A Writer", "department": "Writing"}]
+            },
+        },
+        "movie": {
+            "mediatype": "movie",
+            "id": 11,
+            "title": "Benchmark Movie",
+            "original_title": "Benchmark Movie",
+            "overview": "A movie used to benchmark normalisation.",
+            "release_date": "2019-10-04",
+            "runtime": 122,
+            "genres": [{"id": 1, "name": "Crime"}, {"id": 2, "name": "Drama"}],
+            "imdb_id": "tt0000010",
+            "vote_average": 7.9,
+            "vote_count": 54321,
+            "tagline": "Benchmarking",
+            "keywords": {"keywords": [{"name": "heist"}, {"name": "city"}]},
+            "credits": {
+                "crew": [{"name": "A Director", "job": "Director"}, {"name": "A Writer", "department": "Writing"}]
+            },
+        },
+    },
+    "tvdb": {
+        "tvshow": {
+            "mediatype": "tvshow",
+            "id": 2,
+            "seriesName": "Benchmark Show",
+            "imdbId": "tt0000003",
+            "firstAired": "2015-06-01",
+            "overview": "A show used to benchmark normalisation.",
+            "status": "Continuing",
+            "runtime": "45",
+            "network": "HBO",
+            "genre": ["Drama", "Fantasy"],
+            "rating": "TV-MA",
+            "language": "en",
+            "aliases": ["Benchmark"],
+            "siteRating": 8.5,
+            "siteRatingCount": 1234,
+        },
+        "episode": {
+            "mediatype": "episode",
+            "id": 6,
+            "seriesId": 2,
+            "episodeName": "Benchmark Episode",
+            "airedSeason": 1,
+            "airedEpisodeNumber": 2,
+            "firstAired": "2015-06-08",
+            "overview": "An episode used to benchmark normalisation.",
+            "directors": ["A Director"],
+            "writers": ["A Writer", "Another Writer"],
+            "imdbId": "tt0000007",
+            "siteRating": 8.1,
+            "siteRatingCount": 123,
+        },
+    },
+}
+
+
+def load_metadata_payloads(indexer):
+    """
+    Loads recorded API payloads of an indexer from userdata/benchmarks/metadata/<indexer>.json, a dictionary of
+    lists of items keyed by the table they are normalised with. Falls back to the sample payloads
+    :param indexer: Name of indexer, trakt, tmdb or tvdb
+    :type indexer: str
+    :return: Dictionary of lists of items keyed by table
+    :rtype: dict
+    """
+    payload_file = _corpus_path(os.path.join("metadata", f"{indexer}.json"))
+    if xbmcvfs.exists(payload_file):
+        return json.loads(g.read_all_text(payload_file))
+    return {table: [copy.deepcopy(item) for _ in range(2000)] for table, item in SAMPLE_PAYLOADS[indexer].items()}
+
+
+def metadata_normalization():
+    """
+    Benchmarks normalising Trakt, TMDB and TVDB payloads with interpreted and compiled translation tables
+    :return: Lines of results
+    :rtype: list
+    """
+    from resources.lib.indexers.apibase import ApiBase
+    from resources.lib.indexers.tmdb import TMDBAPI
+    from resources.lib.indexers.trakt import TraktAPI
+    from resources.lib.indexers.tvdb import TVDBAPI
+
+    tables = {
+        "trakt": TraktAPI.MetaNormalization,
+        "tmdb": TMDBAPI.meta_objects,
+        "tvdb": TVDBAPI.meta_objects,
+    }
+    results = []
+    for indexer, indexer_tables in tables.items():
+        payloads = {table: items for table, items in load_metadata_payloads(indexer).items() if table in indexer_tables}
+        count = sum(len(items) for items in payloads.values())
+        if not count:
+            results.append(f"{indexer}: no payloads")
+            continue
+
+        def _normalize(normalize):
+            return [normalize(indexer_tables[table], items) for table, items in payloads.items()]
+
+        interpreted = _time_call(_normalize, ApiBase._interpret_info)
+        compiled = _time_call(_normalize, ApiBase._normalize_info)
+        matches = _normalize(ApiBase._interpret_info) == _normalize(ApiBase._normalize_info)
+        results.append(
+            f"{indexer}: {count} items, interpreted {interpreted:.3f}s, compiled {compiled:.3f}s "
+            f"({interpreted / max(compiled, 1e-9):.1f}x), output {'identical' if matches else 'DIFFERS'}"
+        )
+    return results
+
+
+BENCHMARKS = {
+    "releaseTitleParser": release_title_parser,
+    "sourceSorter": source_sorter,
+    "metadataNormalization": metadata_normalization,
+    "scrapeReplay": scrape_replay_compressed,
+    "scrapeReplayRealtime": scrape_replay_realtime,
+}
+
+
+def run_benchmark(name):
+    """
+    Runs a named benchmark, logs the results and displays them
+    :param name: Name of benchmark to run, runs all benchmarks if None
+    :type name: str|None
+    :return: None
+    :rtype: None
+    """
+    names = [name] if name else list(BENCHMARKS)
+    results = []
+    for benchmark_name in names:
+        if benchmark_name not in BENCHMARKS:
+            g.log(f"Unknown benchmark requested: {benchmark_name}", "error")
+            continue
+        results.append(f"[B]{benchmark_name}[/B]")
+        results.extend(BENCHMARKS[benchmark_name]())
+
+    for line in results:
+        g.log(f"Benchmark: {line}")
+    xbmcgui.Dialog().textviewer(g.ADDON_NAME, "\n".join(results))
@@ -0,0 +1,136 @@
+"""
+Incremental decoding of JSON arrays.
+Elements are decoded a chunk of the body at a time, so a large response is handled one element at a time without
+holding the whole body or its decoded tree in memory
+"""
+import codecs
+import functools
+import json
+import tempfile
+
+import xbmcvfs
+
+# Bytes read from the body at a time
+CHUNK_SIZE = 64 * 1024
+# Spooled bodies move from memory to a temporary file once larger than this
+SPOOL_MAX_SIZE = 1024 * 1024
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+# Characters that may follow an element of an array
+_DELIMITERS = _WHITESPACE + ",]"
+
+
+class _ArrayReader:
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+
+    def read(self, minimum=1):
+        """
+        Appends at least the given number of characters to the buffer, unless the body ends first
+        :param minimum: Number of characters to read
+        :type minimum: int
+        :return: True if anything was read
+        :rtype: bool
+        """
+        if self.eof:
+            return False
+        # Drop what was already decoded so the buffer only holds the element being decoded
+        self.buffer = self.buffer[self.position :]
+        self.position = 0
+        length = len(self.buffer)
+        for chunk in self._chunks:
+            self.buffer += self._text_decoder.decode(chunk)
+            if len(self.buffer) - length >= minimum:
+                return True
+        self.buffer += self._text_decoder.decode(b"", final=True)
+        self.eof = True
+        return len(self.buffer) > length
+
+    def next_token(self):
+        """
+        Skips whitespace and returns the next character without consuming it
+        :return: Next character, None at the end of the body
+        :rtype: str|None
+        """
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in _WHITESPACE:
+                self.position += 1
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self.read():
+                return None
+
+    def expect(self, *tokens):
+        token = self.next_token()
+        if token not in tokens:
+            raise json.JSONDecodeError(f"Expecting {' or '.join(tokens)}", self.buffer, self.position)
+        self.position += 1
+        return token
+
+    def decode_value(self):
+        if self.next_token() is None:
+            raise json.JSONDecodeError("Expecting value", self.buffer, self.position)
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.position)
+                # A number cut off by the end of a chunk decodes as a shorter number, so the end must be a delimiter
+                if self.eof or (end < len(self.buffer) and self.buffer[end] in _DELIMITERS):
+                    self.position = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # Doubling the buffer keeps retries of a large element linear in its size
+            self.read(max(len(self.buffer) - self.position, 1))
+
+
+def iter_json_array(chunks):
+    """
+    Decodes the elements of a JSON array as its bytes arrive
+    :param chunks: Iterable of the bytes of the array, such as requests.Response.iter_content
+    :type chunks: collections.abc.Iterable
+    :return: Yields each element of the array
+    :rtype: collections.abc.Iterator
+    :raises json.JSONDecodeError: When the body is not a JSON array or ends early
+    """
+    reader = _ArrayReader(chunks)
+    reader.expect("[")
+    if reader.next_token() == "]":
+        reader.position += 1
+        return
+    while True:
+        yield reader.decode_value()
+        if reader.expect(",", "]") == "]":
+            return
+
+
+def spool(chunks):
+    """
+    Stores a body in a temporary file, kept in memory while it is small.
+    Spooling releases the connection once the body is received, however long handling each element takes
+    :param chunks: Iterable of the bytes of the body
+    :type chunks: collections.abc.Iterable
+    :return: File positioned at the start of the body
+    :rtype: tempfile.SpooledTemporaryFile
+    """
+    body = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE, dir=xbmcvfs.translatePath("special://temp/"))
+    for chunk in chunks:
+        body.write(chunk)
+    body.seek(0)
+    return body
+
+
+def read_chunks(file):
+    """
+    Reads a file a chunk at a time
+    :param file: File opened in binary mode
+    :type file: typing.BinaryIO
+    :return: Yields chunks of CHUNK_SIZE bytes
+    :rtype: collections.abc.Iterator
+    """
+    return iter(functools.partial(file.read, CHUNK_SIZE), b"")
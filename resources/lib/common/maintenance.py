@@ -13,6 +13,7 @@ from resources.lib.debrid import premiumize
 from resources.lib.debrid import real_debrid
 from resources.lib.indexers.trakt import TraktAPI
 from resources.lib.indexers.tvdb import TVDBAPI
+from resources.lib.modules import cloud_scrapers
 from resources.lib.modules.globals import g
 from resources.lib.modules.providers.install_manager import ProviderInstallManager
 
@@ -235,5 +236,10 @@ def run_maintenance():
         except Exception as e:
             g.log(f"Failed to cleanup PM transfers: {e}", 'error')
 
+    try:
+        cloud_scrapers.refresh_cloud_indexes()
+    except Exception as e:
+        g.log(f"Failed to refresh cloud index: {e}", 'error')
+
     # clean_deprecated_settings()
     cache.Cache().check_cleanup()
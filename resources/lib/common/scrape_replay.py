@@ -0,0 +1,342 @@
+"""
+Record and replay of scrapes for offline benchmarking.
+A recording captures what providers, debrid cache checks and cloud inspection returned during a real scrape, and when.
+Replaying drives the scraping pipeline from a recording instead of the network, so runs are repeatable.
+Recordings are stored in userdata/benchmarks/scrapes
+"""
+import collections
+import copy
+import json
+import os
+import threading
+import time
+
+import xbmcvfs
+
+from resources.lib.common import tools
+from resources.lib.common.source_record import Source
+from resources.lib.modules import monkey_requests
+from resources.lib.modules.getSources import Sources
+from resources.lib.modules.getSources import SourceWindowAdapter
+from resources.lib.modules.globals import g
+
+FIXTURE_VERSION = 1
+RECORDED_PROVIDER_METHODS = {"movie", "tvshow", "episode", "sources"}
+DEBRID_SETTINGS = [
+    "premiumize.torrents",
+    "rd.torrents",
+    "alldebrid.torrents",
+    "premiumize.hosters",
+    "rd.hosters",
+    "alldebrid.hosters",
+]
+
+
+def fixtures_path():
+    return os.path.join(g.ADDON_USERDATA_PATH, "benchmarks", "scrapes")
+
+
+def _copy(value):
+    # Round trip through JSON so a recording holds exactly what a replay will see
+    return json.loads(json.dumps(value, default=tools.serialize_sets))
+
+
+class _RecordingProvider:
+    def __init__(self, recorder, provider, instance):
+        self._recorder = recorder
+        self._provider = provider
+        self._instance = instance
+
+    def __getattr__(self, name):
+        attribute = getattr(self._instance, name)
+        if name not in RECORDED_PROVIDER_METHODS or not callable(attribute):
+            return attribute
+
+        def _record(*args, **kwargs):
+            start = time.time()
+            result = attribute(*args, **kwargs)
+            self._recorder.add_provider_call(self._provider, name, start, result)
+            return result
+
+        return _record
+
+
+class ScrapeRecorder:
+    """
+    Captures provider results, debrid cache checks and cloud files of a scrape into a fixture
+    """
+
+    def __init__(self, item_information):
+        self._lock = threading.Lock()
+        self._start = time.time()
+        self.fixture = {
+            "fixture_version": FIXTURE_VERSION,
+            "addon_version": g.VERSION,
+            "recorded": int(self._start),
+            "item_information": _copy(item_information),
+            "timeout": g.get_int_setting("general.timeout"),
+            "debrid": {
+                "premiumize": g.premiumize_enabled(),
+                "real_debrid": g.real_debrid_enabled(),
+                "all_debrid": g.all_debrid_enabled(),
+                "settings": {i: g.get_bool_setting(i) for i in DEBRID_SETTINGS},
+            },
+            "providers": {},
+            "hoster_domains": {},
+            "provider_calls": [],
+            "debrid_checks": [],
+            "cloud": None,
+        }
+
+    def _append(self, key, value):
+        with self._lock:
+            self.fixture[key].append(value)
+
+    def set_providers(self, scraper):
+        self.fixture["providers"] = {
+            "torrent": scraper.torrent_providers,
+            "hosters": scraper.hoster_providers,
+            "adaptive": scraper.adaptive_providers,
+            "direct": scraper.direct_providers,
+        }
+        self.fixture["hoster_domains"] = _copy(scraper.hoster_domains)
+
+    def wrap_provider(self, provider, instance):
+        return _RecordingProvider(self, provider, instance)
+
+    def add_provider_call(self, provider, method, start, result):
+        self._append(
+            "provider_calls",
+            {
+                "provider": list(provider),
+                "method": method,
+                "start": start - self._start,
+                "duration": time.time() - start,
+                "result": _copy(result),
+            },
+        )
+
+    def check_hashes(self, debrid_provider, check, hashes):
+        start = time.time()
+        response = check(hashes)
+        self._append(
+            "debrid_checks",
+            {
+                "debrid_provider": debrid_provider,
+                "hashes": list(hashes),
+                "start": start - self._start,
+                "duration": time.time() - start,
+                "response": _copy(response),
+            },
+        )
+        return response
+
+    def add_cloud_files(self, cloud_scrapers, start, sources):
+        self.fixture["cloud"] = {
+            "scrapers": [i.__name__ for i in cloud_scrapers],
+            "start": start - self._start,
+            "duration": time.time() - start,
+            "sources": _copy(sources),
+        }
+
+    def save(self):
+        """
+        Writes the recording to the fixtures folder
+        :return: Path of the fixture
+        :rtype: str
+        """
+        info = self.fixture["item_information"]["info"]
+        path = os.path.join(
+            fixtures_path(), f"{self.fixture['recorded']}_{info['mediatype']}_{info.get('trakt_id', 0)}.json"
+        )
+        xbmcvfs.mkdirs(fixtures_path())
+        with self._lock:
+            g.write_all_text(path, json.dumps(self.fixture))
+        g.log(f"Recorded scrape to {path}", "info")
+        return path
+
+
+class _ReplayProvider:
+    def __init__(self, scraper, calls):
+        self._scraper = scraper
+        self._calls = calls
+
+    def __getattr__(self, name):
+        if name not in self._calls:
+            raise AttributeError(name)
+
+        def _replay(*args, **kwargs):
+            call = self._calls[name].popleft()
+            self._scraper.delay(call["duration"])
+            return copy.deepcopy(call["result"])
+
+        return _replay
+
+
+class ReplaySources(Sources):
+    """
+    Runs the scraping pipeline against a recorded scrape.
+    Local caches, telemetry and pre-termination are bypassed so every replay of a fixture does the same work
+    """
+
+    def __init__(self, fixture, delay_scale=1.0):
+        self.fixture = fixture
+        self.delay_scale = delay_scale
+        self.first_source = None
+        self._replay_calls = collections.defaultdict(lambda: collections.defaultdict(collections.deque))
+        for call in fixture["provider_calls"]:
+            self._replay_calls[tuple(call["provider"])][call["method"]].append(call)
+        self._replay_checks = {(i["debrid_provider"], tuple(sorted(i["hashes"]))): i for i in fixture["debrid_checks"]}
+
+        super().__init__(copy.deepcopy(fixture["item_information"]))
+        self.recorder = None
+        self.scrape_cache.enabled = False
+        self.timeout = fixture["timeout"]
+        self.window = SourceWindowAdapter(self.item_information, self, silent=True)
+        self._prem_terminate = self._disabled_prem_terminate
+
+    def delay(self, duration):
+        if self.delay_scale > 0:
+            time.sleep(duration * self.delay_scale)
+
+    def _get_imdb_info(self):
+        pass
+
+    def _check_local_torrent_database(self):
+        pass
+
+    def _get_cached_scrape_results(self):
+        pass
+
+    def _store_torrent_results(self, torrent_list):
+        pass
+
+    def _store_scrape_results(self, provider_type, provider_key, sources):
+        pass
+
+    def _store_provider_telemetry(self):
+        pass
+
+    def store_scrape_arrivals(self, cut_short=False):
+        pass
+
+    def _order_providers(self, providers):
+        return providers
+
+    def _init_providers(self):
+        providers = self.fixture["providers"]
+        self.torrent_providers = [tuple(i) for i in providers.get("torrent", [])]
+        self.hoster_providers = [tuple(i) for i in providers.get("hosters", [])]
+        self.adaptive_providers = [tuple(i) for i in providers.get("adaptive", [])]
+        self.direct_providers = [tuple(i) for i in providers.get("direct", [])]
+        self._set_hoster_domains(self.fixture["hoster_domains"])
+
+    def _get_provider_instance(self, provider, class_name):
+        calls = self._replay_calls.get(tuple(provider))
+        return _ReplayProvider(self, calls) if calls else None
+
+    def check_debrid_hashes(self, debrid_provider, check, hashes):
+        recorded = self._replay_checks.get((debrid_provider, tuple(sorted(hashes))))
+        if recorded is None:
+            g.log(f"No recorded {debrid_provider} cache check for {len(hashes)} hashes", "warning")
+            return None
+        self.delay(recorded["duration"])
+        return copy.deepcopy(recorded["response"])
+
+    def _user_cloud_inspection(self):
+        cloud = self.fixture["cloud"]
+        if not cloud or not cloud["scrapers"]:
+            return
+        self.cloud_scrapers = cloud["scrapers"]
+        self.sources_information['statistics']['remainingProviders'].append("Cloud Inspection")
+        try:
+            self.delay(cloud["duration"])
+            sources = [Source(source) for source in copy.deepcopy(cloud["sources"])]
+            self.mark_arrivals(sources)
+            self.sources_information['cloudFiles'] = sources
+        finally:
+            self.sources_information['statistics']['remainingProviders'].remove("Cloud Inspection")
+
+    def mark_arrivals(self, sources, from_cache=False):
+        sources = list(sources)
+        if sources and self.first_source is None:
+            self.first_source = time.time() - self._scrape_start
+        super().mark_arrivals(sources, from_cache)
+
+
+class _DebridEnvironment:
+    """
+    Makes the debrid services and settings of a recording the active ones for the duration of a replay
+    """
+
+    PATCHED = ("premiumize_enabled", "real_debrid_enabled", "all_debrid_enabled", "get_bool_setting")
+
+    def __init__(self, fixture):
+        self._debrid = fixture["debrid"]
+        self._shadowed = {}
+
+    def __enter__(self):
+        self._shadowed = {name: g.__dict__[name] for name in self.PATCHED if name in g.__dict__}
+        get_bool_setting = g.get_bool_setting
+        settings = self._debrid["settings"]
+        g.premiumize_enabled = lambda: self._debrid["premiumize"]
+        g.real_debrid_enabled = lambda: self._debrid["real_debrid"]
+        g.all_debrid_enabled = lambda: self._debrid["all_debrid"]
+        g.get_bool_setting = lambda setting_id, *args: (
+            settings[setting_id] if setting_id in settings else get_bool_setting(setting_id, *args)
+        )
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        # The patches shadow the methods of g, removing them restores the originals
+        for name in self.PATCHED:
+            g.__dict__.pop(name, None)
+        g.__dict__.update(self._shadowed)
+
+
+def load_fixtures():
+    """
+    Loads every recorded scrape from the fixtures folder
+    :return: List of (file name, fixture) tuples, oldest first
+    :rtype: list
+    """
+    if not xbmcvfs.exists(f"{fixtures_path()}{os.sep}"):
+        return []
+    fixtures = []
+    for file_name in sorted(xbmcvfs.listdir(fixtures_path())[1]):
+        if not file_name.endswith(".json"):
+            continue
+        fixture = json.loads(g.read_all_text(os.path.join(fixtures_path(), file_name)))
+        if fixture.get("fixture_version") == FIXTURE_VERSION:
+            fixtures.append((file_name, fixture))
+    return fixtures
+
+
+def replay(fixture, delay_scale=1.0):
+    """
+    Replays a recorded scrape through Sources, TorrentCacheCheck, SourceSorter and SourceWindowAdapter
+    :param fixture: Recorded scrape
+    :type fixture: dict
+    :param delay_scale: Multiplier for recorded provider and debrid delays, 0 replays without delays
+    :type delay_scale: float
+    :return: Dictionary of wall, cpu, first_source, sources and sorted results
+    :rtype: dict
+    """
+    from resources.lib.modules.source_sorter import SourceSorter
+
+    try:
+        with _DebridEnvironment(fixture):
+            cpu_start = time.process_time()
+            wall_start = time.time()
+            scraper = ReplaySources(fixture, delay_scale)
+            _, sources, item_information = scraper.get_sources() or (None, [], None)
+            sorted_sources = SourceSorter(scraper.item_information).sort_sources(sources)
+            return {
+                "wall": time.time() - wall_start,
+                "cpu": time.process_time() - cpu_start,
+                "first_source": scraper.first_source,
+                "sources": len(sources),
+                "sorted": len(sorted_sources),
+            }
+    finally:
+        monkey_requests.PRE_TERM_BLOCK = False
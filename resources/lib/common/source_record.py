@@ -0,0 +1,163 @@
+"""
+Compact record for scraped sources.
+Sources behave as mappings so providers, skins and the rest of the addon can keep treating them as dictionaries, while
+the common keys are stored in slots, repeated strings are interned and the info set is kept as a bitmask
+"""
+import copy
+import sys
+from collections.abc import MutableMapping
+
+from resources.lib.common.source_utils import get_info_flags
+from resources.lib.common.source_utils import get_info_set
+
+FIELDS = (
+    "type",
+    "release_title",
+    "source",
+    "quality",
+    "size",
+    "provider_imports",
+    "provider",
+    "debrid_provider",
+    "hash",
+    "magnet",
+    "url",
+    "seeds",
+    "package",
+    "direct",
+)
+_FIELD_SET = frozenset(FIELDS)
+# Values shared by many sources of a scrape, these are interned so every source references the same string
+_INTERNED_FIELDS = frozenset(("type", "source", "quality", "provider", "debrid_provider", "package"))
+_provider_imports = {}
+
+
+def _intern_provider_imports(provider_imports):
+    provider_imports = tuple(provider_imports)
+    return _provider_imports.setdefault(provider_imports, provider_imports)
+
+
+class Source(MutableMapping):
+    """
+    Slotted mapping holding a single source.
+    Keys outside of FIELDS are kept in a dictionary that is only created when a provider supplies one
+    """
+
+    __slots__ = FIELDS + ("info_flags", "_extra")
+
+    def __init__(self, values=None, /, **changes):
+        """
+        :param values: Source to copy, either a dictionary or another Source
+        :type values: dict|Source
+        :param changes: Keys to set in addition to those of values
+        """
+        self.info_flags = None
+        self._extra = None
+        if isinstance(values, Source):
+            for key in FIELDS:
+                if (value := getattr(values, key, self)) is not self:
+                    setattr(self, key, value)
+            self.info_flags = values.info_flags
+            if values._extra:
+                self._extra = dict(values._extra)
+        elif values:
+            for key, value in values.items():
+                self[key] = value
+        for key, value in changes.items():
+            self[key] = value
+
+    def __getitem__(self, key):
+        if key in _FIELD_SET:
+            if (value := getattr(self, key, self)) is not self:
+                return value
+        elif key == "info":
+            if self.info_flags is not None:
+                return get_info_set(self.info_flags)
+        elif self._extra and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in _FIELD_SET:
+            if key in _INTERNED_FIELDS and type(value) is str:
+                value = sys.intern(value)
+            elif key == "provider_imports" and isinstance(value, (list, tuple)):
+                value = _intern_provider_imports(value)
+            setattr(self, key, value)
+        elif key == "info":
+            self.info_flags = get_info_flags(value or ())
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        if key in _FIELD_SET:
+            delattr(self, key)
+        elif key == "info":
+            self.info_flags = None
+        else:
+            del self._extra[key]
+
+    def __contains__(self, key):
+        if key in _FIELD_SET:
+            return getattr(self, key, self) is not self
+        if key == "info":
+            return self.info_flags is not None
+        return bool(self._extra) and key in self._extra
+
+    def __iter__(self):
+        for key in FIELDS:
+            if getattr(self, key, self) is not self:
+                yield key
+        if self.info_flags is not None:
+            yield "info"
+        if self._extra:
+            yield from list(self._extra)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"Source({self.as_dict()!r})"
+
+    def __reduce__(self):
+        return self.__class__, (self.as_dict(),)
+
+    def __copy__(self):
+        return self.copy()
+
+    def __deepcopy__(self, memo):
+        # Slot values are strings, numbers and tuples, so only keys supplied by providers need a deep copy
+        source = self.copy()
+        if source._extra:
+            source._extra = copy.deepcopy(source._extra, memo)
+        return source
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def copy(self, **changes):
+        """
+        Copies the source, sharing the interned values instead of copying them
+        :param changes: Keys to change on the copy
+        :return: Copy of the source
+        :rtype: Source
+        """
+        return self.__class__(self, **changes)
+
+    def as_dict(self):
+        """
+        Builds a plain dictionary of the source for code that needs a real dictionary, such as storage
+        :return: Dictionary of the source with info as a set
+        :rtype: dict
+        """
+        source = {key: self[key] for key in self}
+        if "info" in source:
+            source["info"] = set(source["info"])
+        return source
@@ -4,6 +4,9 @@ Module for common utilities that may be used when working with source items
 import contextlib
 import re
 import string
+import threading
+from functools import cached_property
+from functools import lru_cache
 
 from resources.lib.modules.globals import g
 
@@ -25,7 +28,10 @@ _WHITESPACE = re.compile(r'\s+')
 _SINGLE_QUOTE = re.compile(r"['`]")
 _AMPERSAND = re.compile(r'&#038;|&amp;|&')
 _EPISODE_NUMBERS = re.compile(r'.*((?:s\d+ ?e\d+ )|(?:season ?\d+ ?(?:episode|ep) ?\d+)|(?: \d+ ?x ?\d+ ))')
+_EPISODE_MARKER = re.compile(r'\bs(\d+)e(\d+)(?= |e\d)|\bseason (\d+) episode (\d+)\b')
 _ASCII_NON_PRINTABLE = re.compile(fr'[^{re.escape(string.printable)}]')
+# Untouched by clean_title and rare in release titles
+_BULK_SEPARATOR = "^"
 
 
 class CannotGenerateRegexFilterException(Exception):
@@ -40,6 +46,10 @@ def get_quality(release_title):
     :param release_title: sources release title
     :return: stringed resolution
     """
+    return _parse_release_title(release_title)[0]
+
+
+def _get_quality(release_title):
     release_title = release_title.lower()
 
     if any(q in release_title for q in ["720", "72o"]):
@@ -117,6 +127,41 @@ def info_set_to_dict(info_set):
     return {info_prop: sorted(list(info_set & codecs)) for info_prop, codecs in INFO_STRUCT.items()}
 
 
+INFO_FLAGS = {
+    info_prop: 1 << idx
+    for idx, info_prop in enumerate(sorted({info_prop for codecs in INFO_STRUCT.values() for info_prop in codecs}))
+}
+_INFO_FLAGS_LOCK = threading.Lock()
+
+
+def get_info_flags(info):
+    """
+    Converts an info set to an integer bitmask, info values outside of INFO_STRUCT are assigned a bit on first use
+    :param info: info set built with get_info
+    :return: bitmask of info values
+    :rtype: int
+    """
+    flags = 0
+    for info_prop in info:
+        if (flag := INFO_FLAGS.get(info_prop)) is None:
+            with _INFO_FLAGS_LOCK:
+                flag = INFO_FLAGS.setdefault(info_prop, 1 << len(INFO_FLAGS))
+        flags |= flag
+    return flags
+
+
+@lru_cache(maxsize=1024)
+def get_info_set(flags):
+    """
+    Converts a bitmask built with get_info_flags back to an info set
+    :param flags: bitmask of info values
+    :return: info set
+    :rtype: frozenset
+    """
+    with _INFO_FLAGS_LOCK:
+        return frozenset(info_prop for info_prop, flag in INFO_FLAGS.items() if flags & flag)
+
+
 INFO_TYPES = {
     "AVC": ["x264", "x 264", "h264", "h 264", "avc"],
     "HEVC": ["x265", "x 265", "h265", "h 265", "hevc"],
@@ -210,21 +255,92 @@ INFO_TYPES = {
 }
 
 
+# Title substrings checked by get_info in addition to the INFO_TYPES strings
+_INFO_TITLE_TOKENS = ["hybrid", " hdr", "2160p", "remux", "dtshd", "dts hd", " dts", "sub", "forced", "opus"]
+
+
+def _build_trie_pattern(tokens):
+    """
+    Builds a regex alternation of the given tokens structured as a trie so each position is matched in a single pass
+    :param tokens: strings to match
+    :return: regex pattern matching the longest token at a position
+    """
+    trie = {}
+    for token in tokens:
+        node = trie
+        for char in token:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def _node_pattern(node):
+        branches = [f"{re.escape(char)}{_node_pattern(child)}" for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        if "" in node:
+            pattern = f"(?:{pattern})?" if len(branches) == 1 else f"{pattern}?"
+        return pattern
+
+    return _node_pattern(trie)
+
+
+def _build_info_matcher():
+    token_props = {}
+    for info_prop, string_list in INFO_TYPES.items():
+        for token in string_list:
+            token_props.setdefault(token, set()).add(info_prop)
+    for token in _INFO_TITLE_TOKENS:
+        token_props.setdefault(token, set())
+
+    # Only the longest token is reported at each position, any shorter tokens that are a prefix of it matched too
+    token_matches = {
+        token: frozenset(t for t in token_props if token.startswith(t)) for token in token_props
+    }
+    token_info = {
+        token: frozenset(info_prop for t in matches for info_prop in token_props[t])
+        for token, matches in token_matches.items()
+    }
+    return re.compile(f"(?=({_build_trie_pattern(token_props)}))"), token_matches, token_info
+
+
+_INFO_REGEX, _INFO_TOKEN_MATCHES, _INFO_TOKEN_INFO = _build_info_matcher()
+
+
 def get_info(release_title):
     """
     Identifies and retrieves a list of information based on release title of source
     :param release_title: Release title of source
     :return: List of info meta
     """
+    return set(_parse_release_title(release_title)[1])
+
+
+@lru_cache(maxsize=16384)
+def _parse_release_title(release_title):
+    """
+    Parses quality and info from a release title, results are memoised as release titles recur across providers
+    :param release_title: Release title of source
+    :return: Tuple of quality and frozen info set
+    :rtype: tuple
+    """
+    return _get_quality(release_title), frozenset(_get_info(release_title))
+
+
+def _get_info(release_title):
     title = f"{clean_title(release_title)} "
-    info = {info_prop for info_prop, string_list in INFO_TYPES.items() if any(i in title for i in string_list)}
+    tokens = set()
+    info = set()
+    for token in _INFO_REGEX.findall(title):
+        tokens |= _INFO_TOKEN_MATCHES[token]
+        info |= _INFO_TOKEN_INFO[token]
+
     if all(i in info for i in ["SDR", "HDR"]):
         info.remove("HDR")
-    elif all(i in title for i in ["2160p", "remux"]) and all(i not in info for i in ["HDR", "SDR"]):
+    elif all(i in tokens for i in ["2160p", "remux"]) and all(i not in info for i in ["HDR", "SDR"]):
         info.add("HDR")
-    elif "DV" in info and "hybrid" in title and all(i not in info for i in ["HDR", "SDR"]):
+    elif "DV" in info and "hybrid" in tokens and all(i not in info for i in ["HDR", "SDR"]):
         info.add("HDR")
-    if all(i in info for i in ["HDR", "DV"]) and all(i not in title for i in ["hybrid", " hdr"]):
+    if all(i in info for i in ["HDR", "DV"]) and all(i not in tokens for i in ["hybrid", " hdr"]):
         info.remove("HDR")
     if all(i in info for i in ["HDR", "DV"]):
         info.add("HYBRID")
@@ -232,13 +348,13 @@ def get_info(release_title):
         info.add("HEVC")
     if all(i in info for i in ["DD", "DD+"]):
         info.remove("DD")
-    elif any(i in title for i in ["dtshd", "dts hd"]) and all(i not in info for i in ["DTS-HDMA", "DTS-HDHR"]):
+    elif any(i in tokens for i in ["dtshd", "dts hd"]) and all(i not in info for i in ["DTS-HDMA", "DTS-HDHR"]):
         info.add("DTS-HD")
-    elif " dts" in title and all(i not in info for i in ["DTS-HDMA", "DTS-HDHR", "DTS-X", "DTS-HD"]):
+    elif " dts" in tokens and all(i not in info for i in ["DTS-HDMA", "DTS-HDHR", "DTS-X", "DTS-HD"]):
         info.add("DTS")
-    if all(i in title for i in ["sub", "forced"]):
+    if all(i in tokens for i in ["sub", "forced"]):
         info.add("HC")
-    if "opus" in title and "AV1" in info:
+    if "opus" in tokens and "AV1" in info:
         info.add("OPUS")
     return info
 
@@ -279,6 +395,23 @@ def clean_title(title, broken=None):
     return title.strip()
 
 
+def clean_titles(titles):
+    """
+    Returns cleaned versions of many titles, see clean_title.
+    The titles are cleaned as one joined string so the cleaning expressions run once instead of once per title
+    :param titles: titles to be cleaned
+    :type titles: list
+    :return: cleaned titles in the order they were given
+    :rtype: list
+    """
+    titles = list(titles)
+    cleaned = clean_title(_BULK_SEPARATOR.join(titles)).split(_BULK_SEPARATOR)
+    # A title that contained the separator itself would shift every following title
+    if len(cleaned) != len(titles):
+        return [clean_title(i) for i in titles]
+    return [i.strip() for i in cleaned]
+
+
 def remove_from_title(title, target, clean=True):
     """
     Strips provided string from given title
@@ -377,6 +510,24 @@ def check_episode_number_match(release_title):
     return _EPISODE_NUMBERS.match(release_title) is not None
 
 
+def get_episode_numbers(release_title):
+    """
+    Parses the season and episode number from a cleaned release title.
+    Titles with an episode marker are rejected by the pack filters, so only their marked episode can match
+    :param release_title: Cleaned release title of source
+    :type release_title: str
+    :return: Tuple of (season, episode), (None, None) if the title does not mark a single episode
+    :rtype: tuple
+    """
+    if not check_episode_number_match(release_title):
+        return None, None
+    match = _EPISODE_MARKER.search(release_title)
+    if not match:
+        return None, None
+    season, episode = match.group(1, 2) if match.group(1) else match.group(3, 4)
+    return int(season), int(episode)
+
+
 def check_episode_title_match(show_titles, release_title, simple_info):
     """
     Simplified loose title matching for episode items
@@ -444,36 +595,327 @@ def clean_title_with_simple_info(title, simple_info):
     return title.rstrip()
 
 
-def get_filter_single_episode_fn(simple_info):
+_MATCHER_KEYS = (
+    "show_title",
+    "show_aliases",
+    "season_number",
+    "episode_number",
+    "no_seasons",
+    "year",
+    "country",
+    "episode_title",
+)
+
+
+class EpisodeMatcher:
     """
-    Constructs and returns a method to match episode titles
-    :param simple_info: simplified metadata
-    :return: method that can be used to match titles
+    Matches release titles against an episode, its season pack and show packs.
+    Patterns are compiled on first use and matchers are cached per show and episode, see get_episode_matcher
     """
-    try:
-        show_title, season, episode, alias_list = (
-            simple_info["show_title"],
-            simple_info["season_number"],
-            simple_info["episode_number"],
-            simple_info["show_aliases"],
+
+    def __init__(self, simple_info):
+        self.simple_info = simple_info
+
+    @cached_property
+    def _show_titles(self):
+        titles = list(self.simple_info["show_aliases"])
+        titles.insert(0, self.simple_info["show_title"])
+        return titles
+
+    @cached_property
+    def episode_pattern(self):
+        try:
+            season, episode, titles = (
+                self.simple_info["season_number"],
+                self.simple_info["episode_number"],
+                self._episode_titles,
+            )
+        except KeyError:
+            raise CannotGenerateRegexFilterException(
+                "simple_info must contain (show_title, season_number, episode_number)"
+            )
+
+        pattern = (
+            r"^(?:{titles})+ ?(?:{year})? ?(?:s0?{ss}e0?{ep}(?: |e\d\d?)|season\ 0?{ss}\ episode\ 0?{ep})+"
+        ).format(
+            titles=" ?|".join(titles),
+            year=re.escape(self.simple_info["year"]),
+            ss=re.escape(season),
+            ep=re.escape(episode),
         )
-    except KeyError:
-        raise CannotGenerateRegexFilterException("simple_info must contain (show_title, season_number, episode_number)")
+        return re.compile(pattern)
 
-    titles = list(alias_list)
-    titles.insert(0, show_title)
+    @cached_property
+    def _episode_titles(self):
+        return [re.escape(clean_title_with_simple_info(title, self.simple_info)) for title in self._show_titles]
 
-    clean_titles = []
-    for title in titles:
-        clean_titles.append(re.escape(clean_title_with_simple_info(title, simple_info)))
+    @cached_property
+    def _episode_title_match(self):
+        """
+        Cleaned episode title and show titles for loose matching, see check_episode_title_match
+        """
+        if self.simple_info.get("episode_title", None) is None:
+            return None
+        episode_title = clean_title(self.simple_info["episode_title"])
+        if len(episode_title.split(" ")) < 3:
+            return None
+        return episode_title, tuple(clean_title(title) for title in self._episode_titles)
+
+    @cached_property
+    def season_pack_pattern(self):
+        season = self.simple_info["season_number"]
+        season_fill = season.zfill(2)
+        season_check = f"s{season}"
+        season_fill_check = f"s%{season_fill}"
+        season_full_check = f"season {season}"
+        season_full_fill_check = f"season {season_fill}"
+
+        clean_titles = []
+        for title in self._show_titles:
+            clean_titles.append(clean_title_with_simple_info(title, self.simple_info))
+
+        suffixes = [
+            season_check,
+            season_fill_check,
+            season_full_check,
+            season_full_fill_check,
+        ]
+        return _get_regex_pattern(clean_titles, suffixes)
+
+    @cached_property
+    def show_pack_pattern(self):
+        show_title, season, no_seasons = (
+            self.simple_info["show_title"],
+            self.simple_info["season_number"],
+            self.simple_info["no_seasons"],
+        )
+
+        titles = [clean_title_with_simple_info(title, self.simple_info) for title in self._show_titles]
+
+        all_season_ranges = []
+        all_seasons = "1 "
+        season_count = 2
+        while season_count <= int(no_seasons):
+            all_season_ranges.append(f"{all_seasons}and {season_count}")
+            all_seasons += f"{season_count} "
+            all_season_ranges.append(all_seasons)
+            season_count += 1
+
+        all_season_ranges = [x for x in all_season_ranges if season in x]
+
+        def get_pack_names(release_title):
+            """
+            Method to match release titles with supplied metadata
+            :param release_title: source release title
+            :return: True if match found, else False
+            """
+            no_seasons_fill = no_seasons.zfill(2)
+            no_seasons_minus_one = str(int(no_seasons) - 1)
+            no_seasons_minus_one_fill = no_seasons_minus_one.zfill(2)
+
+            results = [
+                f'all {no_seasons} seasons',
+                f'all {no_seasons_fill} seasons',
+                f'all {no_seasons_minus_one} seasons',
+                f'all {no_seasons_minus_one_fill} seasons',
+                f"all of serie {no_seasons} seasons",
+                f"all of serie {no_seasons_fill} seasons",
+                f"all of serie {no_seasons_minus_one} seasons",
+                f"all of serie {no_seasons_minus_one_fill} seasons",
+                f"all torrent of serie {no_seasons} seasons",
+                f"all torrent of serie {no_seasons_fill} seasons",
+                f"all torrent of serie {no_seasons_minus_one} seasons",
+                f"all torrent of serie {no_seasons_minus_one_fill} seasons",
+            ]
+
+            for season_range in all_season_ranges:
+                results.append(f"{season_range}")
+                results.append(f"season {season_range}")
+                results.append(f"seasons {season_range}")
+
+            if "series" not in release_title:
+                results.append("series")
+
+            if 'boxset' not in release_title:
+                results.append('boxset')
+
+            if 'collection' not in release_title:
+                results.append('collection')
+
+            return results
+
+        def get_pack_names_range(last_season):
+            """
+            Constructs a list of season range strings for regex
+            :param last_season: stringed season number
+            :return: list of strings for regex comparison
+            """
+            last_season_fill = last_season.zfill(2)
+
+            return [
+                f"{last_season} seasons",
+                f"{last_season_fill} seasons",
+                f"season 1 {last_season}",
+                f"season 01 {last_season_fill}",
+                f"season1 {last_season}",
+                f"season01 {last_season_fill}",
+                f"season 1 to {last_season}",
+                f"season 01 to {last_season_fill}",
+                f"season 1 thru {last_season}",
+                f"season 01 thru {last_season_fill}",
+                f"seasons 1 {last_season}",
+                f"seasons 01 {last_season_fill}",
+                f"seasons1 {last_season}",
+                f"seasons01 {last_season_fill}",
+                f"seasons 1 to {last_season}",
+                f"seasons 01 to {last_season_fill}",
+                f"seasons 1 thru {last_season}",
+                f"seasons 01 thru {last_season_fill}",
+                f"full season 1 {last_season}",
+                f"full season 01 {last_season_fill}",
+                f"full season1 {last_season}",
+                f"full season01 {last_season_fill}",
+                f"full season 1 to {last_season}",
+                f"full season 01 to {last_season_fill}",
+                f"full season 1 thru {last_season}",
+                f"full season 01 thru {last_season_fill}",
+                f"full seasons 1 {last_season}",
+                f"full seasons 01 {last_season_fill}",
+                f"full seasons1 {last_season}",
+                f"full seasons01 {last_season_fill}",
+                f"full seasons 1 to {last_season}",
+                f"full seasons 01 to {last_season_fill}",
+                f"full seasons 1 thru {last_season}",
+                f"full seasons 01 thru {last_season_fill}",
+                f"s1 {last_season}",
+                f"s1 s{last_season}",
+                f"s01 {last_season_fill}",
+                f"s01 s{last_season_fill}",
+                f"s1 to {last_season}",
+                f"s1 to s{last_season}",
+                f"s01 to {last_season_fill}",
+                f"s01 to s{last_season_fill}",
+                f"s1 thru {last_season}",
+                f"s1 thru s{last_season}",
+                f"s01 thru {last_season_fill}",
+                f"s01 thru s{last_season_fill}",
+            ]
+
+        suffixes = get_pack_names(show_title)
+        seasons_count = int(season)
+        while seasons_count <= int(no_seasons):
+            suffixes += get_pack_names_range(str(seasons_count))
+            seasons_count += 1
+
+        non_escaped_suffixes = [
+            "(?!season)(?<!season)complete",
+        ]
+
+        return _get_regex_pattern(titles, suffixes, non_escaped_suffixes=non_escaped_suffixes)
+
+    def is_episode(self, release_title):
+        """
+        Matches a cleaned release title against the episode
+        :param release_title: Cleaned release title of source
+        :type release_title: str
+        :return: True if match found, else False
+        :rtype: bool
+        """
+        return bool(self.episode_pattern.match(release_title)) or self.is_episode_title(release_title)
+
+    def is_episode_title(self, release_title):
+        """
+        Loosely matches a cleaned release title on show title and episode title, see check_episode_title_match
+        :param release_title: Cleaned release title of source
+        :type release_title: str
+        :return: True if match found, else False
+        :rtype: bool
+        """
+        if episode_title_match := self._episode_title_match:
+            episode_title, show_titles = episode_title_match
+            return episode_title in release_title and any(release_title.startswith(i) for i in show_titles)
+        return False
+
+    def is_season_pack(self, release_title):
+        """
+        Matches a cleaned release title against the season pack of the episode
+        :param release_title: Cleaned release title of source
+        :type release_title: str
+        :return: True if match found, else False
+        :rtype: bool
+        """
+        return not check_episode_number_match(release_title) and bool(self.season_pack_pattern.match(release_title))
+
+    def is_show_pack(self, release_title):
+        """
+        Matches a cleaned release title against the show packs containing the episode
+        :param release_title: Cleaned release title of source
+        :type release_title: str
+        :return: True if match found, else False
+        :rtype: bool
+        """
+        return not check_episode_number_match(release_title) and bool(self.show_pack_pattern.match(release_title))
+
+    def match(self, release_title):
+        """
+        Matches a cleaned release title against the episode, its season pack and show packs
+        :param release_title: Cleaned release title of source
+        :type release_title: str
+        :return: True if match found, else False
+        :rtype: bool
+        """
+        if self.is_episode(release_title):
+            return True
+        if check_episode_number_match(release_title):
+            return False
+        return bool(self.show_pack_pattern.match(release_title) or self.season_pack_pattern.match(release_title))
+
+    def match_many(self, release_titles, cleaned=False):
+        """
+        Matches many release titles against the episode, its season pack and show packs
+        :param release_titles: Release titles of sources
+        :type release_titles: list
+        :param cleaned: True if the release titles are already cleaned
+        :type cleaned: bool
+        :return: List of match results in the order of the release titles
+        :rtype: list
+        """
+        if not cleaned:
+            release_titles = clean_titles(release_titles)
+        return [self.match(i) for i in release_titles]
 
-    pattern = r"^(?:{titles})+ ?(?:{year})? ?(?:s0?{ss}e0?{ep}(?: |e\d\d?)|season\ 0?{ss}\ episode\ 0?{ep})+".format(
-        titles=" ?|".join(clean_titles),
-        year=re.escape(simple_info["year"]),
-        ss=re.escape(season),
-        ep=re.escape(episode),
+
+def get_episode_matcher(simple_info):
+    """
+    Fetches the matcher for the episode described by simple_info.
+    Matchers are cached per show and episode so their patterns are only compiled once
+    :param simple_info: simplified metadata
+    :type simple_info: dict
+    :return: Matcher for the episode
+    :rtype: EpisodeMatcher
+    """
+    return _get_episode_matcher(
+        tuple(
+            (key, tuple(simple_info[key]) if key == "show_aliases" else simple_info[key])
+            for key in _MATCHER_KEYS
+            if key in simple_info
+        )
     )
-    regex = re.compile(pattern)
+
+
+@lru_cache(maxsize=64)
+def _get_episode_matcher(key):
+    return EpisodeMatcher(dict(key))
+
+
+def get_filter_single_episode_fn(simple_info):
+    """
+    Constructs and returns a method to match episode titles
+    :param simple_info: simplified metadata
+    :return: method that can be used to match titles
+    """
+    matcher = get_episode_matcher(simple_info)
+    regex = matcher.episode_pattern
 
     def filter_fn(release_title):
         """
@@ -485,7 +927,7 @@ def get_filter_single_episode_fn(simple_info):
         if regex.match(release_title):
             return True
 
-        return check_episode_title_match(clean_titles, release_title, simple_info)
+        return matcher.is_episode_title(release_title)
 
     return filter_fn
 
@@ -496,32 +938,7 @@ def get_filter_season_pack_fn(simple_info):
     :param simple_info: simplified metadata
     :return: method that can be used to match titles
     """
-    show_title, season, alias_list = (
-        simple_info["show_title"],
-        simple_info["season_number"],
-        simple_info["show_aliases"],
-    )
-
-    titles = list(alias_list)
-    titles.insert(0, show_title)
-
-    season_fill = season.zfill(2)
-    season_check = f"s{season}"
-    season_fill_check = f"s%{season_fill}"
-    season_full_check = f"season {season}"
-    season_full_fill_check = f"season {season_fill}"
-
-    clean_titles = []
-    for title in titles:
-        clean_titles.append(clean_title_with_simple_info(title, simple_info))
-
-    suffixes = [
-        season_check,
-        season_fill_check,
-        season_full_check,
-        season_full_fill_check,
-    ]
-    regex_pattern = _get_regex_pattern(clean_titles, suffixes)
+    regex_pattern = get_episode_matcher(simple_info).season_pack_pattern
 
     def filter_fn(release_title):
         """
@@ -544,140 +961,7 @@ def get_filter_show_pack_fn(simple_info):
     :param simple_info: simplified metadata
     :return: method that can be used to match titles
     """
-    show_title, season, alias_list, no_seasons, country, year = (
-        simple_info["show_title"],
-        simple_info["season_number"],
-        simple_info["show_aliases"],
-        simple_info["no_seasons"],
-        simple_info["country"],
-        simple_info["year"],
-    )
-
-    titles = list(alias_list)
-    titles.insert(0, show_title)
-    for idx, title in enumerate(titles):
-        titles[idx] = clean_title_with_simple_info(title, simple_info)
-
-    all_season_ranges = []
-    all_seasons = "1 "
-    season_count = 2
-    while season_count <= int(no_seasons):
-        all_season_ranges.append(f"{all_seasons}and {season_count}")
-        all_seasons += f"{season_count} "
-        all_season_ranges.append(all_seasons)
-        season_count += 1
-
-    all_season_ranges = [x for x in all_season_ranges if season in x]
-
-    def get_pack_names(release_title):
-        """
-        Method to match release titles with supplied metadata
-        :param release_title: source release title
-        :return: True if match found, else False
-        """
-        no_seasons_fill = no_seasons.zfill(2)
-        no_seasons_minus_one = str(int(no_seasons) - 1)
-        no_seasons_minus_one_fill = no_seasons_minus_one.zfill(2)
-
-        results = [
-            f'all {no_seasons} seasons',
-            f'all {no_seasons_fill} seasons',
-            f'all {no_seasons_minus_one} seasons',
-            f'all {no_seasons_minus_one_fill} seasons',
-            f"all of serie {no_seasons} seasons",
-            f"all of serie {no_seasons_fill} seasons",
-            f"all of serie {no_seasons_minus_one} seasons",
-            f"all of serie {no_seasons_minus_one_fill} seasons",
-            f"all torrent of serie {no_seasons} seasons",
-            f"all torrent of serie {no_seasons_fill} seasons",
-            f"all torrent of serie {no_seasons_minus_one} seasons",
-            f"all torrent of serie {no_seasons_minus_one_fill} seasons",
-        ]
-
-        for season_range in all_season_ranges:
-            results.append(f"{season_range}")
-            results.append(f"season {season_range}")
-            results.append(f"seasons {season_range}")
-
-        if "series" not in release_title:
-            results.append("series")
-
-        if 'boxset' not in release_title:
-            results.append('boxset')
-
-        if 'collection' not in release_title:
-            results.append('collection')
-
-        return results
-
-    def get_pack_names_range(last_season):
-        """
-        Constructs a list of season range strings for regex
-        :param last_season: stringed season number
-        :return: list of strings for regex comparison
-        """
-        last_season_fill = last_season.zfill(2)
-
-        return [
-            f"{last_season} seasons",
-            f"{last_season_fill} seasons",
-            f"season 1 {last_season}",
-            f"season 01 {last_season_fill}",
-            f"season1 {last_season}",
-            f"season01 {last_season_fill}",
-            f"season 1 to {last_season}",
-            f"season 01 to {last_season_fill}",
-            f"season 1 thru {last_season}",
-            f"season 01 thru {last_season_fill}",
-            f"seasons 1 {last_season}",
-            f"seasons 01 {last_season_fill}",
-            f"seasons1 {last_season}",
-            f"seasons01 {last_season_fill}",
-            f"seasons 1 to {last_season}",
-            f"seasons 01 to {last_season_fill}",
-            f"seasons 1 thru {last_season}",
-            f"seasons 01 thru {last_season_fill}",
-            f"full season 1 {last_season}",
-            f"full season 01 {last_season_fill}",
-            f"full season1 {last_season}",
-            f"full season01 {last_season_fill}",
-            f"full season 1 to {last_season}",
-            f"full season 01 to {last_season_fill}",
-            f"full season 1 thru {last_season}",
-            f"full season 01 thru {last_season_fill}",
-            f"full seasons 1 {last_season}",
-            f"full seasons 01 {last_season_fill}",
-            f"full seasons1 {last_season}",
-            f"full seasons01 {last_season_fill}",
-            f"full seasons 1 to {last_season}",
-            f"full seasons 01 to {last_season_fill}",
-            f"full seasons 1 thru {last_season}",
-            f"full seasons 01 thru {last_season_fill}",
-            f"s1 {last_season}",
-            f"s1 s{last_season}",
-            f"s01 {last_season_fill}",
-            f"s01 s{last_season_fill}",
-            f"s1 to {last_season}",
-            f"s1 to s{last_season}",
-            f"s01 to {last_season_fill}",
-            f"s01 to s{last_season_fill}",
-            f"s1 thru {last_season}",
-            f"s1 thru s{last_season}",
-            f"s01 thru {last_season_fill}",
-            f"s01 thru s{last_season_fill}",
-        ]
-
-    suffixes = get_pack_names(show_title)
-    seasons_count = int(season)
-    while seasons_count <= int(no_seasons):
-        suffixes += get_pack_names_range(str(seasons_count))
-        seasons_count += 1
-
-    non_escaped_suffixes = [
-        "(?!season)(?<!season)complete",
-    ]
-
-    regex_pattern = _get_regex_pattern(titles, suffixes, non_escaped_suffixes=non_escaped_suffixes)
+    regex_pattern = get_episode_matcher(simple_info).show_pack_pattern
 
     def filter_fn(release_title):
         """
@@ -854,3 +1138,19 @@ def get_accepted_resolution_set():
     min_res = g.get_int_setting("general.minResolution")
 
     return set(resolutions[max_res : min_res + 1])
+
+
+def get_source_identity(source):
+    """
+    Builds a hashable key identifying a source by its content, stable across copies of the source
+    :param source: Source to identify
+    :type source: dict
+    :return: Identity of the source
+    :rtype: tuple
+    """
+    return (
+        source.get("provider"),
+        source.get("debrid_provider"),
+        source.get("release_title"),
+        str(source.get("url", source.get("hash", source.get("id")))),
+    )
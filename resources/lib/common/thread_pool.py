@@ -1,4 +1,6 @@
+import collections
 import concurrent.futures
+import threading
 from functools import reduce
 
 from resources.lib.common import tools
@@ -46,23 +48,204 @@ class ThreadPoolExecutor(concurrent.futures.ThreadPoolExecutor):
                 t.join()
 
 
+class _WorkItem:
+    __slots__ = ("future", "func", "args", "kwargs", "pool", "claimed")
+
+    def __init__(self, pool, func, args, kwargs):
+        self.future = concurrent.futures.Future()
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.pool = pool
+        self.claimed = False
+
+    def run(self):
+        try:
+            if not self.future.set_running_or_notify_cancel():
+                return
+            try:
+                result = self.func(*self.args, **self.kwargs)
+            except BaseException as e:  # pylint: disable=broad-except
+                self.future.set_exception(e)
+            else:
+                self.future.set_result(result)
+        finally:
+            # Drop references so finished futures held by callers do not keep arguments alive
+            self.func = self.args = self.kwargs = None
+            self.pool._task_done()
+
+
+class TaskExecutor:
+    """
+    Process wide set of worker threads shared by every ThreadPool.
+    Worker threads are started on demand up to a global cap and exit once idle, tasks waiting for a worker are queued
+    in submission order. Callers waiting on tasks they submitted run them inline instead of blocking, so nested pools
+    can not exhaust the workers and deadlock
+    """
+
+    # Seconds an idle worker waits for work before exiting
+    idle_timeout = 5
+
+    def __init__(self, max_workers):
+        """
+        :param max_workers: Maximum number of worker threads
+        :type max_workers: int
+        """
+        self.max_workers = max_workers
+        self._condition = threading.Condition()
+        self._queue = collections.deque()
+        self._workers = 0
+        self._idle = 0
+
+    def submit(self, item):
+        """
+        Queues a work item to be run by a worker
+        :param item: Work item to run
+        :type item: _WorkItem
+        :return: None
+        :rtype: None
+        """
+        with self._condition:
+            self._queue.append(item)
+            self._condition.notify()
+            # Idle workers only count as available until they wake, so start another if more work is queued
+            if self._idle >= len(self._queue) or self._workers >= self.max_workers:
+                return
+            self._workers += 1
+        threading.Thread(target=self._worker, name="SerenTaskWorker", daemon=True).start()
+
+    def claim(self, item):
+        """
+        Claims a queued work item so only one thread runs it
+        :param item: Work item to claim
+        :type item: _WorkItem
+        :return: True if the item was claimed, False if another thread claimed it first
+        :rtype: bool
+        """
+        with self._condition:
+            if item.claimed:
+                return False
+            item.claimed = True
+            return True
+
+    def _next_item(self):
+        while self._queue:
+            item = self._queue.popleft()
+            if not item.claimed:
+                item.claimed = True
+                return item
+        return None
+
+    def _worker(self):
+        while True:
+            with self._condition:
+                item = self._next_item()
+                while item is None:
+                    self._idle += 1
+                    notified = self._condition.wait(self.idle_timeout)
+                    self._idle -= 1
+                    item = self._next_item()
+                    if item is None and not notified:
+                        self._workers -= 1
+                        return
+            item.run()
+
+
+class DedicatedExecutor:
+    """
+    Runs each work item on a thread of its own, outside the global cap of the TaskExecutor.
+    Used by pools whose tasks run for the life of a service or download, which would otherwise hold capped workers
+    indefinitely, and by pools whose concurrency must not be shared with other pools
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def submit(self, item):
+        """
+        Starts a thread to run a work item
+        :param item: Work item to run
+        :type item: _WorkItem
+        :return: None
+        :rtype: None
+        """
+        threading.Thread(target=self._run, args=(item,), name="SerenDedicatedWorker", daemon=True).start()
+
+    def claim(self, item):
+        """
+        Claims a work item so only one thread runs it
+        :param item: Work item to claim
+        :type item: _WorkItem
+        :return: True if the item was claimed, False if another thread claimed it first
+        :rtype: bool
+        """
+        with self._lock:
+            if item.claimed:
+                return False
+            item.claimed = True
+            return True
+
+    def _run(self, item):
+        # The thread that submitted the item may have run it while waiting
+        if self.claim(item):
+            item.run()
+
+
+_executor = None
+_executor_lock = threading.Lock()
+_dedicated_executor = DedicatedExecutor()
+
+
+def get_executor():
+    """
+    Fetches the process wide executor, creating it with the global worker cap of the thread pool scale setting
+    :return: Shared executor
+    :rtype: TaskExecutor
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = TaskExecutor(ThreadPool.scaled_global_workers[ThreadPool.get_scale()])
+    return _executor
+
+
 class ThreadPool:
     """
-    Helper class to simplify raising worker_pool
+    Helper class to simplify raising worker_pool.
+    Tasks run on the process wide TaskExecutor, each pool limits how many of its own tasks run at once and waits by
+    running its queued tasks itself. Dedicated pools run their tasks on threads of their own instead
     """
 
     # Default, Low, Medium, High, Extreme
     scaled_workers = [20, 10, 20, 40, 80]
+    # Worker threads shared by every pool in the process
+    scaled_global_workers = [40, 20, 40, 80, 160]
 
-    def __init__(self):
+    def __init__(self, dedicated=False, max_workers=None):
+        """
+        :param dedicated: Run tasks on threads of their own, for long-lived tasks and pools that must keep their full
+                          number of workers regardless of other pools
+        :type dedicated: bool
+        :param max_workers: Most tasks of the pool run at once, defaults to the scaled number of workers
+        :type max_workers: int
+        """
         self.limiter = g.get_bool_runtime_setting("threadpool.limiter")
-        self.workers = self.scaled_workers[g.get_int_setting("general.threadpoolScale", -1) + 1]
-        self.max_workers = 1 if self.limiter else self.workers
-        self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        self.workers = self.scaled_workers[self.get_scale()]
+        self.max_workers = 1 if self.limiter else min(max_workers or self.workers, self.workers)
+        self.executor = _dedicated_executor if dedicated else get_executor()
         self.tasks = []
+        self._lock = threading.Lock()
+        self._backlog = collections.deque()
+        self._dispatched = collections.deque()
+        self._active = 0
 
     def __del__(self):
-        self.executor.shutdown(wait=False, cancel_futures=True)
+        self._cancel()
+
+    @staticmethod
+    def get_scale():
+        return g.get_int_setting("general.threadpoolScale", -1) + 1
 
     @staticmethod
     def _handle_results(results):
@@ -88,6 +271,82 @@ class ThreadPool:
         else:
             return [result for result in result_iter if result is not None]
 
+    def _submit(self, func, args, kwargs):
+        item = _WorkItem(self, func, args, kwargs)
+        with self._lock:
+            self._backlog.append(item)
+        self._dispatch()
+        return item.future
+
+    def _dispatch(self):
+        with self._lock:
+            # Tasks started by workers are no longer needed for stealing
+            while self._dispatched and self._dispatched[0].claimed:
+                self._dispatched.popleft()
+            items = []
+            while self._backlog and self._active < self.max_workers:
+                item = self._backlog.popleft()
+                self._active += 1
+                self._dispatched.append(item)
+                items.append(item)
+        for item in items:
+            self.executor.submit(item)
+
+    def _task_done(self):
+        with self._lock:
+            self._active -= 1
+        self._dispatch()
+
+    def _steal(self):
+        """
+        Takes a task of this pool that no worker has started yet, for the waiting thread to run inline
+        :return: Work item, None if every task has been started
+        :rtype: _WorkItem|None
+        """
+        with self._lock:
+            while self._dispatched:
+                item = self._dispatched.popleft()
+                if self.executor.claim(item):
+                    return item
+            if self._backlog:
+                item = self._backlog.popleft()
+                item.claimed = True
+                self._active += 1
+                return item
+        return None
+
+    def _wait(self, futures, return_when=concurrent.futures.ALL_COMPLETED):
+        """
+        Waits for futures of this pool, running queued tasks of the pool in the waiting thread meanwhile
+        :param futures: Futures to wait for
+        :type futures: list
+        :param return_when: When to return, as for concurrent.futures.wait
+        :type return_when: str
+        :return: Set of done futures
+        :rtype: set
+        """
+        not_done = set(futures)
+        done = set()
+        while not_done:
+            if item := self._steal():
+                item.run()
+            else:
+                # Only tasks running on workers remain, finishing one may dispatch more of the backlog
+                concurrent.futures.wait(not_done, timeout=1, return_when=concurrent.futures.FIRST_COMPLETED)
+            finished = {future for future in not_done if future.done()}
+            done |= finished
+            not_done -= finished
+            if finished and return_when == concurrent.futures.FIRST_COMPLETED:
+                break
+        return done
+
+    def _cancel(self):
+        with self._lock:
+            items = list(self._dispatched) + list(self._backlog)
+            self._backlog.clear()
+        for item in items:
+            item.future.cancel()
+
     def put(self, func, *args, **kwargs):
         """
         Adds task to executor and starts it running
@@ -100,7 +359,40 @@ class ThreadPool:
         :return:
         :rtype:
         """
-        self.tasks.append(self.executor.submit(func, *args, **kwargs))
+        self.tasks.append(self._submit(func, args, kwargs))
+
+    def submit(self, func, *args, **kwargs):
+        """
+        Adds task to executor and starts it running, for callers that collect results in their own order
+        :param func: method to run in task
+        :type func: object
+        :param args: arguments to assign to method
+        :type args: any
+        :param kwargs: kwargs to assign to method
+        :type kwargs: any
+        :return: Future of the task
+        :rtype: concurrent.futures.Future
+        """
+        return self._submit(func, args, kwargs)
+
+    def result(self, future):
+        """
+        Waits for a task returned by submit, running queued tasks of the pool meanwhile
+        :param future: Future of the task
+        :type future: concurrent.futures.Future
+        :return: The result of the task
+        :raises: The exception raised by the task
+        """
+        self._wait([future])
+        return future.result()
+
+    def cancel(self):
+        """
+        Cancels the tasks of the pool that have not started
+        :return: None
+        :rtype: None
+        """
+        self._cancel()
 
     def wait_completion(self):
         """
@@ -110,17 +402,21 @@ class ThreadPool:
         :raises: The first exception identified if an exception is raised
         """
         try:
-            for task in concurrent.futures.as_completed(self.tasks):
-                if exception := task.exception():
-                    self.executor.shutdown(wait=False, cancel_futures=True)
-                    raise exception
+            not_done = list(self.tasks)
+            while not_done:
+                done = self._wait(not_done, concurrent.futures.FIRST_COMPLETED)
+                for task in done:
+                    if exception := task.exception():
+                        self._cancel()
+                        raise exception
+                not_done = [task for task in not_done if task not in done]
 
             results = self._handle_results(task.result() for task in self.tasks if task)
             self.tasks.clear()
             return results
         except Exception:
             g.log_stacktrace()
-            self.executor.shutdown(wait=False, cancel_futures=True)
+            self._cancel()
             raise
 
     def map_results(self, func, args_iterable=None, kwargs_iterable=None):
@@ -131,15 +427,17 @@ class ThreadPool:
         :param kwargs_iterable: An iterable of kwargs dicts
         :return: The results
         """
+        if args_iterable and kwargs_iterable:
+            calls = zip(args_iterable, kwargs_iterable)
+        elif kwargs_iterable:
+            calls = (((), kwargs) for kwargs in kwargs_iterable)
+        else:
+            calls = ((args, {}) for args in args_iterable)
+        futures = [self._submit(func, args, kwargs) for args, kwargs in calls]
         try:
-            return self._handle_results(
-                self.executor.map(lambda args, kwargs: func(*args, **kwargs), args_iterable, kwargs_iterable)
-                if args_iterable and kwargs_iterable
-                else self.executor.map(lambda kwargs: func(**kwargs), kwargs_iterable)
-                if kwargs_iterable
-                else self.executor.map(lambda args: func(*args), args_iterable)
-            )
+            self._wait(futures)
+            return self._handle_results(future.result() for future in futures)
         except Exception:
-            self.executor.shutdown(wait=False, cancel_futures=True)
+            self._cancel()
             g.log_stacktrace()
             raise
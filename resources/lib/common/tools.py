@@ -371,7 +371,10 @@ def freeze_object(o):
 
 
 def serialize_sets(obj):
-    return sorted([str(i) for i in obj]) if isinstance(obj, set) else obj
+    if isinstance(obj, (set, frozenset)):
+        return sorted([str(i) for i in obj])
+    # Mappings that are not dictionaries, such as sources, are serialized as dictionaries
+    return dict(obj) if isinstance(obj, Mapping) else obj
 
 
 def md5_hash(value):
@@ -1,7 +1,9 @@
 import base64
 import collections
 import datetime
+import os
 import pickle
+import threading
 import time
 import types
 from abc import ABCMeta
@@ -11,6 +13,7 @@ from functools import wraps
 
 from resources.lib.common import tools
 from resources.lib.database import Database
+from resources.lib.database import SQLiteConnection
 from resources.lib.modules.exceptions import UnsupportedCacheParamException
 from resources.lib.modules.globals import g
 
@@ -26,9 +29,29 @@ schema = {
         ),
         "table_constraints": ["UNIQUE(id)"],
         "default_seed": [],
-    }
+    },
+    "leases": {
+        "columns": collections.OrderedDict(
+            [
+                ("id", ["TEXT", "PRIMARY KEY", "NOT NULL"]),
+                ("owner", ["TEXT", "NOT NULL"]),
+                ("expires", ["REAL", "NOT NULL"]),
+            ]
+        ),
+        "table_constraints": ["UNIQUE(id)"],
+        "default_seed": [],
+    },
 }
 
+# Seconds a caller may hold the lease of a cache item while fetching it, after which another caller may take over
+IN_FLIGHT_LEASE = 30
+# Longest a caller waits for another one fetching the same item, past this it fetches the item itself
+IN_FLIGHT_TIMEOUT = 15
+# Seconds between checks of the cache while waiting for another caller
+IN_FLIGHT_POLL = 0.1
+# Minutes a revalidating cache keeps serving its cached result after a failed revalidation before trying again
+REVALIDATE_RETRY_MINUTES = 5
+
 
 class CacheBase(metaclass=ABCMeta):
     """
@@ -156,14 +179,18 @@ class Cache(CacheBase):
                 self._mem_cache.set(cache_id, result, checksum)
         return result
 
-    def set(self, cache_id, data, checksum=None, expiration=None):
-
+    def set(self, cache_id, data, checksum=None, expiration=None, mem_expiration=None):
+        """
+        Stores new value in both the mem and disk cache
+        :param mem_expiration: Shorter expiration for the mem cache copy, defaults to expiration
+        :type mem_expiration: datetime.timedelta
+        """
         if expiration is None:
             expiration = datetime.timedelta(hours=24)
 
         checksum = self._get_checksum(checksum)
         if self.enable_mem_cache and not self._exit:
-            self._mem_cache.set(cache_id, data, checksum, expiration)
+            self._mem_cache.set(cache_id, data, checksum, min(expiration, mem_expiration or expiration))
         if not self._exit:
             self._db_cache.set(cache_id, data, checksum, expiration)
 
@@ -198,6 +225,18 @@ class Cache(CacheBase):
         self._db_cache.clear_all()
         self._mem_cache.clear_all()
 
+    def acquire_lease(self, cache_id, owner, duration):
+        """
+        Takes the lease of a cache item being fetched, see DatabaseCache.acquire_lease
+        """
+        return self._db_cache.acquire_lease(cache_id, owner, duration)
+
+    def release_lease(self, cache_id, owner):
+        """
+        Releases the lease of a cache item, see DatabaseCache.release_lease
+        """
+        self._db_cache.release_lease(cache_id, owner)
+
     def __del__(self):
         if not self._exit:
             self.close()
@@ -227,6 +266,7 @@ class DatabaseCache(Database, CacheBase):
         g.set_runtime_setting(self._create_key("db.clean.busy"), True)
         query = f"DELETE FROM {self.cache_table_name} where expires < ?"
         self.execute_sql(query, (self._get_timestamp(),))
+        self.execute_sql("DELETE FROM leases where expires < ?", (self._get_timestamp(),))
         g.clear_runtime_setting(self._create_key("db.clean.busy"))
 
     def get(self, cache_id, checksum=None):
@@ -255,6 +295,41 @@ class DatabaseCache(Database, CacheBase):
     def clear_all(self):
         self.rebuild_database()
 
+    def acquire_lease(self, cache_id, owner, duration):
+        """
+        Takes the lease of a cache item being fetched, unless another owner holds a lease that has not expired
+        :param cache_id: ID of cache item being fetched
+        :type cache_id: str
+        :param owner: Unique name of the caller fetching the item
+        :type owner: str
+        :param duration: Seconds the lease is held for if not released
+        :type duration: float
+        :return: True if the lease was taken else False
+        :rtype: bool
+        """
+        now = self._get_timestamp()
+        with SQLiteConnection(self._db_file) as sqlite:
+            with sqlite.transaction() as cursor:
+                cursor.execute(
+                    "INSERT INTO leases (id, owner, expires) VALUES (?, ?, ?) "
+                    "ON CONFLICT(id) DO UPDATE SET owner=excluded.owner, expires=excluded.expires "
+                    "WHERE leases.expires < ?",
+                    (cache_id, owner, now + duration, now),
+                )
+                return cursor.rowcount > 0
+
+    def release_lease(self, cache_id, owner):
+        """
+        Releases the lease of a cache item if still held by the owner
+        :param cache_id: ID of cache item
+        :type cache_id: str
+        :param owner: Unique name of the caller that took the lease
+        :type owner: str
+        :return: None
+        :rtype: None
+        """
+        self.execute_sql("DELETE FROM leases WHERE id=? AND owner=?", (cache_id, owner))
+
     def close(self):
         super().close()
 
@@ -339,11 +414,87 @@ class MemCache(CacheBase):
         super().close()
 
 
-def use_cache(cache_hours=12):
+_held_leases = threading.local()
+
+
+class InFlight:
+    """
+    Coordinates callers fetching the same cache item, across threads and every plugin invocation.
+    The first caller takes a lease of the item in the cache database and fetches it, the others wait for its result to
+    be cached instead of making the same request
+    """
+
+    def __init__(self, cache_id):
+        """
+        :param cache_id: ID of cache item being fetched
+        :type cache_id: str
+        """
+        self.cache_id = cache_id
+        self.owner = f"{os.getpid()}.{threading.get_ident()}"
+        self.held = False
+
+    @staticmethod
+    def _get_held():
+        if not hasattr(_held_leases, "ids"):
+            _held_leases.ids = set()
+        return _held_leases.ids
+
+    def _acquire(self):
+        try:
+            self.held = g.CACHE.acquire_lease(self.cache_id, self.owner, IN_FLIGHT_LEASE)
+        except Exception as e:  # pylint: disable=broad-except
+            # A broken lease must not stop the item from being fetched
+            g.log(f"Failed to acquire lease of {self.cache_id}: {e}", "error")
+            return True
+        if self.held:
+            self._get_held().add(self.cache_id)
+        return self.held
+
+    def wait(self, get_cached):
+        """
+        Waits while another caller fetches the item, taking the lease once it is released without a result
+        :param get_cached: Callable returning the cached result or CacheBase.NOT_CACHED
+        :type get_cached: collections.abc.Callable
+        :return: Result cached by the other caller, CacheBase.NOT_CACHED if the item should be fetched by this caller
+        :rtype: Any
+        """
+        # A nested fetch of an item this thread is already fetching would wait on itself, so it runs inline
+        if self.cache_id in self._get_held():
+            return CacheBase.NOT_CACHED
+        deadline = time.time() + IN_FLIGHT_TIMEOUT
+        while not self._acquire():
+            if (result := get_cached()) != CacheBase.NOT_CACHED:
+                return result
+            if time.time() >= deadline:
+                g.log(f"Gave up waiting for {self.cache_id} to be fetched", "warning")
+                return CacheBase.NOT_CACHED
+            if g.wait_for_abort(IN_FLIGHT_POLL):
+                return CacheBase.NOT_CACHED
+        # The item may have been cached and its lease released since the caller last looked
+        return get_cached()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if not self.held:
+            return
+        self.held = False
+        self._get_held().discard(self.cache_id)
+        try:
+            g.CACHE.release_lease(self.cache_id, self.owner)
+        except Exception as e:  # pylint: disable=broad-except
+            g.log(f"Failed to release lease of {self.cache_id}: {e}", "error")
+
+
+def use_cache(cache_hours=12, in_flight=False):
     """
     Ease of use decorator to automate caching of method calls
     :param cache_hours: Hours to cache return value for
     :type cache_hours: int
+    :param in_flight: Share the fetch of a missing value with concurrent callers, see InFlight. Only worth the
+                      database write it costs for methods making network requests
+    :type in_flight: bool
     :return: Functions return value
     :rtype: Any
     """
@@ -358,6 +509,21 @@ def use_cache(cache_hours=12):
 
         return checksum
 
+    def _fetch(cache_str, checksum, hours, func, args, kwargs):
+        fresh_result = func(*args, **kwargs)
+        if func.__name__ == "get_sources" and (not fresh_result or len(fresh_result[1]) == 0):
+            return fresh_result
+        try:
+            g.CACHE.set(
+                cache_str,
+                fresh_result,
+                expiration=datetime.timedelta(hours=hours),
+                checksum=checksum,
+            )
+        except TypeError:
+            g.log_stacktrace()
+        return fresh_result
+
     def _decorator(func):
         @wraps(func)
         def _decorated(*args, **kwargs):
@@ -394,22 +560,131 @@ def use_cache(cache_hours=12):
             )
             cached_data = CacheBase.NOT_CACHED if overwrite_cache else g.CACHE.get(cache_str, checksum=checksum)
 
-            if cached_data == CacheBase.NOT_CACHED:
-                fresh_result = func(*args, **kwargs)
-                if func.__name__ == "get_sources" and (not fresh_result or len(fresh_result[1]) == 0):
-                    return fresh_result
-                try:
-                    g.CACHE.set(
-                        cache_str,
-                        fresh_result,
-                        expiration=datetime.timedelta(hours=hours),
-                        checksum=checksum,
-                    )
-                except TypeError:
-                    g.log_stacktrace()
-                return fresh_result
-            else:
+            if cached_data != CacheBase.NOT_CACHED:
                 return cached_data
+            if overwrite_cache or not in_flight:
+                return _fetch(cache_str, checksum, hours, func, args, kwargs)
+            with InFlight(cache_str) as request:
+                cached_data = request.wait(lambda: g.CACHE.get(cache_str, checksum=checksum))
+                if cached_data != CacheBase.NOT_CACHED:
+                    return cached_data
+                return _fetch(cache_str, checksum, hours, func, args, kwargs)
+
+        return _decorated
+
+    return _decorator
+
+
+def get_conditional_headers(validators):
+    """
+    Builds the headers of a conditional request from the validators of a cached response
+    :param validators: Dictionary of etag and last_modified, None for an unconditional request
+    :type validators: dict|None
+    :return: Dictionary of If-None-Match and If-Modified-Since headers
+    :rtype: dict
+    """
+    headers = {}
+    if not validators:
+        return headers
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def use_revalidating_cache(cache_hours=12, revalidate_days=30):
+    """
+    Caching decorator for methods fetching a single HTTP resource from a host supporting conditional requests.
+    The decorated method takes the validators of the cached response as the validators keyword argument and returns a
+    tuple of its result and the response it was built from. Results are kept for revalidate_days along with the ETag
+    and Last-Modified of their response, once cache_hours have passed the method is called again and a 304 response
+    keeps the cached result for another cache_hours instead of downloading it again. A failed or 5xx revalidation
+    keeps the cached result and its validators, and is retried after REVALIDATE_RETRY_MINUTES.
+    Overwriting the cache revalidates the cached result even if it is still fresh
+    :param cache_hours: Hours a result is used before being revalidated
+    :type cache_hours: int
+    :param revalidate_days: Days a result with validators is kept for revalidation
+    :type revalidate_days: int
+    :return: Functions result
+    :rtype: Any
+    """
+
+    def _get_validators(response, previous):
+        validators = {
+            "etag": response.headers.get("ETag") or previous.get("etag"),
+            "last_modified": response.headers.get("Last-Modified") or previous.get("last_modified"),
+        }
+        return validators if any(validators.values()) else None
+
+    def _get_fresh(cache_str):
+        cached = g.CACHE.get(cache_str)
+        if cached != CacheBase.NOT_CACHED and cached["fresh_until"] > time.time():
+            return cached["result"]
+        return CacheBase.NOT_CACHED
+
+    def _revalidate(cache_str, hours, func, args, kwargs):
+        cached = g.CACHE.get(cache_str)
+        cached = None if cached == CacheBase.NOT_CACHED else cached
+        previous = cached["validators"] if cached and cached["validators"] else {}
+        result, response = func(*args, validators=previous or None, **kwargs)
+        if cached and (response is None or response.status_code >= 500):
+            # The host is failing, so serve the cached result for a short while rather than losing it
+            result = cached["result"]
+            validators = cached["validators"]
+            fresh_for = datetime.timedelta(minutes=REVALIDATE_RETRY_MINUTES)
+        else:
+            if response is not None and response.status_code == 304 and cached:
+                result = cached["result"]
+            validators = _get_validators(response, previous) if response is not None else None
+            fresh_for = datetime.timedelta(hours=hours)
+        expiration = datetime.timedelta(days=revalidate_days) if validators else datetime.timedelta(hours=hours)
+        try:
+            g.CACHE.set(
+                cache_str,
+                {
+                    "result": result,
+                    "validators": validators,
+                    "fresh_until": time.time() + fresh_for.total_seconds(),
+                },
+                expiration=expiration,
+                # Results are kept in the database for revalidation, Kodi memory only needs them while fresh
+                mem_expiration=fresh_for,
+            )
+        except TypeError:
+            g.log_stacktrace()
+        return result
+
+    def _decorator(func):
+        @wraps(func)
+        def _decorated(*args, **kwargs):
+            method_class = args[0]
+
+            for a in list(args[1:]) + list(kwargs.values()):
+                if isinstance(a, types.GeneratorType):
+                    raise UnsupportedCacheParamException("generator")
+
+            overwrite_cache = kwargs.pop("overwrite_cache", False)
+            hours = kwargs.pop("cache_hours", cache_hours)
+            ignore_cache = kwargs.pop("ignore_cache", False)
+            if ignore_cache or g.get_bool_runtime_setting("ignore.cache", False):
+                return func(*args, **kwargs)[0]
+
+            cache_str = "{}.{}.revalidating.{}.{}".format(
+                method_class.__class__.__name__,
+                func.__name__,
+                tools.md5_hash(args[1:]),
+                tools.md5_hash(kwargs),
+            )
+            if not overwrite_cache:
+                if (result := _get_fresh(cache_str)) != CacheBase.NOT_CACHED:
+                    return result
+                with InFlight(cache_str) as request:
+                    result = request.wait(lambda: _get_fresh(cache_str))
+                    if result != CacheBase.NOT_CACHED:
+                        return result
+                    return _revalidate(cache_str, hours, func, args, kwargs)
+            return _revalidate(cache_str, hours, func, args, kwargs)
 
         return _decorated
 
@@ -0,0 +1,152 @@
+import collections
+import time
+
+from resources.lib.database import Database
+from resources.lib.modules.globals import g
+
+schema = {
+    "cloud_items": {
+        "columns": collections.OrderedDict(
+            [
+                ("debrid_provider", ["TEXT", "NOT NULL"]),
+                ("item_id", ["TEXT", "NOT NULL"]),
+                ("data", ["PICKLE", "NOT NULL"]),
+                ("source", ["PICKLE", "NOT NULL"]),
+                ("files", ["PICKLE", "NOT NULL"]),
+                ("details", ["PICKLE"]),
+                ("season", ["INTEGER"]),
+                ("episode", ["INTEGER"]),
+            ]
+        ),
+        "table_constraints": ["PRIMARY KEY(debrid_provider, item_id)"],
+        "default_seed": [],
+        "indices": [("cloud_items_episode", ["debrid_provider", "season", "episode"])],
+    },
+    "cloud_sync": {
+        "columns": collections.OrderedDict(
+            [
+                ("debrid_provider", ["TEXT", "NOT NULL"]),
+                ("refreshed", ["INTEGER", "NOT NULL"]),
+            ]
+        ),
+        "table_constraints": ["PRIMARY KEY(debrid_provider)"],
+        "default_seed": [],
+    },
+}
+
+
+class CloudIndex(Database):
+    """
+    Local index of the files in the users debrid clouds, shared by cloud inspection and My Files.
+    Each item holds the listing entry returned by the API along with its normalised entry and playable files, which
+    have their titles cleaned and season/episode parsed when the item is first indexed
+    """
+
+    def __init__(self):
+        super().__init__(g.CLOUD_INDEX_DB_PATH, schema)
+
+    def get_refreshed(self, debrid_provider):
+        """
+        Fetches when the index of a debrid provider was last refreshed
+        :param debrid_provider: Name of debrid provider
+        :type debrid_provider: str
+        :return: Epoch of last refresh, 0 if it has never been refreshed
+        :rtype: int
+        """
+        result = self.fetchone("SELECT refreshed FROM cloud_sync WHERE debrid_provider=?", (debrid_provider,))
+        return result["refreshed"] if result else 0
+
+    def get_listing(self, debrid_provider):
+        """
+        Fetches the listing entries of a debrid provider as they were returned by the API
+        :param debrid_provider: Name of debrid provider
+        :type debrid_provider: str
+        :return: Dictionary of listing entries keyed by item id
+        :rtype: dict
+        """
+        return {
+            i["item_id"]: i["data"]
+            for i in self.fetchall(
+                "SELECT item_id, data FROM cloud_items WHERE debrid_provider=? ORDER BY rowid", (debrid_provider,)
+            )
+        }
+
+    def get_item(self, debrid_provider, item_id):
+        """
+        Fetches the listing entry of a single item
+        :param debrid_provider: Name of debrid provider
+        :type debrid_provider: str
+        :param item_id: ID of item
+        :type item_id: str
+        :return: Listing entry, None if the item is not indexed
+        :rtype: dict|None
+        """
+        result = self.fetchone(
+            "SELECT data FROM cloud_items WHERE debrid_provider=? AND item_id=?", (debrid_provider, str(item_id))
+        )
+        return result["data"] if result else None
+
+    def get_sources(self, debrid_provider, season=None, episode=None):
+        """
+        Fetches the normalised entries and files of indexed items.
+        When an episode is given, items marked as a different episode are skipped
+        :param debrid_provider: Name of debrid provider
+        :type debrid_provider: str
+        :param season: Season number of the episode being scraped
+        :type season: int|None
+        :param episode: Episode number of the episode being scraped
+        :type episode: int|None
+        :return: List of items with item_id, source and files
+        :rtype: list
+        """
+        if season is None or episode is None:
+            return self.fetchall(
+                "SELECT item_id, source, files FROM cloud_items WHERE debrid_provider=? ORDER BY rowid",
+                (debrid_provider,),
+            )
+        return self.fetchall(
+            "SELECT item_id, source, files FROM cloud_items WHERE debrid_provider=? "
+            "AND (episode IS NULL OR (season=? AND episode=?)) ORDER BY rowid",
+            (debrid_provider, season, episode),
+        )
+
+    def get_details(self, debrid_provider, item_id):
+        result = self.fetchone(
+            "SELECT details FROM cloud_items WHERE debrid_provider=? AND item_id=?", (debrid_provider, str(item_id))
+        )
+        return result["details"] if result else None
+
+    def set_details(self, debrid_provider, item_id, details):
+        self.execute_sql(
+            "UPDATE cloud_items SET details=? WHERE debrid_provider=? AND item_id=?",
+            (details, debrid_provider, str(item_id)),
+        )
+
+    def update_items(self, debrid_provider, items, removed_ids):
+        """
+        Applies the changes found since the last listing and marks the index as refreshed.
+        Details of replaced items are dropped as they may no longer be valid
+        :param debrid_provider: Name of debrid provider
+        :type debrid_provider: str
+        :param items: New or changed items, dictionaries of item_id, data, source, files, season and episode
+        :type items: list
+        :param removed_ids: IDs of items no longer in the listing
+        :type removed_ids: list
+        :return: None
+        :rtype: None
+        """
+        self.execute_sql(
+            "DELETE FROM cloud_items WHERE debrid_provider=? AND item_id=?",
+            [(debrid_provider, i) for i in removed_ids],
+        )
+        self.execute_sql(
+            "REPLACE INTO cloud_items (debrid_provider, item_id, data, source, files, details, season, episode) "
+            "VALUES (?, ?, ?, ?, ?, NULL, ?, ?)",
+            [
+                (debrid_provider, i["item_id"], i["data"], i["source"], i["files"], i["season"], i["episode"])
+                for i in items
+            ],
+        )
+        self.execute_sql(
+            "REPLACE INTO cloud_sync (debrid_provider, refreshed) VALUES (?, ?)", (debrid_provider, int(time.time()))
+        )
@@ -0,0 +1,183 @@
+import collections
+import random
+import time
+
+from resources.lib.database import Database
+from resources.lib.modules.globals import g
+
+# Weight given to the latest scrape in the rolling latency and yield averages
+SMOOTHING = 0.3
+# Consecutive timeouts before a provider is no longer dispatched
+DEMOTION_TIMEOUTS = 3
+# How often a demoted provider is retried to see if it has recovered
+DEMOTION_RETRY = 60 * 60
+# Floor for latency when scoring, avoids instant failures looking infinitely valuable
+MIN_SCORE_LATENCY = 1.0
+
+schema = {
+    "provider_stats": {
+        "columns": collections.OrderedDict(
+            [
+                ("package", ["TEXT", "NOT NULL"]),
+                ("provider_name", ["TEXT", "NOT NULL"]),
+                ("provider_type", ["TEXT", "NOT NULL"]),
+                ("media_type", ["TEXT", "NOT NULL"]),
+                ("scrapes", ["INTEGER", "NOT NULL"]),
+                ("errors", ["INTEGER", "NOT NULL"]),
+                ("timeouts", ["INTEGER", "NOT NULL"]),
+                ("consecutive_timeouts", ["INTEGER", "NOT NULL"]),
+                ("latency", ["REAL", "NOT NULL"]),
+                ("filtered_yield", ["REAL", "NOT NULL"]),
+                ("last_scrape", ["INTEGER", "NOT NULL"]),
+            ]
+        ),
+        "table_constraints": ["PRIMARY KEY(package, provider_name, media_type)"],
+        "default_seed": [],
+    },
+}
+
+
+class ProviderStats(Database):
+    """
+    Per provider latency, error and filtered yield telemetry, per media type
+    """
+
+    def __init__(self):
+        super().__init__(g.PROVIDER_STATS_DB_PATH, schema)
+
+    def get_stats(self, media_type):
+        """
+        Fetches the statistics of all providers for a media type
+        :param media_type: Media type to fetch statistics for
+        :type media_type: str
+        :return: Dictionary of statistics keyed by (package, provider_name)
+        :rtype: dict
+        """
+        return {
+            (i["package"], i["provider_name"]): i
+            for i in self.fetchall("SELECT * FROM provider_stats WHERE media_type=?", (media_type,))
+        }
+
+    def get_package_stats(self, package):
+        """
+        Fetches the statistics of all providers in a package
+        :param package: Name of the provider package
+        :type package: str
+        :return: List of statistics, ordered by provider and media type
+        :rtype: list
+        """
+        return self.fetchall(
+            "SELECT * FROM provider_stats WHERE package=? ORDER BY provider_name, media_type", (package,)
+        )
+
+    def record_scrapes(self, media_type, scrapes):
+        """
+        Folds the outcome of a scrape into the statistics of each provider
+        :param media_type: Media type that was scraped
+        :type media_type: str
+        :param scrapes: Dictionaries with provider, provider_type, latency, filtered_yield, error and timed_out keys
+        :type scrapes: list
+        :return: None
+        :rtype: None
+        """
+        if not scrapes:
+            return
+
+        stats = self.get_stats(media_type)
+        now = int(time.time())
+        rows = []
+        for scrape in scrapes:
+            timed_out = scrape["timed_out"]
+            package, provider_name = scrape["provider"][2], scrape["provider"][1]
+            current = stats.get(
+                (package, provider_name),
+                {
+                    "scrapes": 0,
+                    "errors": 0,
+                    "timeouts": 0,
+                    "consecutive_timeouts": 0,
+                    "latency": scrape["latency"],
+                    "filtered_yield": scrape["filtered_yield"],
+                },
+            )
+            rows.append(
+                (
+                    package,
+                    provider_name,
+                    scrape["provider_type"],
+                    media_type,
+                    current["scrapes"] + 1,
+                    current["errors"] + int(scrape["error"]),
+                    current["timeouts"] + int(timed_out),
+                    current["consecutive_timeouts"] + 1 if timed_out else 0,
+                    self._smooth(current["latency"], scrape["latency"]),
+                    # A timed out provider may still deliver, so its yield is left untouched
+                    current["filtered_yield"]
+                    if timed_out
+                    else self._smooth(current["filtered_yield"], scrape["filtered_yield"]),
+                    now,
+                )
+            )
+
+        self.execute_sql(
+            "REPLACE INTO provider_stats (package, provider_name, provider_type, media_type, scrapes, errors, "
+            "timeouts, consecutive_timeouts, latency, filtered_yield, last_scrape) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    @staticmethod
+    def _smooth(average, value):
+        return average + SMOOTHING * (value - average)
+
+    @staticmethod
+    def score(stats):
+        """
+        Expected number of filtered sources per second of scraping for a provider
+        :param stats: Statistics of the provider
+        :type stats: dict
+        :return: Expected value per second
+        :rtype: float
+        """
+        success_rate = 1 - stats["errors"] / stats["scrapes"]
+        return stats["filtered_yield"] * success_rate / max(stats["latency"], MIN_SCORE_LATENCY)
+
+    @staticmethod
+    def is_demoted(stats):
+        """
+        Checks if a provider keeps timing out and has been tried recently
+        :param stats: Statistics of the provider
+        :type stats: dict
+        :return: True if the provider should not be dispatched
+        :rtype: bool
+        """
+        return (
+            stats["consecutive_timeouts"] >= DEMOTION_TIMEOUTS and time.time() - stats["last_scrape"] < DEMOTION_RETRY
+        )
+
+    def order_providers(self, providers, media_type):
+        """
+        Orders providers by expected value per second and drops providers that keep timing out.
+        Providers without statistics are dispatched first so they can be measured
+        :param providers: Provider tuples of (import path, provider name, package)
+        :type providers: list
+        :param media_type: Media type being scraped
+        :type media_type: str
+        :return: Ordered providers to dispatch
+        :rtype: list
+        """
+        stats = self.get_stats(media_type)
+        unmeasured = []
+        measured = []
+        for provider in providers:
+            provider_stats = stats.get((provider[2], provider[1]))
+            if provider_stats is None:
+                unmeasured.append(provider)
+            elif self.is_demoted(provider_stats):
+                g.log(f"Skipping provider {provider[1]}, timed out {provider_stats['consecutive_timeouts']} times")
+            else:
+                measured.append((self.score(provider_stats), provider))
+
+        random.shuffle(unmeasured)
+        measured.sort(key=lambda k: k[0], reverse=True)
+        return unmeasured + [provider for _, provider in measured]
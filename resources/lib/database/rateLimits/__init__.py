@@ -0,0 +1,87 @@
+import collections
+import math
+import time
+
+from resources.lib.database import Database
+from resources.lib.database import SQLiteConnection
+from resources.lib.modules.globals import g
+
+schema = {
+    "rate_limits": {
+        "columns": collections.OrderedDict(
+            [
+                ("host", ["TEXT", "NOT NULL"]),
+                ("tokens", ["REAL", "NOT NULL"]),
+                ("updated", ["REAL", "NOT NULL"]),
+                ("blocked_until", ["REAL", "NOT NULL"]),
+            ]
+        ),
+        "table_constraints": ["PRIMARY KEY(host)"],
+        "default_seed": [],
+    },
+}
+
+
+class RateLimits(Database):
+    """
+    Token buckets of the API hosts, shared by the service and every plugin invocation.
+    Buckets refill continuously at the rate of the host, up to its capacity, and can be emptied until a time given by
+    the host when it asks clients to back off
+    """
+
+    def __init__(self):
+        super().__init__(g.RATE_LIMITS_DB_PATH, schema)
+
+    def acquire(self, host, rate, capacity, tokens):
+        """
+        Takes up to the requested number of tokens from the bucket of a host
+        :param host: Host name of the bucket
+        :type host: str
+        :param rate: Tokens added to the bucket per second
+        :type rate: float
+        :param capacity: Maximum number of tokens the bucket holds
+        :type capacity: float
+        :param tokens: Number of tokens wanted, at least one is taken if available
+        :type tokens: int
+        :return: Tuple of the number of tokens taken and seconds to wait before trying again if none were taken
+        :rtype: tuple
+        """
+        now = time.time()
+        with SQLiteConnection(self._db_file) as sqlite:
+            with sqlite.transaction() as cursor:
+                cursor.execute(
+                    "INSERT OR IGNORE INTO rate_limits (host, tokens, updated, blocked_until) VALUES (?, ?, ?, 0)",
+                    (host, capacity, now),
+                )
+                # Refilling first takes the write lock, so no other process can take the same tokens
+                cursor.execute(
+                    "UPDATE rate_limits SET tokens=MIN(?, tokens + MAX(0, ? - updated) * ?), updated=? WHERE host=?",
+                    (capacity, now, rate, now, host),
+                )
+                cursor.execute("SELECT tokens, blocked_until FROM rate_limits WHERE host=?", (host,))
+                bucket = cursor.fetchone()
+                if bucket["blocked_until"] > now:
+                    return 0, bucket["blocked_until"] - now
+                taken = min(tokens, math.floor(bucket["tokens"]))
+                if taken < 1:
+                    return 0, (1 - bucket["tokens"]) / rate
+                cursor.execute("UPDATE rate_limits SET tokens=tokens - ? WHERE host=?", (taken, host))
+                return taken, 0
+
+    def block(self, host, until):
+        """
+        Empties the bucket of a host and stops tokens being taken from it until the given time
+        :param host: Host name of the bucket
+        :type host: str
+        :param until: Epoch the host may be called again
+        :type until: float
+        :return: None
+        :rtype: None
+        """
+        now = time.time()
+        self.execute_sql(
+            "INSERT INTO rate_limits (host, tokens, updated, blocked_until) VALUES (?, 0, ?, ?) "
+            "ON CONFLICT(host) DO UPDATE SET tokens=0, updated=excluded.updated, "
+            "blocked_until=MAX(blocked_until, excluded.blocked_until)",
+            (host, now, until),
+        )
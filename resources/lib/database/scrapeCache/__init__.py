@@ -0,0 +1,123 @@
+import collections
+import datetime
+import time
+
+import xbmcgui
+
+from resources.lib.database import Database
+from resources.lib.modules.globals import g
+
+HOSTER_CACHE_TYPE = "hosters"
+ADAPTIVE_CACHE_TYPE = "adaptive"
+DIRECT_CACHE_TYPE = "direct"
+CLOUD_CACHE_TYPE = "cloud"
+
+# (refresh after, expires after) per provider type.
+# Results older than the refresh period are still served, but the provider is scraped again to refresh them
+CACHE_PERIODS = {
+    HOSTER_CACHE_TYPE: (datetime.timedelta(hours=1), datetime.timedelta(hours=6)),
+    ADAPTIVE_CACHE_TYPE: (datetime.timedelta(minutes=30), datetime.timedelta(hours=3)),
+    DIRECT_CACHE_TYPE: (datetime.timedelta(minutes=30), datetime.timedelta(hours=3)),
+    CLOUD_CACHE_TYPE: (datetime.timedelta(minutes=5), datetime.timedelta(hours=1)),
+}
+
+schema = {
+    "sources": {
+        "columns": collections.OrderedDict(
+            [
+                ("item_key", ["TEXT", "NOT NULL"]),
+                ("provider", ["TEXT", "NOT NULL"]),
+                ("provider_type", ["TEXT", "NOT NULL"]),
+                ("sources", ["PICKLE", "NOT NULL"]),
+                ("refresh_after", ["INTEGER", "NOT NULL"]),
+                ("expires", ["INTEGER", "NOT NULL"]),
+            ]
+        ),
+        "table_constraints": ["PRIMARY KEY(item_key, provider)"],
+        "default_seed": [],
+    },
+}
+
+
+class ScrapeCache(Database):
+    """
+    Short lived cache of hoster, adaptive, direct and cloud scrape results per item and provider
+    """
+
+    def __init__(self):
+        super().__init__(g.SCRAPE_CACHE_DB_PATH, schema)
+        self.enabled = g.get_bool_setting("general.scrapeCache")
+
+    @staticmethod
+    def _get_item_key(item_meta):
+        return f"{item_meta['info']['mediatype']}_{item_meta['trakt_id']}"
+
+    def get_sources(self, item_meta):
+        """
+        Fetches all unexpired cached scrape results for an item
+        :param item_meta: Item information of the item being scraped
+        :type item_meta: dict
+        :return: List of cached results with provider, provider_type, sources and fresh keys
+        :rtype: list
+        """
+        if not self.enabled:
+            return []
+
+        now = time.time()
+        results = self.fetchall(
+            "SELECT provider, provider_type, sources, refresh_after FROM sources WHERE item_key=? AND expires > ?",
+            (self._get_item_key(item_meta), now),
+        )
+        for result in results:
+            result["fresh"] = result.pop("refresh_after") > now
+        return results
+
+    def add_sources(self, item_meta, provider, provider_type, sources):
+        """
+        Stores the results of a single provider for an item
+        :param item_meta: Item information of the item being scraped
+        :type item_meta: dict
+        :param provider: Unique name of the provider
+        :type provider: str
+        :param provider_type: Type of provider, one of hosters, adaptive, direct or cloud
+        :type provider_type: str
+        :param sources: Processed sources the provider returned
+        :type sources: list|dict
+        :return: None
+        :rtype: None
+        """
+        if not self.enabled:
+            return
+
+        refresh_after, expiration = CACHE_PERIODS[provider_type]
+        now = time.time()
+        self.execute_sql(
+            "REPLACE INTO sources (item_key, provider, provider_type, sources, refresh_after, expires) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                self._get_item_key(item_meta),
+                provider,
+                provider_type,
+                sources,
+                now + refresh_after.total_seconds(),
+                now + expiration.total_seconds(),
+            ),
+        )
+
+    def clear_item(self, item_meta):
+        self.execute_sql("DELETE FROM sources WHERE item_key=?", (self._get_item_key(item_meta),))
+
+    def do_cleanup(self):
+        busy_key = "scrapecache.db.clean.busy"
+        if g.get_bool_runtime_setting(busy_key):
+            return
+        g.set_runtime_setting(busy_key, True)
+
+        self.execute_sql("DELETE FROM sources where expires < ?", (time.time(),))
+        g.clear_runtime_setting(busy_key)
+
+    def clear_all(self):
+        g.show_busy_dialog()
+        self.rebuild_database()
+        xbmcgui.Dialog().ok(g.ADDON_NAME, g.get_language_string(30678))
+        g.close_busy_dialog()
@@ -0,0 +1,167 @@
+import collections
+import time
+
+import xbmcgui
+
+from resources.lib.database import Database
+from resources.lib.modules.globals import g
+
+# Played sources needed before a learned deadline is used
+MIN_SAMPLES = 10
+# Played sources kept per media type
+HISTORY_SIZE = 200
+# Scrapes that are not followed by playback within this time are discarded
+PENDING_EXPIRY = 60 * 60 * 24
+
+schema = {
+    "pending": {
+        "columns": collections.OrderedDict(
+            [
+                ("item_key", ["TEXT", "NOT NULL"]),
+                ("media_type", ["TEXT", "NOT NULL"]),
+                ("arrivals", ["PICKLE", "NOT NULL"]),
+                ("runtime", ["REAL", "NOT NULL"]),
+                ("cutoff", ["REAL"]),
+                ("created", ["INTEGER", "NOT NULL"]),
+            ]
+        ),
+        "table_constraints": ["PRIMARY KEY(item_key)"],
+        "default_seed": [],
+    },
+    "history": {
+        "columns": collections.OrderedDict(
+            [
+                ("media_type", ["TEXT", "NOT NULL"]),
+                ("arrival", ["REAL", "NOT NULL"]),
+                ("runtime", ["REAL", "NOT NULL"]),
+                ("provider", ["TEXT"]),
+                ("provider_type", ["TEXT"]),
+                ("cutoff", ["REAL"]),
+                ("created", ["INTEGER", "NOT NULL"]),
+            ]
+        ),
+        "table_constraints": [],
+        "default_seed": [],
+        "indices": [("history_media_type", ["media_type", "created"])],
+    },
+}
+
+
+class ScrapeHistory(Database):
+    """
+    History of when the source that was eventually played arrived during a scrape, per media type
+    """
+
+    def __init__(self):
+        super().__init__(g.SCRAPE_HISTORY_DB_PATH, schema)
+
+    @staticmethod
+    def _get_item_key(item_meta):
+        return f"{item_meta['info']['mediatype']}_{item_meta['trakt_id']}"
+
+    def add_pending(self, item_meta, arrivals, runtime, cutoff=None):
+        """
+        Stores the arrival times of a finished scrape until one of its sources is played
+        :param item_meta: Item information of the scraped item
+        :type item_meta: dict
+        :param arrivals: Arrival of each source keyed by source identity, values of (seconds, source type, provider)
+        :type arrivals: dict
+        :param runtime: Seconds the scrape ran for
+        :type runtime: float
+        :param cutoff: Seconds into the scrape it was cut short at, None if it ran to completion
+        :type cutoff: float|None
+        :return: None
+        :rtype: None
+        """
+        now = int(time.time())
+        self.execute_sql("DELETE FROM pending WHERE created < ?", (now - PENDING_EXPIRY,))
+        self.execute_sql(
+            "REPLACE INTO pending (item_key, media_type, arrivals, runtime, cutoff, created) VALUES (?, ?, ?, ?, ?, ?)",
+            (self._get_item_key(item_meta), item_meta['info']['mediatype'], arrivals, runtime, cutoff, now),
+        )
+
+    def record_played(self, item_meta, source_identity):
+        """
+        Moves the arrival of a played source from the pending scrape of the item into the history
+        :param item_meta: Item information of the played item
+        :type item_meta: dict
+        :param source_identity: Identity of the played source, see source_utils.get_source_identity
+        :type source_identity: tuple
+        :return: True if the played source was found in a pending scrape
+        :rtype: bool
+        """
+        item_key = self._get_item_key(item_meta)
+        pending = self.fetchone("SELECT * FROM pending WHERE item_key=?", (item_key,))
+        if not pending or source_identity not in pending["arrivals"]:
+            return False
+
+        arrival, source_type, provider = pending["arrivals"][source_identity]
+        media_type = pending["media_type"]
+        self.execute_sql("DELETE FROM pending WHERE item_key=?", (item_key,))
+        self.execute_sql(
+            "INSERT INTO history (media_type, arrival, runtime, provider, provider_type, cutoff, created) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (media_type, arrival, pending["runtime"], provider, source_type, pending["cutoff"], int(time.time())),
+        )
+        self.execute_sql(
+            "DELETE FROM history WHERE media_type=? AND rowid NOT IN "
+            "(SELECT rowid FROM history WHERE media_type=? ORDER BY created DESC LIMIT ?)",
+            (media_type, media_type, HISTORY_SIZE),
+        )
+        return True
+
+    def get_history(self, media_type):
+        return self.fetchall("SELECT * FROM history WHERE media_type=? ORDER BY created DESC", (media_type,))
+
+    def get_learned_deadline(self, media_type, confidence, source_types=None):
+        """
+        Learns how long to keep scraping once a playable source is available.
+        The deadline is the earliest time where the chance of the eventually played source still arriving is below
+        the given confidence, based on played sources whose type is being scraped for.
+        Scrapes cut short are censored observations, their played source is only known to have arrived by the cutoff.
+        They are counted at the arrival of the played source, so scrapes that found an acceptable source early pull the
+        deadline in while scrapes without a playable source by the deadline run on and push it out
+        :param media_type: Media type being scraped
+        :type media_type: str
+        :param confidence: Acceptable chance of missing the played source, between 0 and 1
+        :type confidence: float
+        :param source_types: Source types being scraped, None to use all history
+        :type source_types: set|None
+        :return: Deadline in seconds, or None if there is not enough history
+        :rtype: float|None
+        """
+        arrivals = sorted(
+            i["arrival"]
+            for i in self.get_history(media_type)
+            if source_types is None or i["provider_type"] in source_types
+        )
+        if len(arrivals) < MIN_SAMPLES:
+            return None
+        return arrivals[min(len(arrivals) - 1, int((1 - confidence) * len(arrivals)))]
+
+    def show_learned_deadlines(self):
+        """
+        Displays the learned deadline, or its override, for each media type
+        :return: None
+        :rtype: None
+        """
+        confidence = g.get_int_setting("preem.learned.confidence") / 100
+        lines = []
+        for media_type, label in ((g.MEDIA_MOVIE, 30264), (g.MEDIA_EPISODE, 30689)):
+            arrivals = sorted(i["arrival"] for i in self.get_history(media_type))
+            lines.append(f"[B]{g.get_language_string(label)}[/B]")
+            lines.append(g.get_language_string(30690).format(len(arrivals)))
+            if arrivals:
+                lines.append(g.get_language_string(30691).format(arrivals[len(arrivals) // 2]))
+
+            override = g.get_int_setting(f"preem.learned.deadline.{media_type}")
+            deadline = self.get_learned_deadline(media_type, confidence)
+            if override > 0:
+                lines.append(g.get_language_string(30692).format(override))
+            elif deadline is not None:
+                lines.append(g.get_language_string(30693).format(deadline))
+            else:
+                lines.append(g.get_language_string(30694))
+            lines.append("")
+
+        xbmcgui.Dialog().textviewer(g.ADDON_NAME, "\n".join(lines))
@@ -15,6 +15,8 @@ from resources.lib.modules.timeLogger import stopwatch
 
 class TraktSyncDatabase(trakt_sync.TraktSyncDatabase):
     sync_errors = False
+    # Items of a streamed sync response inserted and milled together
+    sync_batch_size = 100
 
     def __init__(self):
         super().__init__()
@@ -225,18 +227,32 @@ class TraktSyncDatabase(trakt_sync.TraktSyncDatabase):
             items.extend(paged_items)
         return {section: items}
 
+    def _get_sync_batches(self, url):
+        """
+        Streams a sync response, yielding its items in batches so only a batch is held in memory at once
+        :param url: Sync endpoint to request
+        :type url: str
+        :return: Yields lists of normalised items
+        :rtype: collections.abc.Iterator
+        """
+        items = self.trakt_api.get_json_stream(url, extended="full")
+        while batch := list(itertools.islice(items, self.sync_batch_size)):
+            yield batch
+
     def _sync_watched_movies(self):
         try:
-            trakt_watched = self.trakt_api.get_json("/sync/watched/movies", extended="full")
-            if len(trakt_watched) == 0:
+            movie_ids = []
+            for trakt_watched in self._get_sync_batches("/sync/watched/movies"):
+                self.insert_trakt_movies(trakt_watched)
+                movie_ids.extend(i.get("trakt_id") for i in trakt_watched)
+            if len(movie_ids) == 0:
                 return
-            self.insert_trakt_movies(trakt_watched)
             self.execute_sql(
                 [
                     "UPDATE movies SET watched = 0",
                     f"""
                     UPDATE movies SET watched=1
-                    WHERE trakt_id IN ({','.join(str(i.get('trakt_id')) for i in trakt_watched)})
+                    WHERE trakt_id IN ({','.join(map(str, movie_ids))})
                     """,
                 ]
             )
@@ -245,16 +261,18 @@ class TraktSyncDatabase(trakt_sync.TraktSyncDatabase):
 
     def _sync_collection_movies(self):
         try:
-            trakt_collection = self.trakt_api.get_json("sync/collection/movies", extended="full")
-            if len(trakt_collection) == 0:
+            movie_ids = []
+            for trakt_collection in self._get_sync_batches("sync/collection/movies"):
+                self.insert_trakt_movies(trakt_collection)
+                movie_ids.extend(i.get("trakt_id") for i in trakt_collection)
+            if len(movie_ids) == 0:
                 return
-            self.insert_trakt_movies(trakt_collection)
             self.execute_sql(
                 [
                     "UPDATE movies SET collected=0",
                     f"""
                     UPDATE movies SET collected=1
-                    WHERE trakt_id IN ({','.join(str(i.get('trakt_id')) for i in trakt_collection)})
+                    WHERE trakt_id IN ({','.join(map(str, movie_ids))})
                     """,
                 ]
             )
@@ -304,31 +322,33 @@ class TraktSyncDatabase(trakt_sync.TraktSyncDatabase):
     def sync_watched_episodes(self):
         try:
             get = MetadataHandler.get_trakt_info
-            trakt_watched = self.trakt_api.get_json("sync/watched/shows", extended="full")
-            if not trakt_watched:
-                return
-            self.insert_trakt_shows(trakt_watched)
-            self._mill_if_needed(trakt_watched, self._queue_with_progress)
+            show_ids = set()
 
             with self.create_temp_table(
                 "_episodes_watched",
                 ["trakt_show_id", "season", "episode", "last_watched_at", "watched"],
                 primary_key="trakt_show_id, season, episode",
             ) as temp_table:
-                temp_table.insert_data(
-                    [
-                        {
-                            "trakt_show_id": show.get("trakt_id"),
-                            "season": get(season, "season"),
-                            "episode": get(episode, "episode"),
-                            "last_watched_at": get(episode, "last_watched_at"),
-                            "watched": get(episode, "playcount"),
-                        }
-                        for show in trakt_watched
-                        for season in get(show, "seasons", [])
-                        for episode in get(season, "episodes", [])
-                    ]
-                )
+                for trakt_watched in self._get_sync_batches("sync/watched/shows"):
+                    self.insert_trakt_shows(trakt_watched)
+                    self._mill_if_needed(trakt_watched, self._queue_with_progress)
+                    temp_table.insert_data(
+                        [
+                            {
+                                "trakt_show_id": show.get("trakt_id"),
+                                "season": get(season, "season"),
+                                "episode": get(episode, "episode"),
+                                "last_watched_at": get(episode, "last_watched_at"),
+                                "watched": get(episode, "playcount"),
+                            }
+                            for show in trakt_watched
+                            for season in get(show, "seasons", [])
+                            for episode in get(season, "episodes", [])
+                        ]
+                    )
+                    show_ids.update(show.get("trakt_id") for show in trakt_watched)
+                if not show_ids:
+                    return
 
                 self.execute_sql(
                     [
@@ -353,12 +373,12 @@ class TraktSyncDatabase(trakt_sync.TraktSyncDatabase):
                     ]
                 )
 
-            self.update_shows_statistics(trakt_watched)
+            self.update_shows_statistics({"trakt_id": i} for i in show_ids)
             self.update_season_statistics(
                 self.fetchall(
                     f"""
                     SELECT trakt_id FROM seasons
-                    WHERE trakt_show_id IN ({','.join({str(i.get('trakt_id')) for i in trakt_watched})})
+                    WHERE trakt_show_id IN ({','.join(map(str, show_ids))})
                     """
                 )
             )
@@ -368,32 +388,33 @@ class TraktSyncDatabase(trakt_sync.TraktSyncDatabase):
     def sync_collection_episodes(self):
         try:
             get = MetadataHandler.get_trakt_info
-            trakt_collection = self.trakt_api.get_json("sync/collection/shows", extended="full")
-            if not trakt_collection:
-                return
-
-            self.insert_trakt_shows(trakt_collection)
-            self._mill_if_needed(trakt_collection, self._queue_with_progress)
+            show_ids = set()
 
             with self.create_temp_table(
                 "_episodes_collected",
                 ["trakt_show_id", "season", "episode", "collected_at", "collected"],
                 primary_key="trakt_show_id, season, episode",
             ) as temp_table:
-                temp_table.insert_data(
-                    [
-                        {
-                            "trakt_show_id": show.get("trakt_id"),
-                            "season": get(season, "season"),
-                            "episode": get(episode, "episode"),
-                            "collected_at": get(episode, "collected_at"),
-                            "collected": get(episode, "collected"),
-                        }
-                        for show in trakt_collection
-                        for season in get(show, "seasons", [])
-                        for episode in get(season, "episodes", [])
-                    ]
-                )
+                for trakt_collection in self._get_sync_batches("sync/collection/shows"):
+                    self.insert_trakt_shows(trakt_collection)
+                    self._mill_if_needed(trakt_collection, self._queue_with_progress)
+                    temp_table.insert_data(
+                        [
+                            {
+                                "trakt_show_id": show.get("trakt_id"),
+                                "season": get(season, "season"),
+                                "episode": get(episode, "episode"),
+                                "collected_at": get(episode, "collected_at"),
+                                "collected": get(episode, "collected"),
+                            }
+                            for show in trakt_collection
+                            for season in get(show, "seasons", [])
+                            for episode in get(season, "episodes", [])
+                        ]
+                    )
+                    show_ids.update(show.get("trakt_id") for show in trakt_collection)
+                if not show_ids:
+                    return
 
                 self.execute_sql(
                     [
@@ -418,12 +439,12 @@ class TraktSyncDatabase(trakt_sync.TraktSyncDatabase):
                     ]
                 )
 
-            self.update_shows_statistics(trakt_collection)
+            self.update_shows_statistics({"trakt_id": i} for i in show_ids)
             self.update_season_statistics(
                 self.fetchall(
                     f"""
                     SELECT trakt_id FROM seasons
-                    WHERE trakt_show_id IN ({','.join({str(i.get('trakt_id')) for i in trakt_collection})})
+                    WHERE trakt_show_id IN ({','.join(map(str, show_ids))})
                     """
                 )
             )
@@ -1060,3 +1060,41 @@ class TraktSyncDatabase(trakt_sync.TraktSyncDatabase):
             """SELECT trakt_id, trakt_show_id FROM episodes WHERE trakt_show_id=? AND season=? AND number=?""",
             (trakt_show_id, season, episode),
         )
+
+    @guard_against_none_or_empty(dict)
+    def get_episodes_list_args(self, trakt_ids):
+        """
+        Fetches the action args stored against the list items of episodes
+        :param trakt_ids: Trakt IDs of the episodes
+        :type trakt_ids: list
+        :return: Quoted action args keyed by episode Trakt ID
+        :rtype: dict
+        """
+        return {
+            i["trakt_id"]: i["args"]
+            for i in self.fetchall(
+                f"SELECT trakt_id, args FROM episodes WHERE trakt_id IN ({','.join(str(int(i)) for i in trakt_ids)})"
+            )
+            if i["args"]
+        }
+
+    @guard_against_none()
+    def get_first_unwatched_episode_args(self, trakt_show_id):
+        """
+        Fetches the action args of the first aired and unwatched episode of a show
+        :param trakt_show_id: Trakt ID of show
+        :type trakt_show_id: int
+        :return: Quoted action args of the episode, None if all aired episodes are watched
+        :rtype: str|None
+        """
+        episode = self.fetchone(
+            f"""
+            SELECT args FROM episodes
+            WHERE trakt_show_id=? AND season > 0 AND watched = 0
+                AND Datetime(air_date) < Datetime('{self._get_datetime_now()}')
+            ORDER BY season, number
+            LIMIT 1
+            """,
+            (trakt_show_id,),
+        )
+        return episode["args"] if episode and episode["args"] else None
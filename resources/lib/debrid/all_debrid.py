@@ -8,6 +8,7 @@ import xbmcgui
 
 from resources.lib.common import tools
 from resources.lib.database.cache import use_cache
+from resources.lib.modules import http_sessions
 from resources.lib.modules.globals import g
 
 AD_AUTH_KEY = "alldebrid.apikey"
@@ -65,14 +66,7 @@ class AllDebrid:
 
     @cached_property
     def session(self):
-        import requests
-        from requests.adapters import HTTPAdapter
-        from urllib3 import Retry
-
-        session = requests.Session()
-        retries = Retry(total=5, backoff_factor=0.1, status_forcelist=[429, 500, 502, 503, 504])
-        session.mount("https://", HTTPAdapter(max_retries=retries, pool_maxsize=100))
-        return session
+        return http_sessions.get_session(self.base_url)
 
     @alldebrid_guard_response
     def get(self, url, **params):
@@ -161,7 +155,7 @@ class AllDebrid:
     def upload_magnet(self, magnet_hash):
         return self.get_json("magnet/upload", magnet=magnet_hash)
 
-    @use_cache(1)
+    @use_cache(1, in_flight=True)
     def update_relevant_hosters(self):
         return self.get_json("hosts")
 
@@ -12,6 +12,7 @@ import xbmcgui
 from resources.lib.common import tools
 from resources.lib.database.cache import use_cache
 from resources.lib.database.premiumizeTransfers import PremiumizeTransfers
+from resources.lib.modules import http_sessions
 from resources.lib.modules.globals import g
 
 PM_TOKEN_KEY = "premiumize.token"
@@ -33,14 +34,7 @@ class Premiumize:
 
     @cached_property
     def session(self):
-        import requests
-        from requests.adapters import HTTPAdapter
-        from urllib3 import Retry
-
-        session = requests.Session()
-        retries = Retry(total=5, backoff_factor=0.1, status_forcelist=[500, 502, 503, 504])
-        session.mount("https://", HTTPAdapter(max_retries=retries, pool_maxsize=100))
-        return session
+        return http_sessions.get_session("https://www.premiumize.me/api")
 
     @staticmethod
     def _error_handler(request):
@@ -283,7 +277,7 @@ class Premiumize:
         post_data = {"items[]": source_list}
         return self.post_url("/cache/check", data=post_data)
 
-    @use_cache(1)
+    @use_cache(1, in_flight=True)
     def update_relevant_hosters(self):
         """
         Cached request to fetch all relevant available hoster domains currently supported
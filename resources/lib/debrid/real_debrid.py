@@ -8,6 +8,7 @@ from resources.lib.common import source_utils
 from resources.lib.common import tools
 from resources.lib.common.thread_pool import ThreadPool
 from resources.lib.database.cache import use_cache
+from resources.lib.modules import http_sessions
 from resources.lib.modules.exceptions import RanOnceAlready
 from resources.lib.modules.exceptions import UnexpectedResponse
 from resources.lib.modules.global_lock import GlobalLock
@@ -38,14 +39,7 @@ class RealDebrid:
 
     @cached_property
     def session(self):
-        import requests
-        from requests.adapters import HTTPAdapter
-        from urllib3 import Retry
-
-        session = requests.Session()
-        retries = Retry(total=5, backoff_factor=0.1, status_forcelist=[500, 502, 503, 504])
-        session.mount("https://", HTTPAdapter(max_retries=retries, pool_maxsize=100))
-        return session
+        return http_sessions.get_session(self.base_url)
 
     def _auth_loop(self):
         url = f"client_id={RD_AUTH_CLIENT_ID}&code={self.device_code}"
@@ -298,7 +292,7 @@ class RealDebrid:
         """
         return len([i for i in storage_variant.values() if not source_utils.is_file_ext_valid(i["filename"])]) <= 0
 
-    @use_cache(1)
+    @use_cache(1, in_flight=True)
     def get_relevant_hosters(self):
         host_list = self.get_url("hosts/status")
         if "error" in host_list:
@@ -145,8 +145,15 @@ class RealDebridWalker(BaseDebridWalker):
 
         return RealDebrid()
 
+    @cached_property
+    def cloud_scraper(self):
+        from resources.lib.modules.cloud_scrapers import RealDebridCloudScraper
+
+        return RealDebridCloudScraper()
+
     def get_init_list(self):
-        root = self.real_debrid.list_torrents()
+        self.cloud_scraper.refresh_index()
+        root = self.cloud_scraper.get_index_listing()
         items = []
 
         for i in root:
@@ -169,7 +176,7 @@ class RealDebridWalker(BaseDebridWalker):
         return bool(list_item.get('links'))
 
     def get_folder(self, list_item):
-        folder = self.real_debrid.torrent_info(list_item['id'])
+        folder = self.cloud_scraper.get_item_details(list_item['id']) or {}
         files = [file for file in folder.get("files", []) if file.get("selected") == 1]
         items = []
 
@@ -198,8 +205,15 @@ class AllDebridWalker(BaseDebridWalker):
 
         return AllDebrid()
 
+    @cached_property
+    def cloud_scraper(self):
+        from resources.lib.modules.cloud_scrapers import AllDebridCloudScraper
+
+        return AllDebridCloudScraper()
+
     def get_init_list(self):
-        root = self.all_debrid.magnet_status(None).get("magnets", [])
+        self.cloud_scraper.refresh_index()
+        root = self.cloud_scraper.get_index_listing()
         items = []
 
         for i in root:
@@ -229,7 +243,7 @@ class AllDebridWalker(BaseDebridWalker):
         return bool(list_item.get("links"))
 
     def get_folder(self, list_item):
-        links = self.all_debrid.magnet_status(list_item['id']).get("magnets", []).get("links", [])
+        links = (self.cloud_scraper.get_index_item(list_item['id']) or {}).get("links", [])
         items = []
 
         for l in links:
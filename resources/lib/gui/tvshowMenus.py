@@ -7,6 +7,7 @@ import xbmcplugin
 
 from resources.lib.common import tools
 from resources.lib.indexers import trakt_auth_guard
+from resources.lib.modules import pre_scrape_queue
 from resources.lib.modules.globals import g
 
 
@@ -521,12 +522,15 @@ class Menus:
 
     def show_seasons(self, args):
         self.list_builder.season_list_builder(args["trakt_id"], no_paging=True)
+        pre_scrape_queue.predict_show(args["trakt_id"])
 
     def season_episodes(self, args):
         self.list_builder.episode_list_builder(args["trakt_show_id"], args["trakt_id"], no_paging=True)
+        pre_scrape_queue.predict_show(args["trakt_show_id"])
 
     def flat_episode_list(self, args):
         self.list_builder.episode_list_builder(args["trakt_id"], no_paging=True)
+        pre_scrape_queue.predict_show(args["trakt_id"])
 
     def shows_genres(self):
         g.add_directory_item(
@@ -1,6 +1,7 @@
 import xbmcgui
 
 from resources.lib.database.providerCache import ProviderCache
+from resources.lib.database.providerStats import ProviderStats
 from resources.lib.database.skinManager import SkinManager
 from resources.lib.gui.windows.base_window import BaseWindow
 from resources.lib.gui.windows.configure_provider_package import PackageConfiguration
@@ -56,6 +57,29 @@ class ProviderPackages(BaseWindow):
         finally:
             del window
 
+    @staticmethod
+    def _show_package_stats(package_name):
+        provider_stats = ProviderStats()
+        lines = []
+        for stats in provider_stats.get_package_stats(package_name):
+            lines.append(
+                g.get_language_string(30681).format(
+                    stats["provider_name"],
+                    stats["media_type"],
+                    stats["latency"],
+                    stats["filtered_yield"],
+                    stats["errors"],
+                    stats["timeouts"],
+                    stats["scrapes"],
+                )
+            )
+            if provider_stats.is_demoted(stats):
+                lines.append(f"    {g.get_language_string(30682)}")
+
+        xbmcgui.Dialog().textviewer(
+            f"{g.ADDON_NAME}: {package_name}", "\n".join(lines) if lines else g.get_language_string(30683)
+        )
+
     def flip_mutliple_providers(self, status, package_name):
 
         g.show_busy_dialog()
@@ -79,6 +103,7 @@ class ProviderPackages(BaseWindow):
                     g.get_language_string(30475),
                     g.get_language_string(30241) if enabled else g.get_language_string(30240),
                     g.get_language_string(30239),
+                    g.get_language_string(30680),
                 ]
             )
             if response == 0:
@@ -99,6 +124,8 @@ class ProviderPackages(BaseWindow):
                     self.set_default_focus(self.package_list, 2999)
                 finally:
                     g.close_busy_dialog()
+            elif response == 3:
+                self._show_package_stats(package_name)
 
         if action == 7:
             if control_id == 1000:
@@ -1,3 +1,5 @@
+import threading
+
 import xbmcgui
 
 from resources.lib.database.skinManager import SkinManager
@@ -7,6 +9,7 @@ from resources.lib.modules.download_manager import create_task as download_file
 from resources.lib.modules.exceptions import InvalidSourceType
 from resources.lib.modules.globals import g
 from resources.lib.modules.helpers import Resolverhelper
+from resources.lib.modules.source_sorter import SourceSorter
 
 
 class SourceSelect(SourceWindow):
@@ -14,13 +17,32 @@ class SourceSelect(SourceWindow):
     Window for source select
     """
 
-    def __init__(self, xml_file, location, item_information=None, sources=None, uncached=None):
+    def __init__(
+        self, xml_file, location, item_information=None, sources=None, uncached=None, scraper=None, overwrite_cache=False
+    ):
         super().__init__(xml_file, location, item_information=item_information, sources=sources)
         self.uncached_sources = uncached or []
         self.position = -1
         self.stream_link = False
+        self.scraper = scraper
+        self.overwrite_cache = overwrite_cache
+        self.scraping = False
+        self.resolving = False
+        self.closed = False
+        self.sources_lock = threading.Lock()
+        self.streamed_sources = []
+        self.source_sorter = SourceSorter(item_information) if scraper else None
         self.setProperty("instant_close", "false")
         self.setProperty("resolving", "false")
+        self.setProperty("scraping", "false")
+
+    def onInit(self):
+        super().onInit()
+        if self.scraper and not self.scraping and not self.closed:
+            self.scraping = True
+            self.setProperty("scraping", "true")
+            threading.Thread(target=self._run_scraper).start()
+            threading.Thread(target=self._stream_sources).start()
 
     def doModal(self):
         """
@@ -30,7 +52,89 @@ class SourceSelect(SourceWindow):
         super().doModal()
         return self.stream_link
 
+    def close(self):
+        self.closed = True
+        if self.scraper:
+            self.scraper.cancel_scrape()
+        super().close()
+
+    def _run_scraper(self):
+        try:
+            if results := self.scraper.get_sources(overwrite_torrent_cache=self.overwrite_cache):
+                self.uncached_sources = results[0]
+        except Exception:
+            g.log_stacktrace()
+        finally:
+            self.scraping = False
+            self.setProperty("scraping", "false")
+
+    def _stream_sources(self):
+        """
+        Pushes sources into the window as they are found until the scraper finishes or the window is closed
+        :return: None
+        :rtype: None
+        """
+        while self.scraping and not self.closed and not g.wait_for_abort(0.5):
+            self._add_new_sources()
+
+        if self.closed:
+            return
+
+        self._add_new_sources()
+        if not self.sources and self.streamed_sources:
+            self._offer_filtered_sources()
+        if not self.sources and not self.uncached_sources:
+            self.stream_link = None
+            self.close()
+
+    def _add_new_sources(self):
+        with self.sources_lock:
+            # A resolve may have started, or closed the window, while waiting for the lock
+            if self.closed or self.resolving:
+                return
+            added, removed = self.scraper.get_source_changes()
+            if not added and not removed:
+                return
+
+            selected_position = self.display_list.getSelectedPosition()
+            selected_source = self.sources[selected_position] if 0 <= selected_position < len(self.sources) else None
+            if removed:
+                removed_ids = {id(source) for source in removed}
+                self.sources = [source for source in self.sources if id(source) not in removed_ids]
+                self.streamed_sources = [source for source in self.streamed_sources if id(source) not in removed_ids]
+            self.streamed_sources.extend(added)
+            self.sources = self.source_sorter.merge_sources(self.sources, added)
+            self.populate_sources_list()
+
+            selected_index = next(
+                (idx for idx, source in enumerate(self.sources) if source is selected_source),
+                None,
+            )
+            if selected_index is not None:
+                self.display_list.selectItem(selected_index)
+            elif self.sources:
+                self.set_default_focus(self.display_list, 2999, control_list_reset=True)
+
+    def _offer_filtered_sources(self):
+        """
+        Asks whether to show the sources found when every one of them was filtered out, as source select does when the
+        sources are not streamed
+        :return: None
+        :rtype: None
+        """
+        with self.sources_lock:
+            if self.closed or self.resolving:
+                return
+            self.sources = self.source_sorter.sort_sources(self.streamed_sources)
+            if self.sources:
+                self.populate_sources_list()
+                self.set_default_focus(self.display_list, 2999, control_list_reset=True)
+
     def handle_action(self, action_id, control_id=None):
+        with self.sources_lock:
+            self._handle_action(action_id, control_id)
+
+    def _handle_action(self, action_id, control_id=None):
         self.position = self.display_list.getSelectedPosition()
 
         if action_id == 117:
@@ -75,7 +179,11 @@ class SourceSelect(SourceWindow):
             sources = [self.sources[self.position]]
 
         resolver_helper = Resolverhelper()
+        self.resolving = True
         self.setProperty("resolving", "true")
+        # Closing the window cancels the scrape, so its arrivals are stored before the played source is recorded
+        if self.scraper and self.scraping:
+            self.scraper.store_scrape_arrivals(cut_short=True)
         self.stream_link = resolver_helper.resolve_silent_or_visible(
             sources,
             self.item_information,
@@ -84,6 +192,7 @@ class SourceSelect(SourceWindow):
         )
 
         if self.stream_link is None:
+            self.resolving = False
             self.setProperty("resolving", "false")
             resolver_helper.close_window()
             g.notification(g.ADDON_NAME, g.get_language_string(30032), time=2000)
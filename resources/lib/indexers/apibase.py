@@ -22,6 +22,145 @@ def handle_single_item_or_list(func):
     return wrapper
 
 
+def _extend(possible_array, value):
+    # ApiBase._when_list_extend, generated code only calls it when there is a list to extend or check
+    if isinstance(possible_array, list):
+        value = sorted(set(tools.extend_array(possible_array, value)))
+    return value or None if isinstance(value, list) else value
+
+
+def _emit_get(data_key, labels):
+    if isinstance(data_key, str):
+        if data_key not in labels:
+            return [f"value = item.get({data_key!r})"]
+        return [f"value = item.get({data_key!r}, info.get({data_key!r}))"]
+    if data_key:
+        return ["value = item" + "".join(f".get({subkey!r}, {{}})" for subkey in data_key) + " or None"]
+    return ["value = None"]
+
+
+def _emit_extend(key, labels):
+    # Skips the call for the common case of a new label given a value that is not a list
+    if isinstance(key, str) and key in labels:
+        return [f"if {key!r} in info or isinstance(value, list):", f"    value = _extend(info.get({key!r}), value)"]
+    return ["if isinstance(value, list):", "    value = _extend(None, value)"]
+
+
+def _emit_store(key):
+    lines = ['if value is not None and value != "":']
+    lines.extend(f"    info[{k!r}] = value" for k in ((key,) if isinstance(key, str) else key))
+    return lines
+
+
+def _indent(lines):
+    return [f"    {line}" for line in lines]
+
+
+def _emit_row(data_key, key, transform, name, labels):
+    """
+    Emits the source of a single row of a translation table, specialised for the shape of the row
+    :param data_key: Key, or path of keys, of the value in the item
+    :type data_key: str|tuple|None
+    :param key: Info label, or labels, the value is stored as
+    :type key: str|tuple
+    :param transform: Callable transforming the value, or tuple of item keys and a callable taking their values
+    :type transform: callable|tuple|None
+    :param name: Name the transform of the row is bound to in the generated code
+    :type name: str
+    :param labels: Info labels set by the previous rows, any other label is known to be missing from info
+    :type labels: set
+    :return: Lines of source
+    :rtype: list
+    """
+    lines = _emit_get(data_key, labels)
+    if not transform:
+        lines.append("if value or isinstance(value, (int, float)):")
+        for info_label in (key,) if isinstance(key, str) else key:
+            # Each label is extended with the value left by the previous label
+            lines.extend(_indent(_emit_extend(info_label, labels)))
+            lines.extend(_indent(_emit_store(info_label)))
+        return lines
+    if not isinstance(key, (str, tuple)):
+        return lines
+
+    if isinstance(data_key, str) and data_key in labels:
+        lines.append(f"source = info.get({data_key!r}, value)")
+        lines.append("if source is not None:")
+        lines.append(f"    value = {name}(source)")
+        lines.extend(_indent(_emit_extend(data_key, labels)))
+    elif data_key:
+        lines.append("if value is not None:")
+        lines.append(f"    value = {name}(value)")
+        lines.extend(_indent(_emit_extend(None, labels)))
+    if isinstance(transform, tuple):
+        # A tuple transform is only reached when there is no source value
+        condition = " and ".join(f"{k!r} in item" for k in transform[0]) or "True"
+        lines.append(f"{'elif' if data_key else 'if'} {condition}:")
+        lines.append(f"    value = {name}_combine({', '.join(f'item[{k!r}]' for k in transform[0])})")
+        lines.extend(_indent(_emit_extend(key, labels)))
+    elif not data_key:
+        return lines
+    lines.extend(_emit_store(key))
+    return lines
+
+
+def compile_translation(translation):
+    """
+    Compiles a translation table into a function normalising a single item, giving the same result as interpreting
+    the table with ApiBase._interpret_info
+    :param translation: Rows of (data_key, key, transform)
+    :type translation: list|tuple
+    :return: Function taking an item and returning its info
+    :rtype: callable
+    """
+    namespace = {"_extend": _extend}
+    lines = ["def _normalize(item):", "    info = {}"]
+    labels = set()
+    for idx, (data_key, key, transform) in enumerate(translation):
+        name = f"_transform_{idx}"
+        namespace[name] = transform
+        if isinstance(transform, tuple):
+            namespace[f"{name}_combine"] = transform[1]
+        lines.extend(_indent(_emit_row(data_key, key, transform, name, labels)))
+        if isinstance(key, str):
+            labels.add(key)
+        elif isinstance(key, tuple) or not transform:
+            labels.update(key)
+    lines.append("    return info")
+    exec(compile("\n".join(lines), "<translation>", "exec"), namespace)  # pylint: disable=exec-used
+    return namespace["_normalize"]
+
+
+# Tables are compiled once they have normalised this many items, tables built per instance and used for a handful of
+# items are cheaper to interpret than to compile
+COMPILE_AFTER = 20
+COMPILED_TRANSLATIONS_LIMIT = 256
+# Use counts and compiled functions of tables by id, the table is kept alongside so its id can not be reused
+_compiled_translations = {}
+
+
+def get_compiled_translation(translation):
+    """
+    Fetches the compiled function of a translation table, compiling it once the table is used enough
+    :param translation: Rows of (data_key, key, transform)
+    :type translation: list|tuple
+    :return: Function taking an item and returning its info, None while the table should still be interpreted
+    :rtype: callable|None
+    """
+    compiled = _compiled_translations.get(id(translation))
+    if compiled is None or compiled[0] is not translation:
+        if len(_compiled_translations) >= COMPILED_TRANSLATIONS_LIMIT:
+            # Tables built per instance would otherwise accumulate in long running processes
+            _compiled_translations.clear()
+        compiled = _compiled_translations[id(translation)] = [translation, 0, None]
+    if compiled[2] is None:
+        compiled[1] += 1
+        if compiled[1] <= COMPILE_AFTER:
+            return None
+        compiled[2] = compile_translation(translation)
+    return compiled[2]
+
+
 class ApiBase:
     @staticmethod
     def _do_transform(info, transform, key, item, value, data_key):
@@ -69,21 +208,37 @@ class ApiBase:
     @staticmethod
     @handle_single_item_or_list
     def _normalize_info(translation, item):
-        info = {}
         try:
-            for data_key, key, transform in translation:
-                value = ApiBase._get_value(data_key, info, item)
-                if (value or isinstance(value, (int, float))) and not transform:
-                    ApiBase._fill_no_transform(key, info, value)
-                if not transform:
-                    continue
-                if isinstance(key, str):
-                    ApiBase._do_transform_single(info, transform, key, item, value, data_key)
-                elif isinstance(key, tuple):
-                    ApiBase._do_transform_multiple(info, transform, key, item, value, data_key)
+            if normalize := get_compiled_translation(translation):
+                return normalize(item)
+            return ApiBase._interpret_translation(translation, item)
+        except Exception as e:
+            raise NormalizationFailure(f"{e} -\n {translation} - {item}") from e
 
+    @staticmethod
+    @handle_single_item_or_list
+    def _interpret_info(translation, item):
+        """
+        Normalises an item by interpreting its translation table row by row, the reference for compiled tables
+        """
+        try:
+            return ApiBase._interpret_translation(translation, item)
         except Exception as e:
             raise NormalizationFailure(f"{e} -\n {translation} - {item}") from e
+
+    @staticmethod
+    def _interpret_translation(translation, item):
+        info = {}
+        for data_key, key, transform in translation:
+            value = ApiBase._get_value(data_key, info, item)
+            if (value or isinstance(value, (int, float))) and not transform:
+                ApiBase._fill_no_transform(key, info, value)
+            if not transform:
+                continue
+            if isinstance(key, str):
+                ApiBase._do_transform_single(info, transform, key, item, value, data_key)
+            elif isinstance(key, tuple):
+                ApiBase._do_transform_multiple(info, transform, key, item, value, data_key)
         return info
 
     @staticmethod
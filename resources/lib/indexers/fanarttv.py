@@ -6,9 +6,11 @@ import xbmcgui
 
 from . import valid_id_or_none
 from resources.lib.common import tools
-from resources.lib.database.cache import use_cache
+from resources.lib.database.cache import get_conditional_headers
+from resources.lib.database.cache import use_revalidating_cache
 from resources.lib.indexers.apibase import ApiBase
 from resources.lib.indexers.apibase import handle_single_item_or_list
+from resources.lib.modules import http_sessions
 from resources.lib.modules.globals import g
 
 
@@ -19,7 +21,7 @@ def fanart_guard_response(func):
 
         try:
             response = func(*args, **kwarg)
-            if response.status_code in [200, 201]:
+            if response.status_code in [200, 201, 304]:
                 return response
 
             if response.status_code == 404:
@@ -91,14 +93,7 @@ class FanartTv(ApiBase):
 
     @cached_property
     def session(self):
-        import requests
-        from requests.adapters import HTTPAdapter
-        from urllib3 import Retry
-
-        session = requests.Session()
-        retries = Retry(total=5, backoff_factor=0.1, status_forcelist=[500, 502, 503, 504])
-        session.mount('https://', HTTPAdapter(max_retries=retries, pool_maxsize=100))
-        return session
+        return http_sessions.get_session(self.base_url)
 
     @staticmethod
     def build_image(url, art, image):
@@ -136,19 +131,27 @@ class FanartTv(ApiBase):
         return image['lang'] if image['lang'] not in ('', '00') else None
 
     @fanart_guard_response
-    def _get(self, url, **params):
+    def _get(self, url, validators=None, **params):
         if not self.fanart_support:
             return None
         timeout = params.pop("timeout", 10)
-        return self.session.get(parse.urljoin(self.base_url, url), params=params, headers=self.headers, timeout=timeout)
+        return self.session.get(
+            parse.urljoin(self.base_url, url),
+            params=params,
+            headers={**self.headers, **get_conditional_headers(validators)},
+            timeout=timeout,
+        )
 
     def _get_json(self, url, **params):
         response = self._get(url, **params)
         return response.json() if response else None
 
-    @use_cache()
-    def _get_json_cached(self, url, **params):
-        return self._get_json(url, **params)
+    @use_revalidating_cache()
+    def _get_json_cached(self, url, validators=None, **params):
+        response = self._get(url, validators=validators, **params)
+        if response is not None and response.status_code == 304:
+            return None, response
+        return (response.json() if response else None), response
 
     @wrap_fanart_object
     def get_movie(self, tmdb_id):
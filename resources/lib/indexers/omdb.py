@@ -9,6 +9,7 @@ from resources.lib.common import tools
 from resources.lib.database.cache import use_cache
 from resources.lib.indexers.apibase import ApiBase
 from resources.lib.indexers.apibase import handle_single_item_or_list
+from resources.lib.modules import http_sessions
 from resources.lib.modules.globals import g
 
 OMDB_STATUS_CODES = {
@@ -173,18 +174,7 @@ class OmdbApi(ApiBase):
 
     @cached_property
     def session(self):
-        import requests
-        from requests.adapters import HTTPAdapter
-        from urllib3 import Retry
-
-        session = requests.Session()
-        retries = Retry(
-            total=5,
-            backoff_factor=0.1,
-            status_forcelist=[500, 503, 504, 520, 521, 522, 524],
-        )
-        session.mount("https://", HTTPAdapter(max_retries=retries, pool_maxsize=100))
-        return session
+        return http_sessions.get_session(self.ApiUrl)
 
     def _extract_awards(self, value, *params):
         if self._is_value_none(value):
@@ -245,7 +235,7 @@ class OmdbApi(ApiBase):
         item = self._try_detect_type(item)
         return {"info": self._normalize_info(self.normalization, item)}
 
-    @use_cache()
+    @use_cache(in_flight=True)
     def get_json_cached(self, **params):
         return self.get_json(**params)
 
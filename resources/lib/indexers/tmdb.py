@@ -6,9 +6,11 @@ import xbmcgui
 
 from . import valid_id_or_none
 from resources.lib.common import tools
-from resources.lib.database.cache import use_cache
+from resources.lib.database.cache import get_conditional_headers
+from resources.lib.database.cache import use_revalidating_cache
 from resources.lib.indexers.apibase import ApiBase
 from resources.lib.indexers.apibase import handle_single_item_or_list
+from resources.lib.modules import http_sessions
 from resources.lib.modules.globals import g
 
 
@@ -19,7 +21,7 @@ def tmdb_guard_response(func):
 
         try:
             response = func(*args, **kwarg)
-            if response.status_code in [200, 201]:
+            if response.status_code in [200, 201, 304]:
                 return response
 
             g.log(
@@ -49,6 +51,16 @@ def wrap_tmdb_object(func):
     return wrapper
 
 
+# Resources appended to a composite request for each facet of an item, rating is part of the item itself.
+# Info appends every resource so it covers the other facets
+FACET_APPENDS = {
+    "info": None,
+    "art": ("images",),
+    "cast": ("credits",),
+    "rating": (),
+}
+
+
 class TMDBAPI(ApiBase):
     baseUrl = "https://api.themoviedb.org/3/"
     imageBaseUrl = "https://image.tmdb.org/t/p/"
@@ -290,18 +302,7 @@ class TMDBAPI(ApiBase):
 
     @cached_property
     def session(self):
-        import requests
-        from requests.adapters import HTTPAdapter
-        from urllib3 import Retry
-
-        session = requests.Session()
-        retries = Retry(
-            total=5,
-            backoff_factor=0.1,
-            status_forcelist=[429, 500, 503, 504, 520, 521, 522, 524],
-        )
-        session.mount("https://", HTTPAdapter(max_retries=retries, pool_maxsize=100))
-        return session
+        return http_sessions.get_session(self.baseUrl)
 
     def _set_artwork(self):
         if self.preferred_artwork_size == 0:
@@ -325,12 +326,12 @@ class TMDBAPI(ApiBase):
         )
 
     @tmdb_guard_response
-    def get(self, url, **params):
+    def get(self, url, validators=None, **params):
         timeout = params.pop("timeout", 10)
         return self.session.get(
             parse.urljoin(self.baseUrl, url),
             params=self._add_api_key(params),
-            headers={"Accept": "application/json"},
+            headers={"Accept": "application/json", **get_conditional_headers(validators)},
             timeout=timeout,
         )
 
@@ -338,115 +339,127 @@ class TMDBAPI(ApiBase):
         response = self.get(url, **params)
         return None if response is None else self._handle_response(response.json())
 
-    @use_cache()
-    def get_json_cached(self, url, **params):
-        response = self.get(url, **params)
-        return None if response is None else self._handle_response(response.json())
+    @use_revalidating_cache()
+    def get_json_cached(self, url, validators=None, **params):
+        response = self.get(url, validators=validators, **params)
+        if response is None or response.status_code == 304:
+            return None, response
+        return self._handle_response(response.json()), response
+
+    def _get_composite(self, path, facets):
+        if "info" in facets:
+            return self.get_json_cached(
+                path,
+                language=self.lang_full_code,
+                append_to_response=",".join(self.append_to_response),
+                include_image_language=",".join(self.include_languages),
+                region=self.lang_region_code,
+            )
+        params = {}
+        wanted = {i for facet in facets for i in FACET_APPENDS[facet]}
+        if appends := [i for i in self.append_to_response if i in wanted]:
+            params["append_to_response"] = ",".join(appends)
+        if "art" in facets:
+            params["include_image_language"] = ",".join(self.include_languages)
+        return self.get_json_cached(path, **params)
+
+    @staticmethod
+    def split_facets(result, facets):
+        """
+        Splits the requested facets out of a handled composite response
+        :param result: Handled response with art, cast and info
+        :type result: dict|None
+        :param facets: Facets to keep, info keeps the full response
+        :type facets: set|tuple
+        :return: Dictionary holding the requested facets or None if none were found
+        :rtype: dict|None
+        """
+        if not result or "info" in facets:
+            return result
+        split = {}
+        if "rating" in facets and (rating := tools.filter_dictionary(result.get("info"), "rating.tmdb")):
+            split["info"] = rating
+        if "art" in facets and result.get("art"):
+            split["art"] = result["art"]
+        if "cast" in facets and result.get("cast"):
+            split["cast"] = result["cast"]
+        return split or None
+
+    def get_facets(self, path, facets):
+        """
+        Fetches the facets of an item with a single request, appending only the resources the facets need
+        :param path: Path of the item, e.g. movie/{tmdb_id}
+        :type path: str
+        :param facets: Facets wanted, any of info, art, cast and rating. Info returns the full item
+        :type facets: set|tuple
+        :return: Dictionary holding the requested facets or None if none were found
+        :rtype: dict|None
+        """
+        return self.split_facets(self._get_composite(path, facets), facets)
+
+    def plan_movie(self, tmdb_id):
+        return TMDBRequestPlan(self, f"movie/{tmdb_id}")
+
+    def plan_show(self, tmdb_id):
+        return TMDBRequestPlan(self, f"tv/{tmdb_id}")
+
+    def plan_season(self, tmdb_id, season):
+        return TMDBRequestPlan(self, f"tv/{tmdb_id}/season/{season}")
+
+    def plan_episode(self, tmdb_id, season, episode):
+        return TMDBRequestPlan(self, f"tv/{tmdb_id}/season/{season}/episode/{episode}")
 
     @wrap_tmdb_object
     def get_movie(self, tmdb_id):
-        return self.get_json_cached(
-            f"movie/{tmdb_id}",
-            language=self.lang_full_code,
-            append_to_response=",".join(self.append_to_response),
-            include_image_language=",".join(self.include_languages),
-            region=self.lang_region_code,
-        )
+        return self.get_facets(f"movie/{tmdb_id}", {"info"})
 
     @wrap_tmdb_object
     def get_movie_rating(self, tmdb_id):
-        result = tools.filter_dictionary(
-            tools.safe_dict_get(self.get_json_cached(f"movie/{tmdb_id}"), "info"),
-            "rating.tmdb",
-        )
-        return {"info": result} if result else None
+        return self.get_facets(f"movie/{tmdb_id}", {"rating"})
 
     @wrap_tmdb_object
     def get_movie_cast(self, tmdb_id):
-        result = tools.safe_dict_get(self.get_json_cached(f"movie/{tmdb_id}/credits"), "cast")
-        return {"cast": result} if result else None
+        return self.get_facets(f"movie/{tmdb_id}", {"cast"})
 
     @wrap_tmdb_object
     def get_movie_art(self, tmdb_id):
-        return self.get_json_cached(
-            f"movie/{tmdb_id}/images",
-            include_image_language=",".join(self.include_languages),
-        )
+        return self.get_facets(f"movie/{tmdb_id}", {"art"})
 
     @wrap_tmdb_object
     def get_show(self, tmdb_id):
-        return self.get_json_cached(
-            f"tv/{tmdb_id}",
-            language=self.lang_full_code,
-            append_to_response=",".join(self.append_to_response),
-            include_image_language=",".join(self.include_languages),
-            region=self.lang_region_code,
-        )
+        return self.get_facets(f"tv/{tmdb_id}", {"info"})
 
     @wrap_tmdb_object
     def get_show_art(self, tmdb_id):
-        return self.get_json_cached(
-            f"tv/{tmdb_id}/images",
-            include_image_language=",".join(self.include_languages),
-        )
+        return self.get_facets(f"tv/{tmdb_id}", {"art"})
 
     @wrap_tmdb_object
     def get_show_rating(self, tmdb_id):
-        result = tools.filter_dictionary(
-            tools.safe_dict_get(self.get_json_cached(f"tv/{tmdb_id}"), "info"),
-            "rating.tmdb",
-        )
-        return {"info": result} if result else None
+        return self.get_facets(f"tv/{tmdb_id}", {"rating"})
 
     @wrap_tmdb_object
     def get_show_cast(self, tmdb_id):
-        result = tools.safe_dict_get(self.get_json_cached(f"tv/{tmdb_id}/credits"), "cast")
-        return {"cast": result} if result else None
+        return self.get_facets(f"tv/{tmdb_id}", {"cast"})
 
     @wrap_tmdb_object
     def get_season(self, tmdb_id, season):
-        return self.get_json_cached(
-            f"tv/{tmdb_id}/season/{season}",
-            language=self.lang_full_code,
-            append_to_response=",".join(self.append_to_response),
-            include_image_language=",".join(self.include_languages),
-            region=self.lang_region_code,
-        )
+        return self.get_facets(f"tv/{tmdb_id}/season/{season}", {"info"})
 
     @wrap_tmdb_object
     def get_season_art(self, tmdb_id, season):
-        return self.get_json_cached(
-            f"tv/{tmdb_id}/season/{season}/images",
-            include_image_language=",".join(self.include_languages),
-        )
+        return self.get_facets(f"tv/{tmdb_id}/season/{season}", {"art"})
 
     @wrap_tmdb_object
     def get_episode(self, tmdb_id, season, episode):
-        return self.get_json_cached(
-            f"tv/{tmdb_id}/season/{season}/episode/{episode}",
-            language=self.lang_full_code,
-            append_to_response=",".join(self.append_to_response),
-            include_image_language=",".join(self.include_languages),
-            region=self.lang_region_code,
-        )
+        return self.get_facets(f"tv/{tmdb_id}/season/{season}/episode/{episode}", {"info"})
 
     @wrap_tmdb_object
     def get_episode_art(self, tmdb_id, season, episode):
-        return self.get_json_cached(
-            f"tv/{tmdb_id}/season/{season}/episode/{episode}/images",
-            include_image_language=",".join(self.include_languages),
-        )
+        return self.get_facets(f"tv/{tmdb_id}/season/{season}/episode/{episode}", {"art"})
 
     @wrap_tmdb_object
     def get_episode_rating(self, tmdb_id, season, episode):
-        result = tools.filter_dictionary(
-            tools.safe_dict_get(
-                self.get_json_cached(f"tv/{tmdb_id}/season/{season}/episode/{episode}"),
-                "info",
-            ),
-            "rating.tmdb",
-        )
-        return {"info": result} if result else None
+        return self.get_facets(f"tv/{tmdb_id}/season/{season}/episode/{episode}", {"rating"})
 
     def _add_api_key(self, params):
         if "api_key" not in params:
@@ -641,3 +654,48 @@ class TMDBAPI(ApiBase):
         if relative_path.lower().endswith(".svg"):
             relative_path = f"{relative_path[:-4]}.png"
         return "/".join([self.imageBaseUrl.strip("/"), size.strip("/"), relative_path.strip("/")])
+
+
+class TMDBRequestPlan:
+    """
+    Facets an item needs from TMDb, fetched together with a single request when the first of them is used.
+    Facets only needed depending on other indexers can be planned up front, they only add to the request made for the
+    rest and no request is made if none are used
+    """
+
+    def __init__(self, api, path):
+        """
+        :param api: API used to fetch the item
+        :type api: TMDBAPI
+        :param path: Path of the item, e.g. movie/{tmdb_id}
+        :type path: str
+        """
+        self._api = api
+        self._path = path
+        self.facets = set()
+        self._fetched = set()
+        self._result = None
+
+    def add(self, *facets):
+        """
+        Plans facets to be fetched with the request
+        :param facets: Any of info, art, cast and rating
+        :type facets: str
+        :return: The plan
+        :rtype: TMDBRequestPlan
+        """
+        self.facets.update(facets)
+        return self
+
+    def get(self, facet):
+        """
+        Fetches a facet of the item, making the request for every planned facet the first time
+        :param facet: One of info, art, cast and rating
+        :type facet: str
+        :return: Dictionary with the facet as tmdb_object, like the get methods of TMDBAPI
+        :rtype: dict
+        """
+        if facet not in self._fetched and "info" not in self._fetched:
+            self._fetched = self.facets | self._fetched | {facet}
+            self._result = self._api.get_facets(self._path, self._fetched)
+        return {"tmdb_object": self._api.split_facets(self._result, {facet})}
@@ -1,5 +1,6 @@
 import contextlib
 import time
+from collections import deque
 from functools import cached_property
 from functools import wraps
 from urllib import parse
@@ -8,12 +9,16 @@ import xbmc
 import xbmcgui
 
 from . import valid_id_or_none
+from resources.lib.common import json_stream
 from resources.lib.common import tools
+from resources.lib.common.thread_pool import ThreadPool
 from resources.lib.database.cache import use_cache
 from resources.lib.indexers.apibase import ApiBase
 from resources.lib.indexers.apibase import handle_single_item_or_list
+from resources.lib.modules import http_sessions
 from resources.lib.modules.exceptions import AuthFailure
 from resources.lib.modules.exceptions import RanOnceAlready
+from resources.lib.modules.exceptions import UnexpectedResponse
 from resources.lib.modules.global_lock import GlobalLock
 from resources.lib.modules.globals import g
 
@@ -156,6 +161,9 @@ class TraktAPI(ApiBase):
 
     ApiUrl = "https://api.trakt.tv/"
 
+    # Pages fetched at once by a single paginated request
+    PageConcurrency = 4
+
     username_setting_key = "trakt.username"
 
     TranslationNormalization = [
@@ -377,18 +385,7 @@ class TraktAPI(ApiBase):
 
     @cached_property
     def session(self):
-        import requests
-        from requests.adapters import HTTPAdapter
-        from urllib3 import Retry
-
-        session = requests.Session()
-        retries = Retry(
-            total=4,
-            backoff_factor=0.3,
-            status_forcelist=[429, 500, 502, 503, 504, 520, 521, 522, 524, 530],
-        )
-        session.mount("https://", HTTPAdapter(max_retries=retries, pool_maxsize=100))
-        return session
+        return http_sessions.get_session(self.ApiUrl)
 
     # region Auth
     def _get_headers(self):
@@ -573,10 +570,11 @@ class TraktAPI(ApiBase):
         """
         Performs a GET request to specified endpoint and returns response
         :param url: endpoint to perform request against
-        :param params: URL params for request
+        :param params: URL params for request, stream leaves the body to be read from the response as it arrives
         :return: request response
         """
         timeout = params.pop("timeout", 10)
+        stream = params.pop("stream", False)
         self._try_add_default_paging(params)
         self._clean_params(params)
         return self.session.get(
@@ -584,6 +582,7 @@ class TraktAPI(ApiBase):
             params=params,
             headers=self._get_headers(),
             timeout=timeout,
+            stream=stream,
         )
 
     def _try_add_default_paging(self, params):
@@ -628,7 +627,27 @@ class TraktAPI(ApiBase):
             )
             return None
 
-    @use_cache()
+    def get_json_stream(self, url, **params):
+        """
+        Performs a GET request to specified endpoint and yields the normalised items of the JSON array response one at
+        a time. The body is spooled and decoded incrementally, so large responses are never held in memory as a whole.
+        Items are not sorted
+        :param url: endpoint to perform request against
+        :param params: URL params for request
+        :return: Yields normalised items
+        :raises UnexpectedResponse: When the request failed, so it is not mistaken for an empty array
+        :raises ValueError: When the response is not a JSON array or is cut off
+        """
+        response = self.get(url=url, stream=True, **params)
+        if response is None:
+            raise UnexpectedResponse(f"No response to request of {url}")
+        with response:
+            body = json_stream.spool(response.iter_content(json_stream.CHUNK_SIZE))
+        with body:
+            for item in json_stream.iter_json_array(json_stream.read_chunks(body)):
+                yield self._handle_response(item)
+
+    @use_cache(in_flight=True)
     def get_cached(self, url, **params):
         """
         Performs a GET request to specified endpoint, caches and returns response
@@ -687,22 +706,44 @@ class TraktAPI(ApiBase):
         result[mixed_type]["trakt_object"]["info"].update({"trakt_show_id": result.get("trakt_show_id")})
         return result
 
-    @staticmethod
-    def _get_all_pages(func, url, **params):
+    def _get_all_pages(self, func, url, **params):
+        """
+        Fetches the first page to learn the page count, then fetches the remaining pages concurrently.
+        Pages are yielded in order and only PageConcurrency pages are fetched ahead of the caller, so callers that stop
+        early don't request every page
+        :param func: Method performing the request of a page
+        :param url: endpoint to call against
+        :param params: any params for the url, progress is called with the percentage of pages received
+        :return: Yields page responses
+        """
         progress_callback = params.pop("progress", None)
         response = func(url, **params)
         yield response
-        if "X-Pagination-Page-Count" not in response.headers:
+        if not response or "X-Pagination-Page-Count" not in response.headers:
             return
-        for i in range(2, int(response.headers["X-Pagination-Page-Count"]) + 1):
-            params["page"] = i
-            if "limit" not in params:
-                params["limit"] = int(response.headers["X-Pagination-Limit"])
-            if callable(progress_callback):
-                progress_callback(  # pylint: disable=not-callable
-                    (i / (int(response.headers["X-Pagination-Page-Count"]) + 1)) * 100
-                )
-            yield func(url, **params)
+        page_count = int(response.headers["X-Pagination-Page-Count"])
+        if "limit" not in params:
+            params["limit"] = int(response.headers["X-Pagination-Limit"])
+
+        pages = iter(range(2, page_count + 1))
+        pending = deque()
+        pool = ThreadPool(max_workers=self.PageConcurrency)
+        try:
+            for page in pages:
+                pending.append(pool.submit(func, url, **dict(params, page=page)))
+                if len(pending) >= self.PageConcurrency:
+                    break
+            received = 1
+            while pending:
+                response = pool.result(pending.popleft())
+                received += 1
+                if callable(progress_callback):
+                    progress_callback(received / page_count * 100)  # pylint: disable=not-callable
+                if (page := next(pages, None)) is not None:
+                    pending.append(pool.submit(func, url, **dict(params, page=page)))
+                yield response
+        finally:
+            pool.cancel()
 
     def get_all_pages_json(self, url, **params):
         """
@@ -725,7 +766,7 @@ class TraktAPI(ApiBase):
                 )
             )
 
-    @use_cache()
+    @use_cache(in_flight=True)
     def get_json_cached(self, url, **params):
         """
         Performs a get request to endpoint, caches and returns a json response from a trakt enpoint
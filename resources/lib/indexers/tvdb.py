@@ -1,4 +1,5 @@
 import contextlib
+import threading
 import time
 import traceback
 from functools import cached_property
@@ -12,9 +13,12 @@ import xbmcgui
 from . import valid_id_or_none
 from resources.lib.common import tools
 from resources.lib.common.thread_pool import ThreadPool
+from resources.lib.database.cache import get_conditional_headers
 from resources.lib.database.cache import use_cache
+from resources.lib.database.cache import use_revalidating_cache
 from resources.lib.indexers.apibase import ApiBase
 from resources.lib.indexers.apibase import handle_single_item_or_list
+from resources.lib.modules import http_sessions
 from resources.lib.modules.exceptions import RanOnceAlready
 from resources.lib.modules.global_lock import GlobalLock
 from resources.lib.modules.globals import g
@@ -28,7 +32,7 @@ def tvdb_guard_response(func):
 
         try:
             response = func(*args, **kwarg)
-            if response.status_code in [200, 201]:
+            if response.status_code in [200, 201, 304]:
                 return response
 
             if response.status_code == 401:
@@ -84,8 +88,15 @@ def tvdb_art_sorter(item):
     return item
 
 
+# Keys of an image used to build art, images of a show are cached with only these
+IMAGE_KEYS = ("fileName", "keyType", "subKey", "ratingsInfo", "resolution")
+# Episodes returned by a page of the episodes query, episodes past the first page are queried on their own
+EPISODES_PAGE_SIZE = 100
+
+
 class TVDBAPI(ApiBase):
     baseUrl = "https://api.thetvdb.com/"
+    _show_images_locks = {}
     normalization = [
         ("imdbId", ("imdbnumber", "imdb_id"), lambda i: valid_id_or_none(i)),
         ("id", "tvdb_id", None),
@@ -1162,21 +1173,14 @@ class TVDBAPI(ApiBase):
 
     @cached_property
     def session(self):
-        import requests
-        from requests.adapters import HTTPAdapter
-        from urllib3 import Retry
-
-        session = requests.Session()
-        retries = Retry(total=5, backoff_factor=0.1, status_forcelist=[500, 502, 503, 504])
-        session.mount("https://", HTTPAdapter(max_retries=retries, pool_maxsize=100))
-        return session
+        return http_sessions.get_session(self.baseUrl)
 
     @cached_property
     def threadpool(self):
         return ThreadPool()
 
-    def _get_headers(self, lang=None):
-        headers = {"content-type": "application/json"}
+    def _get_headers(self, lang=None, validators=None):
+        headers = {"content-type": "application/json", **get_conditional_headers(validators)}
 
         if self.jwToken:
             headers["Authorization"] = f"Bearer {self.jwToken}"
@@ -1234,13 +1238,13 @@ class TVDBAPI(ApiBase):
             return
 
     @tvdb_guard_response
-    def get(self, url, **params):
+    def get(self, url, validators=None, **params):
         language = params.pop("language") if "language" in params else None
         timeout = params.pop("timeout", 10)
         return self.session.get(
             self.baseUrl + url,
             params=params,
-            headers=self._get_headers(language),
+            headers=self._get_headers(language, validators),
             timeout=timeout,
         )
 
@@ -1251,11 +1255,13 @@ class TVDBAPI(ApiBase):
         return response or []
 
     def get_json(self, url, **params):
-        response = self.get(url, **params)
+        return self._get_response_json(self.get(url, **params), params.get("language"))
+
+    def _get_response_json(self, response, language):
         if response is None:
             return None
         try:
-            return self._handle_response(params.get("language"), self._flatten(response.json()))
+            return self._handle_response(language, self._flatten(response.json()))
         except (ValueError, AttributeError):
             traceback.print_exc()
             g.log(
@@ -1264,9 +1270,12 @@ class TVDBAPI(ApiBase):
             )
             return None
 
-    @use_cache()
-    def get_json_cached(self, url, **params):
-        return self.get_json(url, **params)
+    @use_revalidating_cache()
+    def get_json_cached(self, url, validators=None, **params):
+        response = self.get(url, validators=validators, **params)
+        if response is not None and response.status_code == 304:
+            return None, response
+        return self._get_response_json(response, params.get("language")), response
 
     @staticmethod
     def _get_all_pages(func, url, **params):
@@ -1363,30 +1372,18 @@ class TVDBAPI(ApiBase):
 
     @wrap_tvdb_object
     def get_show(self, tvdb_id):
-        art_types = [i for i in self._get_show_art_types(tvdb_id) or [] if not i.startswith("season")]
         threadpool = ThreadPool()
         threadpool.put(self._get_series_cast, tvdb_id)
+        threadpool.put(self._get_show_art, tvdb_id)
         for language in self.languages:
             threadpool.put(self._get_show_info, tvdb_id, language)
-            for art_type in art_types:
-                threadpool.put(self._get_show_art, tvdb_id, art_type, language)
         item = threadpool.wait_completion()
 
         return item or None
 
     @wrap_tvdb_object
     def get_show_art(self, tvdb_id):
-        item = self.threadpool.map_results(
-            self._get_show_art,
-            (
-                (tvdb_id, art_type, language)
-                for language in self.languages
-                for art_type in self._get_show_art_types(tvdb_id) or []
-                if not art_type.startswith("season")
-            ),
-        )
-
-        return item or None
+        return self._get_show_art(tvdb_id) or None
 
     @wrap_tvdb_object
     def get_show_info(self, tvdb_id):
@@ -1412,22 +1409,54 @@ class TVDBAPI(ApiBase):
         cast = self._get_series_cast(tvdb_id)
         return cast if cast.get("cast") else None
 
-    @use_cache()
-    def _get_show_art_types(self, tvdb_id):
-        result = self.get_json_cached(f"series/{tvdb_id}/images/query/params")
-        return sorted([i["keyType"] for i in result if "keyType" in i]) if result else result
-
-    def _get_show_art(self, tvdb_id, key_type, language):
-        return {
-            "art": self._extract_art(
-                self.get_json_cached(
-                    f"series/{tvdb_id}/images/query?keyType={key_type}",
-                    language=language,
-                ),
+    def _get_show_images(self, tvdb_id):
+        # Seasons of a show are updated in parallel, only the first of them fetches the images
+        with self._show_images_locks.setdefault(tvdb_id, threading.Lock()):
+            return self._get_show_images_cached(tvdb_id, self.languages)
+
+    @use_cache(in_flight=True)
+    def _get_show_images_cached(self, tvdb_id, languages):
+        """
+        Fetches every image of a show, for the show and all of its seasons, in a single batch.
+        The art type manifest of the show decides which images are queried and is stored with them
+        :param tvdb_id: TVDB id of the show
+        :type tvdb_id: int
+        :param languages: Languages to query images in, None for the default language
+        :type languages: list
+        :return: Dictionary with the art_types of the show and images as (language, art type, images) lists
+        :rtype: dict|None
+        """
+        manifest = self.get_json_cached(f"series/{tvdb_id}/images/query/params")
+        if not manifest:
+            return None
+        art_types = sorted({i["keyType"] for i in manifest if i.get("keyType") in self.art_map})
+        queries = [(tvdb_id, art_type, language) for language in languages for art_type in art_types]
+        images = self.threadpool.map_results(self._get_images, queries) or []
+        return {"art_types": art_types, "images": images}
+
+    def _get_images(self, tvdb_id, art_type, language):
+        images = self.get_json_cached(f"series/{tvdb_id}/images/query", keyType=art_type, language=language)
+        if not isinstance(images, list):
+            return None
+        # Only what _extract_art reads is kept, the whole set is cached with the show
+        return [
+            [
                 language,
-                key_type,
-            )
-        }
+                art_type,
+                [{k: i[k] for k in IMAGE_KEYS if k in i} for i in images if "fileName" in i],
+            ]
+        ]
+
+    def _get_show_art(self, tvdb_id, season=None):
+        images = self._get_show_images(tvdb_id)
+        if not images:
+            return None
+        result = {}
+        for language, art_type, items in images["images"]:
+            if art_type.startswith("season") != (season is not None):
+                continue
+            tools.smart_merge_dictionary(result, {"art": self._extract_art(items, language, art_type, season)})
+        return result
 
     def _get_show_info(self, tvdb_id, language):
         return self.get_json_cached(f"series/{tvdb_id}", language=language)
@@ -1437,36 +1466,17 @@ class TVDBAPI(ApiBase):
 
     @wrap_tvdb_object
     def get_season_art(self, tvdb_id, season):
-        art_types = self._get_show_art_types(tvdb_id)
-        if not art_types:
-            return
-
-        item = self.threadpool.map_results(
-            self._get_season_art,
-            (
-                (tvdb_id, art_type, season, language)
-                for language in self.languages
-                for art_type in art_types
-                if art_type.startswith("season")
-            ),
-        )
-        return item or None
-
-    def _get_season_art(self, tvdb_id, art_name, season, language):
-        return {
-            "art": self._extract_art(
-                self.get_json_cached(
-                    f"series/{tvdb_id}/images/query",
-                    keyType=art_name,
-                    language=language,
-                ),
-                language,
-                art_name,
-                season,
-            )
-        }
+        return self._get_show_art(tvdb_id, season) or None
 
     def _get_episode_info(self, tvdb_id, season, episode, language):
+        # A single query returns every episode of the season, all episodes of a season share its cached response
+        episodes = self.get_json_cached(f"series/{tvdb_id}/episodes/query", airedSeason=season, language=language)
+        if isinstance(episodes, list):
+            for item in episodes:
+                if str(tools.safe_dict_get(item, "info", "episode")) == str(episode):
+                    return item
+            if len(episodes) < EPISODES_PAGE_SIZE:
+                return None
         if result := self.get_json_cached(
             f"series/{tvdb_id}/episodes/query", airedSeason=season, airedEpisode=episode, language=language
         ):
@@ -33,7 +33,7 @@ class _BaseCacheAssist(TorrentAssist):
         self.seeds = 0
         self.silent = silent
         self.cancelled = False
-        self.thread_pool = ThreadPool()
+        self.thread_pool = ThreadPool(dedicated=True)
         self.progress_message = "Status: {} | Progress: {} | Speed: {} | Peers: {}"
 
     def _update_database(self):
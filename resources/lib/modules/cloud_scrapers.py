@@ -1,14 +1,27 @@
+import time
+
 from resources.lib.common import source_utils
+from resources.lib.database.cloudIndex import CloudIndex
 from resources.lib.debrid.all_debrid import AllDebrid
 from resources.lib.debrid.premiumize import Premiumize
 from resources.lib.debrid.real_debrid import RealDebrid
 from resources.lib.indexers.apibase import ApiBase
+from resources.lib.indexers.apibase import handle_single_item_or_list
 from resources.lib.modules.globals import g
 
+# Seconds the cloud index is used for by scrapes before it is refreshed, it is also refreshed during maintenance
+INDEX_MAX_AGE = 10 * 60
+
 
 class CloudScraper(ApiBase):
-    def __init__(self, terminate_check):
+    inspection_setting = ""
+    # Items holding several files, such as torrents, have their files matched individually, so the episode parsed
+    # from the item name must not exclude them from the scrape of another episode
+    files_matched_individually = False
+
+    def __init__(self, terminate_check=None):
         self.terminate_check = terminate_check
+        self.cloud_index = CloudIndex()
         self.provider_name = self.__class__.__name__.split("Scraper")[0]
         self.api_adapter = None
         self.language = "en"
@@ -16,22 +29,18 @@ class CloudScraper(ApiBase):
         self.item_information = {}
         self.simple_info = None
         self.debrid_provider = ""
-        self.episode_regex = None
-        self.season_regex = None
-        self.show_regex = None
+        self.episode_matcher = None
         self._source_normalization = ()
         self._file_normalization = ()
 
     def _build_regex(self):
-        self.episode_regex = source_utils.get_filter_single_episode_fn(self.simple_info)
-        self.show_regex = source_utils.get_filter_show_pack_fn(self.simple_info)
-        self.season_regex = source_utils.get_filter_season_pack_fn(self.simple_info)
+        self.episode_matcher = source_utils.get_episode_matcher(self.simple_info)
 
     def _generate_regex(self):
         self.regex = source_utils.get_filter_single_episode_fn(self.simple_info)
 
     def _preterm_check(self):
-        if self.terminate_check():
+        if self.terminate_check and self.terminate_check():
             g.log(f"{self.__class__.__name__} Pre-Terminated", "info")
             return True
         return False
@@ -47,15 +56,11 @@ class CloudScraper(ApiBase):
             self.simple_info = simple_info
             self._build_regex()
 
-        cloud_items = self._fetch_cloud_items()
-
-        if type(cloud_items) != list:
-            g.log(f"There was a faliure at the API level getting the cloud files from {self.debrid_provider}", "error")
-            return []
-
+        # A failed refresh leaves the previous index in place, which is still worth inspecting
+        self.refresh_index(INDEX_MAX_AGE)
         if self._preterm_check():
             return []
-        cloud_items = [self._normalize_item(i) for i in cloud_items]
+        cloud_items = self._get_index_items()
         if self._preterm_check():
             return []
         cloud_items = [i for i in cloud_items if self._is_valid_pack(i)]
@@ -75,8 +80,111 @@ class CloudScraper(ApiBase):
         g.log(f"{self.debrid_provider} cloud scraper found {len(cloud_items)} source", "info")
         return cloud_items
 
+    def refresh_index(self, max_age=0):
+        """
+        Updates the cloud index with the items added, changed or removed since the last listing.
+        Only new and changed items are normalised and parsed
+        :param max_age: Seconds since the last refresh for which the index is still used as is
+        :type max_age: int
+        :return: False if the listing could not be fetched, else True
+        :rtype: bool
+        """
+        if not self._is_enabled():
+            return False
+        if max_age and self.cloud_index.get_refreshed(self.debrid_provider) > time.time() - max_age:
+            return True
+
+        listing = self._fetch_cloud_items()
+        if type(listing) != list:
+            g.log(f"There was a faliure at the API level getting the cloud files from {self.debrid_provider}", "error")
+            return False
+
+        listing = {self._get_item_id(i): i for i in listing}
+        indexed = self.cloud_index.get_listing(self.debrid_provider)
+        items = [self._build_index_item(k, v) for k, v in listing.items() if indexed.get(k) != v]
+        removed_ids = [i for i in indexed if i not in listing]
+        self.cloud_index.update_items(self.debrid_provider, items, removed_ids)
+        g.log(
+            f"Refreshed {self.debrid_provider} cloud index, {len(items)} new or changed and {len(removed_ids)} removed",
+            "debug",
+        )
+        return True
+
+    def get_index_listing(self):
+        """
+        Fetches the listing entries held in the cloud index, as they were returned by the API
+        :return: List of listing entries
+        :rtype: list
+        """
+        return list(self.cloud_index.get_listing(self.debrid_provider).values())
+
+    def get_index_item(self, item_id):
+        return self.cloud_index.get_item(self.debrid_provider, item_id)
+
+    def get_item_details(self, item_id):
+        """
+        Fetches the details of a cloud item, they are only requested from the API the first time
+        :param item_id: ID of cloud item
+        :type item_id: str
+        :return: Details of item, None if they could not be fetched
+        :rtype: dict|None
+        """
+        details = self.cloud_index.get_details(self.debrid_provider, item_id)
+        if details is None and (details := self._fetch_item_details(item_id)) is not None:
+            self.cloud_index.set_details(self.debrid_provider, item_id, details)
+        return details
+
+    def _fetch_item_details(self, item_id):
+        return None
+
+    @staticmethod
+    def _get_item_id(item):
+        return str(item["id"])
+
+    def _build_index_item(self, item_id, item):
+        source = self._normalize_item(item)
+        if self.files_matched_individually:
+            season, episode = None, None
+        else:
+            season, episode = source_utils.get_episode_numbers(source["clean_title"])
+        return {
+            "item_id": item_id,
+            "data": item,
+            "source": source,
+            "files": self._get_index_files(item, source),
+            "season": season,
+            "episode": episode,
+        }
+
+    def _get_index_files(self, item, source):
+        """
+        Builds the playable files of a listing entry to store in the index
+        :param item: Listing entry
+        :type item: dict
+        :param source: Normalised listing entry
+        :type source: dict
+        :return: List of normalised files
+        :rtype: list
+        """
+        return [source]
+
+    def _get_episode_numbers(self):
+        if self.files_matched_individually or self.media_type != g.MEDIA_EPISODE or not self.simple_info:
+            return None, None
+        return int(self.simple_info["season_number"]), int(self.simple_info["episode_number"])
+
+    def _get_index_items(self):
+        return [
+            file
+            for item in self.cloud_index.get_sources(self.debrid_provider, *self._get_episode_numbers())
+            for file in item["files"]
+        ]
+
+    @handle_single_item_or_list
     def _normalize_item(self, item):
-        return self._normalize_info(self._source_normalization, item)
+        source = self._normalize_info(self._source_normalization, item)
+        source["clean_title"] = source_utils.clean_title(source.get("release_title", ""))
+        return source
 
     @staticmethod
     def _apply_general_filter(cloud_items):
@@ -86,14 +194,8 @@ class CloudScraper(ApiBase):
         sources = []
 
         if self.media_type == g.MEDIA_EPISODE:
-            for item in cloud_items:
-                release_title = source_utils.clean_title(item["release_title"])
-                if (
-                    self.episode_regex(release_title)
-                    or self.show_regex(release_title)
-                    or self.season_regex(release_title)
-                ):
-                    sources.append(item)
+            matches = self.episode_matcher.match_many([self._get_clean_title(i) for i in cloud_items], cleaned=True)
+            sources.extend(item for item, match in zip(cloud_items, matches) if match)
 
         else:
             simple_info = {
@@ -105,7 +207,7 @@ class CloudScraper(ApiBase):
                 for item in cloud_items
                 if source_utils.filter_movie_title(
                     None,
-                    source_utils.clean_title(item['release_title']),
+                    self._get_clean_title(item),
                     self.item_information['info']['title'],
                     simple_info,
                 )
@@ -120,13 +222,14 @@ class CloudScraper(ApiBase):
 
     def _fetch_cloud_items(self):
         """
-        Calls the api adapter and returns the api response
+        Calls the api adapter and returns the listing of the cloud
         :return:
         """
         return []
 
     def _finalise_identified_items(self, items):
         for item in items:
+            item.pop("clean_title", None)
             item.update(
                 {
                     "quality": source_utils.get_quality(item['release_title']),
@@ -147,14 +250,14 @@ class CloudScraper(ApiBase):
 
     @staticmethod
     def _get_clean_title(item):
+        if "clean_title" in item:
+            return item["clean_title"]
         return source_utils.clean_title(item.get("release_title", ""))
 
     def _is_valid_pack(self, item):
         clean_title = self._get_clean_title(item)
         if self.media_type == g.MEDIA_EPISODE:
-            return bool(
-                self.episode_regex(clean_title) or self.season_regex(clean_title) or self.show_regex(clean_title)
-            )
+            return self.episode_matcher.match(clean_title)
 
         else:
             # Always return true on a movie item as packs do not count
@@ -165,7 +268,9 @@ class CloudScraper(ApiBase):
 
 
 class PremiumizeCloudScraper(CloudScraper, ApiBase):
-    def __init__(self, terminate_flag):
+    inspection_setting = "premiumize.cloudInspection"
+
+    def __init__(self, terminate_flag=None):
         super().__init__(terminate_flag)
         self.api_adapter = Premiumize()
         self.debrid_provider = "premiumize"
@@ -173,10 +278,14 @@ class PremiumizeCloudScraper(CloudScraper, ApiBase):
             ("name", "release_title", None),
             ("id", "url", None),
             ("size", "size", lambda k: (int(k) / 1024) / 1024),
+            ("path", "path", None),
         )
 
     def _fetch_cloud_items(self):
-        return source_utils.filter_files_for_resolving(self.api_adapter.list_folder_all(), self.item_information)
+        return self.api_adapter.list_folder_all()
+
+    def _get_index_items(self):
+        return source_utils.filter_files_for_resolving(super()._get_index_items(), self.item_information)
 
     def _is_valid_pack(self, item):
         return True
@@ -186,7 +295,10 @@ class PremiumizeCloudScraper(CloudScraper, ApiBase):
 
 
 class RealDebridCloudScraper(CloudScraper):
-    def __init__(self, terminate_flag):
+    inspection_setting = "rd.cloudInspection"
+    files_matched_individually = True
+
+    def __init__(self, terminate_flag=None):
         super().__init__(terminate_flag)
         self.api_adapter = RealDebrid()
         self.debrid_provider = "real_debrid"
@@ -203,10 +315,27 @@ class RealDebridCloudScraper(CloudScraper):
     def _fetch_cloud_items(self):
         return self.api_adapter.list_torrents()
 
+    def _fetch_item_details(self, item_id):
+        details = self.api_adapter.torrent_info(item_id)
+        return details if isinstance(details, dict) and "files" in details else None
+
+    def _get_index_files(self, item, source):
+        # Files of a torrent are only requested once it matches a scrape, see _source_to_file
+        return []
+
+    def _get_index_items(self):
+        return [
+            item["source"]
+            for item in self.cloud_index.get_sources(self.debrid_provider, *self._get_episode_numbers())
+        ]
+
     def _source_to_file(self, source):
         if "links" not in source:
             return None
-        source_files = self._normalize_item(self.api_adapter.torrent_info(source['id'])['files'])
+        details = self.get_item_details(source['id'])
+        if details is None:
+            return None
+        source_files = self._normalize_item(details['files'])
         source_files = [i for i in source_files if i["selected"]]
         [file.update({"idx": idx}) for idx, file in enumerate(source_files)]
         source_files = self._identify_items(source_files)
@@ -218,7 +347,10 @@ class RealDebridCloudScraper(CloudScraper):
 
 
 class AllDebridCloudScraper(CloudScraper):
-    def __init__(self, terminate_flag):
+    inspection_setting = "alldebrid.cloudInspection"
+    files_matched_individually = True
+
+    def __init__(self, terminate_flag=None):
         super().__init__(terminate_flag)
         self.api_adapter = AllDebrid()
         self.debrid_provider = "all_debrid"
@@ -230,11 +362,31 @@ class AllDebridCloudScraper(CloudScraper):
         )
 
     def _fetch_cloud_items(self):
-        magnets = [m for m in self.api_adapter.saved_magnets() if m['status'] == "Ready"]
-        return [i for link_list in magnets for i in link_list['links']] + self.api_adapter.saved_links()['links']
+        return self.api_adapter.saved_magnets() + self.api_adapter.saved_links()['links']
+
+    @staticmethod
+    def _get_item_id(item):
+        # Saved links have no ID of their own
+        return str(item["id"]) if "id" in item else item["link"]
+
+    def _get_index_files(self, item, source):
+        if "links" not in item:
+            return [source]
+        return self._normalize_item(item["links"]) if item.get("status") == "Ready" else []
 
     def _is_valid_pack(self, item):
         return True
 
     def _is_enabled(self):
         return g.all_debrid_enabled()
+
+
+def refresh_cloud_indexes():
+    """
+    Refreshes the cloud index of every debrid service that has cloud inspection enabled
+    :return: None
+    :rtype: None
+    """
+    for cloud_scraper in (PremiumizeCloudScraper, RealDebridCloudScraper, AllDebridCloudScraper):
+        if g.get_bool_setting(cloud_scraper.inspection_setting):
+            cloud_scraper().refresh_index()
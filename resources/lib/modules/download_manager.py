@@ -363,7 +363,7 @@ class _DownloadTask:
 
 class _DownloadBase:
     def __init__(self, source):
-        self.thread_pool = ThreadPool()
+        self.thread_pool = ThreadPool(dedicated=True)
         self.source = source
         self.average_speed = "0 B/s"
         self.progress = 0
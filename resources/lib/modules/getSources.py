@@ -3,15 +3,10 @@ Handling of scraping and cache checking for sources
 """
 import contextlib
 import copy
-import importlib
 import json
-import random
 import re
-import sys
 import time
 from collections import Counter
-from collections import OrderedDict
-from importlib import reload as reload_module
 from urllib import parse
 
 import xbmc
@@ -19,7 +14,11 @@ import xbmcgui
 
 from resources.lib.common import source_utils
 from resources.lib.common import tools
+from resources.lib.common.source_record import Source
 from resources.lib.common.thread_pool import ThreadPool
+from resources.lib.database.providerStats import ProviderStats
+from resources.lib.database.scrapeCache import ScrapeCache
+from resources.lib.database.scrapeHistory import ScrapeHistory
 from resources.lib.database.skinManager import SkinManager
 from resources.lib.database.torrentCache import TorrentCache
 from resources.lib.debrid import all_debrid
@@ -27,16 +26,21 @@ from resources.lib.debrid import premiumize
 from resources.lib.debrid import real_debrid
 from resources.lib.gui.windows.get_sources_window import GetSourcesWindow
 from resources.lib.gui.windows.manual_caching import ManualCacheWindow
+from resources.lib.modules import http_sessions
 from resources.lib.modules import monkey_requests
+from resources.lib.modules import pre_scrape_queue
 from resources.lib.modules import resolver as resolver
 from resources.lib.modules.cloud_scrapers import AllDebridCloudScraper
 from resources.lib.modules.cloud_scrapers import PremiumizeCloudScraper
 from resources.lib.modules.cloud_scrapers import RealDebridCloudScraper
 from resources.lib.modules.globals import g
+from resources.lib.modules.providers import registry as provider_registry
+from resources.lib.modules.resolver.hoster_index import HosterDomainIndex
 from resources.lib.modules.source_sorter import SourceSorter
 
 approved_qualities = ["4K", "1080p", "720p", "SD"]
 approved_qualities_set = set(approved_qualities)
+CLOUD_INSPECTION_CACHE_KEY = "cloud_inspection"
 
 
 class Sources:
@@ -44,14 +48,26 @@ class Sources:
     Handles fetching and processing of available sources for provided meta data
     """
 
-    def __init__(self, item_information):
+    def __init__(self, item_information, streaming=False):
         self.hash_regex = re.compile(r'btih:(.*?)(?:&|$)')
         self.canceled = False
         self.torrent_cache = TorrentCache()
-        self.torrent_threads = ThreadPool()
-        self.hoster_threads = ThreadPool()
-        self.adaptive_threads = ThreadPool()
-        self.direct_threads = ThreadPool()
+        self.scrape_cache = ScrapeCache()
+        self._fresh_cached_providers = set()
+        self._stale_cached_sources = {}
+        self.provider_stats = ProviderStats()
+        self._provider_telemetry = []
+        self._timed_out = False
+        self.scrape_history = ScrapeHistory()
+        self._arrival_times = {}
+        self._scrape_start = time.time()
+        self._learned_deadline = None
+        self._learned_cutoff = None
+        # Each provider type keeps its full number of workers instead of competing for the global cap
+        self.torrent_threads = ThreadPool(dedicated=True)
+        self.hoster_threads = ThreadPool(dedicated=True)
+        self.adaptive_threads = ThreadPool(dedicated=True)
+        self.direct_threads = ThreadPool(dedicated=True)
         self.item_information = item_information
         self.media_type = self.item_information['info']['mediatype']
         self.torrent_providers = []
@@ -61,6 +77,11 @@ class Sources:
         self.cloud_scrapers = []
         self.running_providers = []
         self.language = 'en'
+        self.recorder = None
+        if g.get_bool_setting('general.recordScrapes'):
+            from resources.lib.common.scrape_replay import ScrapeRecorder
+
+            self.recorder = ScrapeRecorder(self.item_information)
         self.sources_information = {
             "directSources": [],
             "adaptiveSources": [],
@@ -90,14 +111,18 @@ class Sources:
             },
         }
 
+        # Filtered statistics used for pre-termination, which leave out stale cached sources
+        self._preem_statistics = self.sources_information['statistics']['filtered']
         self.hoster_domains = {}
         self.progress = 0
         self.timeout_progress = 0
         self.runtime = 0
-        self.host_domains = []
-        self.host_names = []
+        self.hoster_index = None
         self.timeout = g.get_int_setting('general.timeout')
-        self.window = SourceWindowAdapter(self.item_information, self)
+        self.streaming = streaming
+        self._streamed_sources = {}
+        self.background = g.REQUEST_PARAMS.get('action', '') == "backgroundPreScrape"
+        self.window = SourceWindowAdapter(self.item_information, self, silent=self.streaming or self.background)
 
         self.silent = g.get_bool_runtime_setting('tempSilent')
 
@@ -113,6 +138,9 @@ class Sources:
         self.preem_resolutions = approved_qualities[
             g.get_int_setting("general.maxResolution") : self._get_pre_term_min()
         ]
+        self.preem_learned = g.get_bool_setting('preem.learned')
+        self.preem_learned_confidence = g.get_int_setting('preem.learned.confidence') / 100
+        self.preem_learned_override = g.get_int_setting(f'preem.learned.deadline.{self.media_type}')
 
     def get_sources(self, overwrite_torrent_cache=False):
         """
@@ -122,6 +150,7 @@ class Sources:
         :rtype: tuple
         """
         try:
+            self._scrape_start = time.time()
             g.log('Starting Scraping', 'debug')
             g.log(f"Timeout: {self.timeout}", 'debug')
             g.log(f"Pre-term-enabled: {self.preem_enabled}", 'debug')
@@ -137,8 +166,10 @@ class Sources:
 
             if overwrite_torrent_cache:
                 self._clear_local_torrent_results()
+                self.scrape_cache.clear_item(self.item_information)
             else:
                 self._check_local_torrent_database()
+                self._get_cached_scrape_results()
 
             self._update_progress()
             if self._prem_terminate():
@@ -162,6 +193,8 @@ class Sources:
             self._create_hoster_threads()
             self._create_adaptive_threads()
             self._create_direct_threads()
+            self._learned_deadline = self._get_learned_deadline()
+            g.log(f"Learned pre-term deadline: {self._learned_deadline}", 'debug')
 
             start_time = time.time()
             while (
@@ -192,7 +225,7 @@ class Sources:
             # Keep alive for gui display and threading
             g.log('Entering Keep Alive', 'info')
 
-            while self.progress < 100 and not g.abort_requested():
+            while (self.progress < 100 or self._has_pending_tasks()) and not g.abort_requested():
                 self.runtime = time.time() - start_time
                 self._update_progress()
                 self.timeout_progress = int(100 - float(1 - (self.runtime / float(self.timeout))) * 100)
@@ -230,26 +263,44 @@ class Sources:
 
                 g.log(f"Remaining Providers {self.sources_information['statistics']['remainingProviders']}", "debug")
                 if self._prem_terminate() is True or (
-                    len(self.sources_information['statistics']['remainingProviders']) == 0 and self.runtime > 5
+                    len(self.sources_information['statistics']['remainingProviders']) == 0
+                    and self.runtime > 5
+                    and not self._has_pending_tasks()
                 ):
                     # Give some time for scrapers to initiate
                     break
 
+                if self.background and pre_scrape_queue.is_paused():
+                    g.log('Playback started, cancelling background pre-scrape', 'info')
+                    self.cancel_scrape()
+
                 if self.canceled or self.runtime >= self.timeout:
+                    self._timed_out = not self.canceled
                     monkey_requests.PRE_TERM_BLOCK = True
                     break
 
                 xbmc.sleep(200)
 
             g.log('Exited Keep Alive', 'info')
+            # Providers finishing after the last check of the loop are not counted yet
+            self._update_progress()
             return self._finalise_results()
 
         finally:
             self.window.close()
 
+    def _has_pending_tasks(self):
+        # Providers only count as remaining once their task is running, so a task waiting for a worker is not counted
+        return any(
+            not task.done()
+            for pool in (self.torrent_threads, self.hoster_threads, self.adaptive_threads, self.direct_threads)
+            for task in pool.tasks
+        )
+
     def _handle_pre_scrape_modifiers(self):
         """
-        Detects preScrape, disables pre-termination and sets timeout to maximum value
+        Detects preScrape, disables pre-termination and sets timeout to maximum value.
+        Background pre-scrapes keep the users timeout but also scrape every provider so the caches are complete
         :return:
         :rtype:
         """
@@ -257,32 +308,36 @@ class Sources:
             self.silent = True
             self.timeout = 180
             self._prem_terminate = self._disabled_prem_terminate
+        elif self.background:
+            self.silent = True
+            self._prem_terminate = self._disabled_prem_terminate
 
     def _disabled_prem_terminate(self):
         return False
 
+    def _order_providers(self, providers):
+        return self.provider_stats.order_providers(providers, self.media_type)
+
     def _create_hoster_threads(self):
         if self._hosters_enabled():
-            random.shuffle(self.hoster_providers)
-            for i in self.hoster_providers:
+            for i in self._get_uncached_providers('hosters', self._order_providers(self.hoster_providers)):
                 self.hoster_threads.put(self._get_hosters, self.item_information, i)
 
     def _create_torrent_threads(self):
         if self._torrents_enabled():
-            random.shuffle(self.torrent_providers)
-            for i in self.torrent_providers:
+            for i in self._order_providers(self.torrent_providers):
                 self.torrent_threads.put(
                     self._get_provider_sources, self.item_information, i, 'torrentCache', self._process_torrent_source
                 )
 
     def _create_adaptive_threads(self):
-        for i in self.adaptive_providers:
+        for i in self._get_uncached_providers('adaptive', self._order_providers(self.adaptive_providers)):
             self.adaptive_threads.put(
                 self._get_provider_sources, self.item_information, i, 'adaptive', self._process_adaptive_source
             )
 
     def _create_direct_threads(self):
-        for i in self.direct_providers:
+        for i in self._get_uncached_providers('direct', self._order_providers(self.direct_providers)):
             self.direct_threads.put(
                 self._get_provider_sources, self.item_information, i, 'direct', self._process_direct_source
             )
@@ -298,17 +353,128 @@ class Sources:
             )
             self._get_local_torrent_results()
 
-    def _is_playable_source(self, filtered=False):
-        stats = self.sources_information['statistics']
-        stats = stats['filtered'] if filtered else stats
+    def _get_cached_scrape_results(self):
+        """
+        Loads cached hoster, adaptive, direct and cloud results for the item.
+        Providers with fresh results are not scraped again, stale results are shown until the provider refreshes them
+        :return: None
+        :rtype: None
+        """
+        for cached in self.scrape_cache.get_sources(self.item_information):
+            provider_type = cached['provider_type']
+            cache_key = (provider_type, cached['provider'])
+            if provider_type == 'hosters':
+                sources = {key: Source(source) for key, source in cached['sources'].items()}
+            else:
+                sources = [Source(source) for source in cached['sources']]
+
+            if cached['fresh']:
+                self._fresh_cached_providers.add(cache_key)
+            else:
+                self._stale_cached_sources[cache_key] = sources
+
+            if provider_type == 'hosters':
+                self.mark_arrivals(sources.values(), from_cache=True)
+                self.sources_information['hosterSources'].update(sources)
+            else:
+                self.mark_arrivals(sources, from_cache=True)
+                if provider_type == 'cloud':
+                    self.sources_information['cloudFiles'] = sources
+                else:
+                    self.sources_information[f'{provider_type}Sources'] += sources
+
+    @staticmethod
+    def _get_provider_cache_key(provider):
+        return f"{provider[2]}.{provider[1]}"
+
+    def _get_uncached_providers(self, provider_type, providers):
+        return [
+            i for i in providers if (provider_type, self._get_provider_cache_key(i)) not in self._fresh_cached_providers
+        ]
+
+    def _store_scrape_results(self, provider_type, provider_key, sources):
+        # Results may be incomplete once requests have been blocked, so keep what is already cached and only drop the
+        # stale sources the new results replace
+        complete = not (self.canceled or monkey_requests.PRE_TERM_BLOCK)
+        self._drop_stale_sources(provider_type, provider_key, sources, complete)
+        if not complete:
+            return
+
+        # Sources are stored as dictionaries so cached results outlive changes to the Source record
+        if provider_type == 'hosters':
+            sources = {key: source.as_dict() for key, source in sources.items()}
+        else:
+            sources = [source.as_dict() for source in sources]
+        self.scrape_cache.add_sources(self.item_information, provider_key, provider_type, sources)
+
+    def _drop_stale_sources(self, provider_type, provider_key, sources, complete):
+        """
+        Removes stale cached sources once the provider has refreshed them.
+        Complete results replace every stale source, incomplete results only the stale sources they found again
+        :param provider_type: Type of provider the results belong to
+        :type provider_type: str
+        :param provider_key: Cache key of the provider
+        :type provider_key: str
+        :param sources: New results of the provider
+        :type sources: dict|list
+        :param complete: Whether the provider finished scraping
+        :type complete: bool
+        :return: None
+        :rtype: None
+        """
+        cache_key = (provider_type, provider_key)
+        if not (stale_sources := self._stale_cached_sources.pop(cache_key, None)):
+            return
+
+        if provider_type == 'hosters':
+            # Stale hosters found again are already overwritten by the new results
+            if complete:
+                for key in stale_sources.keys() - sources.keys():
+                    self.sources_information['hosterSources'].pop(key, None)
+            elif remaining := {key: source for key, source in stale_sources.items() if key not in sources}:
+                self._stale_cached_sources[cache_key] = remaining
+        elif provider_type == 'cloud':
+            # Cloud files are replaced as a whole by the caller when any were found
+            if not complete and not sources:
+                self._stale_cached_sources[cache_key] = stale_sources
+        else:
+            found = {source_utils.get_source_identity(source) for source in sources}
+            remaining = []
+            for source in stale_sources:
+                if complete or source_utils.get_source_identity(source) in found:
+                    with contextlib.suppress(ValueError):
+                        self.sources_information[f'{provider_type}Sources'].remove(source)
+                else:
+                    remaining.append(source)
+            if remaining:
+                self._stale_cached_sources[cache_key] = remaining
+
+    def _get_stale_source_ids(self):
+        return {
+            id(source)
+            for sources in list(self._stale_cached_sources.values())
+            for source in (sources.values() if isinstance(sources, dict) else sources)
+        }
+
+    @staticmethod
+    def _has_playable_counts(stats):
         return any(
             stats[stype]["total"] > 0
             for stype in ["torrentsCached", "cloudFiles", "adaptiveSources", "hosters", "directSources"]
         )
 
+    def _is_playable_source(self, filtered=False):
+        stats = self.sources_information['statistics']
+        return self._has_playable_counts(stats['filtered'] if filtered else stats)
+
     def _finalise_results(self):
         monkey_requests.allow_provider_requests = False
         self._send_provider_stop_event()
+        self._store_provider_telemetry()
+        if not self.canceled:
+            self.store_scrape_arrivals()
+        if self.recorder and not self.canceled:
+            self.recorder.save()
 
         uncached = [
             i
@@ -316,6 +482,17 @@ class Sources:
             if i['hash'] not in self.sources_information['cached_hashes']
         ]
 
+        # Streamed sources are already displayed, so leave cache assist to the source select window
+        if self.streaming:
+            return uncached, self._get_all_sources(), self.item_information
+
+        # Nothing is waiting on a background pre-scrape, so there is no playback to cancel or cache assist to offer.
+        # A pre-scrape cancelled by playback only has partial results, which must not be cached for the item
+        if self.background:
+            if self.canceled:
+                return None
+            return uncached, self._get_all_sources(), self.item_information
+
         # Check to see if we have any playable unfiltered sources, if not do cache assist
         if not self._is_playable_source():
             self._build_cache_assist()
@@ -325,14 +502,40 @@ class Sources:
             return uncached, [], self.item_information
 
         # Return sources list
-        sources_list = (
+        return uncached, self._get_all_sources(), self.item_information
+
+    def _get_all_sources(self):
+        return (
             list(self.sources_information['torrentCacheSources'].values())
             + list(self.sources_information['hosterSources'].values())
             + self.sources_information['cloudFiles']
             + self.sources_information['adaptiveSources']
             + self.sources_information['directSources']
         )
-        return uncached, sources_list, self.item_information
+
+    def get_source_changes(self):
+        """
+        Collects the playable sources added and removed since the last call, used to stream results while scraping is
+        in progress. Sources are tracked by object, so a torrent replaced by a merged copy or stale cached results
+        replaced by a refresh are streamed as a removal of the old source and an addition of the new one
+        :return: Tuple of lists of added and removed sources
+        :rtype: tuple
+        """
+        current = {id(source): source for source in self._get_all_sources()}
+        added = [source for key, source in current.items() if key not in self._streamed_sources]
+        removed = [source for key, source in self._streamed_sources.items() if key not in current]
+        self._streamed_sources = current
+        return added, removed
+
+    def cancel_scrape(self):
+        """
+        Cancels any providers that are still running
+        :return: None
+        :rtype: None
+        """
+        self.canceled = True
+        monkey_requests.PRE_TERM_BLOCK = True
+        self._send_provider_stop_event()
 
     def _get_imdb_info(self):
         if self.media_type != 'movie':
@@ -355,15 +558,8 @@ class Sources:
     @staticmethod
     def _imdb_suggestions(imdb_id):
         try:
-            import requests
-            from requests.adapters import HTTPAdapter
-            from urllib3 import Retry
-
-            session = requests.Session()
-            retries = Retry(total=5, backoff_factor=0.1, status_forcelist=[429, 500, 502, 503, 504])
-            session.mount("https://", HTTPAdapter(max_retries=retries, pool_maxsize=100))
-
-            resp = session.get(f'https://v2.sg.media-imdb.com/suggestion/t/{imdb_id}.json')
+            url = f'https://v2.sg.media-imdb.com/suggestion/t/{imdb_id}.json'
+            resp = http_sessions.get_session(url).get(url)
             resp = json.loads(resp.text)['d'][0]
             return resp
         except (ValueError, KeyError, IndexError):
@@ -371,7 +567,7 @@ class Sources:
             return {}
 
     def _send_provider_stop_event(self):
-        for provider in self.running_providers:
+        for provider in list(self.running_providers):
             if hasattr(provider, 'cancel_operations') and callable(provider.cancel_operations):
                 provider.cancel_operations()
 
@@ -394,7 +590,7 @@ class Sources:
     def _store_torrent_results(self, torrent_list):
         if len(torrent_list) == 0:
             return
-        self.torrent_cache.add_torrent(self.item_information, torrent_list)
+        self.torrent_cache.add_torrent(self.item_information, [torrent.as_dict() for torrent in torrent_list])
 
     def _clear_local_torrent_results(self):
         if g.get_bool_setting('general.torrentCache'):
@@ -405,12 +601,13 @@ class Sources:
         relevant_torrents = self.torrent_cache.get_torrents(self.item_information)[:100]
 
         if len(relevant_torrents) > 0:
+            relevant_torrents = [
+                Source(torrent, provider=f"{torrent['provider']} (Local Cache)") for torrent in relevant_torrents
+            ]
             for torrent in relevant_torrents:
-                torrent['provider'] = f"{torrent['provider']} (Local Cache)"
-
                 self.sources_information['allTorrents'].update({torrent['hash']: torrent})
 
-            TorrentCacheCheck(self).torrent_cache_check(relevant_torrents, self.item_information)
+            TorrentCacheCheck(self, from_cache=True).torrent_cache_check(relevant_torrents, self.item_information)
 
     @staticmethod
     def _get_best_torrent_to_cache(sources):
@@ -461,13 +658,8 @@ class Sources:
                     del window
 
     def _init_providers(self):
-        sys.path.append(g.ADDON_USERDATA_PATH)
         try:
-            if g.ADDON_USERDATA_PATH not in sys.path:
-                sys.path.append(g.ADDON_USERDATA_PATH)
-                providers = importlib.import_module("providers")
-            else:
-                providers = reload_module(importlib.import_module("providers"))
+            providers = provider_registry.get_providers_package()
         except ValueError:
             g.notification(g.ADDON_NAME, g.get_language_string(30443))
             g.log('No providers installed', 'warning')
@@ -482,25 +674,17 @@ class Sources:
 
         hoster_providers, torrent_providers = self._remove_duplicate_providers(torrent_providers, hoster_providers)
 
-        self.hoster_domains = resolver.Resolver.get_hoster_list()
         self.torrent_providers = torrent_providers
         self.hoster_providers = hoster_providers
         self.adaptive_providers = adaptive_providers
         self.direct_providers = direct_providers
-        self.host_domains = OrderedDict.fromkeys(
-            [
-                host[0].lower()
-                for provider in self.hoster_domains['premium']
-                for host in self.hoster_domains['premium'][provider]
-            ]
-        )
-        self.host_names = OrderedDict.fromkeys(
-            [
-                host[1].lower()
-                for provider in self.hoster_domains['premium']
-                for host in self.hoster_domains['premium'][provider]
-            ]
-        )
+        self._set_hoster_domains(resolver.Resolver.get_hoster_list())
+        if self.recorder:
+            self.recorder.set_providers(self)
+
+    def _set_hoster_domains(self, hoster_domains):
+        self.hoster_domains = hoster_domains
+        self.hoster_index = HosterDomainIndex(hoster_domains)
 
     @staticmethod
     def _remove_duplicate_providers(torrent, hosters):
@@ -522,24 +706,161 @@ class Sources:
 
         return hosters, torrent
 
+    def _start_provider_telemetry(self, provider, provider_type):
+        telemetry = {
+            "provider": provider,
+            "provider_type": provider_type,
+            "start": time.time(),
+            "filtered_yield": 0,
+            "error": False,
+        }
+        self._provider_telemetry.append(telemetry)
+        return telemetry
+
+    @staticmethod
+    def _end_provider_telemetry(telemetry, filtered_sources=None, error=False):
+        if "latency" in telemetry:
+            return
+        telemetry["latency"] = time.time() - telemetry["start"]
+        telemetry["error"] = error
+        if filtered_sources is not None:
+            telemetry["filtered_yield"] = len(list(filtered_sources))
+
+    def _store_provider_telemetry(self):
+        """
+        Records latency, errors, timeouts and filtered yield of the providers run in this scrape.
+        Providers still running are only recorded if the scrape timed out, not if it was terminated early
+        :return: None
+        :rtype: None
+        """
+        if self.canceled:
+            return
+
+        now = time.time()
+        scrapes = []
+        for telemetry in list(self._provider_telemetry):
+            timed_out = "latency" not in telemetry
+            if timed_out and not self._timed_out:
+                continue
+            scrapes.append(
+                dict(telemetry, latency=telemetry.get("latency", now - telemetry["start"]), timed_out=timed_out)
+            )
+        try:
+            self.provider_stats.record_scrapes(self.media_type, scrapes)
+        except Exception as e:
+            g.log(f"Failed to store provider telemetry: {e}", "error")
+
+    def mark_arrivals(self, sources, from_cache=False):
+        """
+        Records how long after the start of the scrape sources became available, the first arrival is kept.
+        Sources read from a local cache arrive almost immediately whatever the providers latency, so they are not
+        learned from unless a provider returns them again
+        :param sources: Playable sources that have just been found
+        :type sources: iterable
+        :param from_cache: True if the sources were read from a local cache instead of scraped
+        :type from_cache: bool
+        :return: None
+        :rtype: None
+        """
+        if from_cache:
+            return
+        elapsed = time.time() - self._scrape_start
+        for source in sources:
+            self._arrival_times.setdefault(
+                source_utils.get_source_identity(source), (elapsed, source.get('type'), source.get('provider'))
+            )
+
+    def store_scrape_arrivals(self, cut_short=False):
+        """
+        Stores when each source arrived so the arrival of the source that gets played can be learned from.
+        A scrape cut short, by the learned deadline or by a source being picked while sources stream in, only saw the
+        sources that arrived before the cut and is stored as censored at it
+        :param cut_short: True if a source is being played before the scrape finished
+        :type cut_short: bool
+        :return: None
+        :rtype: None
+        """
+        if not self._arrival_times:
+            return
+        runtime = time.time() - self._scrape_start
+        cutoff = self._learned_cutoff if self._learned_cutoff is not None else (runtime if cut_short else None)
+        try:
+            self.scrape_history.add_pending(self.item_information, dict(self._arrival_times), runtime, cutoff)
+        except Exception as e:
+            g.log(f"Failed to store scrape arrivals: {e}", "error")
+
+    def _get_learned_deadline(self):
+        """
+        Fetches how long to keep scraping once a playable source is found, an override takes precedence over history
+        :return: Deadline in seconds since the scrape started, None if there is no deadline
+        :rtype: float|None
+        """
+        if not self.preem_enabled or not self.preem_learned:
+            return None
+        if self.preem_learned_override > 0:
+            return self.preem_learned_override
+
+        source_types = {'cloud'}
+        if self.torrent_providers and self._torrents_enabled():
+            source_types.add('torrent')
+        if self.hoster_providers and self._hosters_enabled():
+            source_types.add('hoster')
+        if self.adaptive_providers:
+            source_types.add('adaptive')
+        if self.direct_providers:
+            source_types.add('direct')
+        return self.scrape_history.get_learned_deadline(self.media_type, self.preem_learned_confidence, source_types)
+
     def _exit_thread(self, provider_name):
         if provider_name in self.sources_information['statistics']['remainingProviders']:
             self.sources_information['statistics']['remainingProviders'].remove(provider_name)
 
+    def _get_provider_instance(self, provider, class_name):
+        """
+        Creates an instance of a providers scraping class, wrapped for recording if scrapes are being recorded
+        :param provider: Provider tuple of (import path, provider name, package)
+        :type provider: tuple
+        :param class_name: Name of the scraping class, sources for torrent/adaptive/direct and source for hosters
+        :type class_name: str
+        :return: Instance of the scraping class, None if the provider does not define it
+        :rtype: object|None
+        """
+        provider_module = provider_registry.get_provider_module(provider)
+        if not hasattr(provider_module, class_name):
+            return None
+        instance = getattr(provider_module, class_name)()
+        return self.recorder.wrap_provider(provider, instance) if self.recorder else instance
+
+    def check_debrid_hashes(self, debrid_provider, check, hashes):
+        """
+        Runs a debrid cache check, recording its response if scrapes are being recorded
+        :param debrid_provider: Name of the debrid provider
+        :type debrid_provider: str
+        :param check: Cache check method of the debrid API
+        :type check: callable
+        :param hashes: Hashes to check
+        :type hashes: list
+        :return: Response of the cache check
+        :rtype: Any
+        """
+        return self.recorder.check_hashes(debrid_provider, check, hashes) if self.recorder else check(hashes)
+
     def _get_provider_sources(self, info, provider, provider_type, process_function):
         provider_name = provider[1].upper()
+        telemetry = None
         try:
             self.sources_information['statistics']['remainingProviders'].append(provider_name)
-            provider_module = importlib.import_module(f'{provider[0]}.{provider[1]}')
-            if not hasattr(provider_module, "sources"):
+            provider_source = self._get_provider_instance(provider, "sources")
+            if provider_source is None:
                 g.log("Invalid provider, Source Class missing", "warning")
                 return
-            provider_source = provider_module.sources()
 
             if not hasattr(provider_source, self.media_type):
                 g.log(f"Skipping provider: {provider_name} - Does not support {self.media_type} types", "warning")
                 return
 
+            telemetry = self._start_provider_telemetry(provider, provider_type)
+
             self.running_providers.append(provider_source)
 
             if self.media_type == g.MEDIA_EPISODE:
@@ -569,11 +890,13 @@ class Sources:
             if self.canceled:
                 return
 
-            if len(results) > 0:
-                # Begin filling in optional dictionary returns
-                for result in results:
-                    process_function(result, provider_name, provider, info)
+            # Begin filling in optional dictionary returns
+            results = [process_function(result, provider_name, provider, info) for result in results]
 
+            if provider_type != "torrentCache":
+                self._store_scrape_results(provider_type, self._get_provider_cache_key(provider), results)
+
+            if len(results) > 0:
                 if provider_type == "torrentCache":
                     torrent_results = {value['hash']: value for value in results if value['hash']}
 
@@ -588,51 +911,70 @@ class Sources:
 
                     TorrentCacheCheck(self).torrent_cache_check(list(torrent_results.values()), info)
                     g.log(f"{provider_name} cache check took {time.time() - start_time} seconds", "debug")
+                    results = [
+                        i for i in torrent_results.values() if i['hash'] in self.sources_information['cached_hashes']
+                    ]
                 else:
+                    self.mark_arrivals(results)
                     self.sources_information[f'{provider_type}Sources'] += results
 
+            self._end_provider_telemetry(telemetry, self.source_sorter.filter_sources(results))
             self.running_providers.remove(provider_source)
 
             return
+        except Exception:
+            if telemetry is not None:
+                self._end_provider_telemetry(telemetry, error=True)
+            raise
         finally:
+            if telemetry is not None:
+                self._end_provider_telemetry(telemetry)
             self.sources_information['statistics']['remainingProviders'].remove(provider_name)
 
+    # Fallbacks below are only computed when the provider did not supply the value.
+    # These run in the provider threads for every result, so eager defaults cost GIL time on every scrape
     def _process_torrent_source(self, source, provider_name, provider_module, info):
         source["type"] = "torrent"
         source["release_title"] = source.get("release_title", provider_name)
         source["source"] = provider_name.upper()
-        source["quality"] = source.get("quality", source_utils.get_quality(source["release_title"]))
+        if "quality" not in source:
+            source["quality"] = source_utils.get_quality(source["release_title"])
         source["size"] = self._torrent_filesize(source, info)
-        source["info"] = set(source.get("info", source_utils.get_info(source["release_title"])))
-        source["seeds"] = source.get("seeds", self._torrent_seeds(source))
+        source["info"] = set(source["info"] if "info" in source else source_utils.get_info(source["release_title"]))
+        if "seeds" not in source:
+            source["seeds"] = self._torrent_seeds(source)
         source["provider_imports"] = provider_module
         source["provider"] = source.get("provider_name_override", provider_name.upper())
-        source["hash"] = source.get("hash", self.hash_regex.findall(source["magnet"])[0]).lower()
-        return source
+        if "hash" not in source:
+            source["hash"] = self.hash_regex.search(source["magnet"]).group(1)
+        source["hash"] = source["hash"].lower()
+        return Source(source)
 
     @staticmethod
     def _process_adaptive_source(source, provider_name, provider_module, info):
         source["type"] = "adaptive"
         source["release_title"] = source.get("release_title", provider_name)
         source["source"] = provider_name.upper()
-        source["quality"] = source.get("quality", source_utils.get_quality(source["release_title"]))
+        if "quality" not in source:
+            source["quality"] = source_utils.get_quality(source["release_title"])
         source["size"] = source.get("size", "Variable")
         source["info"] = set(source.get("info", {}))
         source["provider_imports"] = provider_module
         source["provider"] = source.get("provider_name_override", provider_name.upper())
-        return source
+        return Source(source)
 
     @staticmethod
     def _process_direct_source(source, provider_name, provider_module, info):
         source['type'] = 'direct'
         source['release_title'] = source.get("release_title", provider_name)
         source['source'] = provider_name.upper()
-        source['quality'] = source.get("quality", source_utils.get_quality(source['release_title']))
+        if 'quality' not in source:
+            source['quality'] = source_utils.get_quality(source['release_title'])
         source['size'] = source.get("size", "Variable")
         source['info'] = set(source.get("info", {}))
         source['provider_imports'] = provider_module
         source['provider'] = source.get('provider_name_override', provider_name.upper())
-        return source
+        return Source(source)
 
     def _do_hoster_episode(self, provider_source, provider_name, info):
         if not hasattr(provider_source, 'tvshow'):
@@ -672,15 +1014,15 @@ class Sources:
 
     def _get_hosters(self, info, provider):
         provider_name = provider[1].upper()
+        telemetry = None
         self.sources_information['statistics']['remainingProviders'].append(provider_name.upper())
         try:
-            provider_module = importlib.import_module(f'{provider[0]}.{provider[1]}')
-            if hasattr(provider_module, "source"):
-                provider_class = provider_module.source()
-            else:
+            provider_class = self._get_provider_instance(provider, "source")
+            if provider_class is None:
                 self._exit_thread(provider_name)
                 return
 
+            telemetry = self._start_provider_telemetry(provider, 'hosters')
             self.running_providers.append(provider_class)
 
             if self.media_type == g.MEDIA_EPISODE:
@@ -702,6 +1044,7 @@ class Sources:
 
             if not sources:
                 g.log(f'{provider_name}: Found No Sources', 'info')
+                self._store_scrape_results('hosters', self._get_provider_cache_key(provider), {})
                 return
 
             if self.media_type == g.MEDIA_EPISODE:
@@ -709,28 +1052,37 @@ class Sources:
             else:
                 title = f"{self.item_information['info']['title']} ({self.item_information['info']['year']})"
 
-            for source in sources:
-                source.update(
-                    {
-                        "type": "hoster",
-                        "release_title": source.get('release_title', title),
-                        "source": source['source'].upper().split('.')[0],
-                        "size": source.get('size', '0'),
-                        "info": source.get('info', []),
-                        "provider_imports": provider,
-                        "provider": source.get('provider_name_override', provider_name.upper()),
-                    }
+            sources = [
+                Source(
+                    source,
+                    type="hoster",
+                    release_title=source.get('release_title', title),
+                    source=source['source'].upper().split('.')[0],
+                    size=source.get('size', '0'),
+                    info=source.get('info', []),
+                    provider_imports=provider,
+                    provider=source.get('provider_name_override', provider_name.upper()),
                 )
+                for source in sources
+            ]
 
-            sources1 = [i for i in sources for host in self.host_domains if host in i['url']]
-            sources2 = [i for i in sources if i['source'].lower() not in self.host_names and i['direct']]
+            sources1 = [i for i in sources if self.hoster_index.get_domain_providers(i['url'])]
+            sources2 = [i for i in sources if not self.hoster_index.is_premium_name(i['source']) and i['direct']]
 
             sources = sources1 + sources2
 
-            self._debrid_hoster_duplicates(sources)
+            sources = self._debrid_hoster_duplicates(sources)
+            self._store_scrape_results('hosters', self._get_provider_cache_key(provider), sources)
+            self._end_provider_telemetry(telemetry, self.source_sorter.filter_sources(sources.values()))
             self._exit_thread(provider_name)
 
+        except Exception:
+            if telemetry is not None:
+                self._end_provider_telemetry(telemetry, error=True)
+            raise
         finally:
+            if telemetry is not None:
+                self._end_provider_telemetry(telemetry)
             with contextlib.suppress(ValueError):
                 self.sources_information['statistics']['remainingProviders'].remove(provider_name)
 
@@ -761,15 +1113,28 @@ class Sources:
                 },
             ]
 
-            for cloud_scraper in cloud_scrapers:
-                if cloud_scraper['enabled'] and g.get_bool_setting(cloud_scraper['setting']):
-                    self.cloud_scrapers.append(cloud_scraper['provider'])
-                    thread_pool.put(
-                        cloud_scraper['provider'](self._prem_terminate).get_sources, self.item_information, simple_info
-                    )
+            self.cloud_scrapers = [
+                cloud_scraper['provider']
+                for cloud_scraper in cloud_scrapers
+                if cloud_scraper['enabled'] and g.get_bool_setting(cloud_scraper['setting'])
+            ]
+            if ('cloud', CLOUD_INSPECTION_CACHE_KEY) in self._fresh_cached_providers:
+                return
 
-            sources = thread_pool.wait_completion()
-            self.sources_information['cloudFiles'] = sources or []
+            cloud_start = time.time()
+            for cloud_scraper in self.cloud_scrapers:
+                thread_pool.put(cloud_scraper(self._prem_terminate).get_sources, self.item_information, simple_info)
+
+            sources = [Source(source) for source in thread_pool.wait_completion() or []]
+            if self.recorder:
+                self.recorder.add_cloud_files(self.cloud_scrapers, cloud_start, sources)
+            if self.cloud_scrapers:
+                self._store_scrape_results('cloud', CLOUD_INSPECTION_CACHE_KEY, sources)
+            # Keep stale cached cloud files if the refresh was cut short
+            if sources or ('cloud', CLOUD_INSPECTION_CACHE_KEY) not in self._stale_cached_sources:
+                # Cloud files are matched against the local cloud index
+                self.mark_arrivals(sources, from_cache=True)
+                self.sources_information['cloudFiles'] = sources
 
         finally:
             self.sources_information['statistics']['remainingProviders'].remove("Cloud Inspection")
@@ -877,6 +1242,24 @@ class Sources:
             ]
         )
 
+        # Stale cached sources are shown until refreshed, but must not pre-terminate the scrape refreshing them
+        if not (stale_ids := self._get_stale_source_ids()):
+            self._preem_statistics = self.sources_information['statistics']['filtered']
+            return
+
+        def _get_fresh_count_dict(source_list):
+            return _get_quality_count_dict(
+                self.source_sorter.filter_sources([source for source in source_list if id(source) not in stale_ids])
+            )
+
+        self._preem_statistics = {
+            "torrentsCached": self.sources_information['statistics']['filtered']['torrentsCached'],
+            "hosters": _get_fresh_count_dict(list(self.sources_information['hosterSources'].values())),
+            "cloudFiles": _get_fresh_count_dict(self.sources_information['cloudFiles']),
+            "adaptiveSources": _get_fresh_count_dict(self.sources_information['adaptiveSources']),
+            "directSources": _get_fresh_count_dict(self.sources_information['directSources']),
+        }
+
     @staticmethod
     def _build_simple_show_info(info):
         simple_info = {
@@ -962,13 +1345,12 @@ class Sources:
 
     def _debrid_hoster_duplicates(self, sources):
         updated_sources = {}
-        for provider in self.hoster_domains['premium']:
-            for hoster in self.hoster_domains['premium'][provider]:
-                for source in sources:
-                    if hoster[1].lower() == source['source'].lower() or hoster[0].lower() in str(source['url']).lower():
-                        source['debrid_provider'] = provider
-                        updated_sources[f"{provider}_{source['url'].lower()}"] = source
+        for source in sources:
+            for provider in self.hoster_index.get_debrid_providers(source):
+                updated_sources[f"{provider}_{source['url'].lower()}"] = source.copy(debrid_provider=provider)
+        self.mark_arrivals(updated_sources.values())
         self.sources_information['hosterSources'].update(updated_sources)
+        return updated_sources
 
     def _get_pre_term_min(self):
         return (
@@ -988,25 +1370,30 @@ class Sources:
         if not self.preem_enabled:
             return False
 
+        stats = self._preem_statistics
+
         if (
             self.preem_waitfor_cloudfiles
             and "Cloud Inspection" in self.sources_information['statistics']['remainingProviders']
         ):
             return False
 
-        if self.preem_cloudfiles and self.sources_information['statistics']['filtered']['cloudFiles']['total'] > 0:
-            monkey_requests.PRE_TERM_BLOCK = True
-            return True
         if (
-            self.preem_adaptive_sources
-            and self.sources_information['statistics']['filtered']['adaptiveSources']['total'] > 0
+            self._learned_deadline is not None
+            and time.time() - self._scrape_start >= self._learned_deadline
+            and self._has_playable_counts(stats)
         ):
+            if self._learned_cutoff is None:
+                self._learned_cutoff = time.time() - self._scrape_start
+            return self.__preterm_block('Pre-emptively Terminated, learned deadline reached')
+
+        if self.preem_cloudfiles and stats['cloudFiles']['total'] > 0:
             monkey_requests.PRE_TERM_BLOCK = True
             return True
-        if (
-            self.preem_direct_sources
-            and self.sources_information['statistics']['filtered']['directSources']['total'] > 0
-        ):
+        if self.preem_adaptive_sources and stats['adaptiveSources']['total'] > 0:
+            monkey_requests.PRE_TERM_BLOCK = True
+            return True
+        if self.preem_direct_sources and stats['directSources']['total'] > 0:
             monkey_requests.PRE_TERM_BLOCK = True
             return True
 
@@ -1015,28 +1402,20 @@ class Sources:
         try:
             if (
                 self.preem_type == 0
-                and self._get_filtered_count_by_resolutions(
-                    self.preem_resolutions, self.sources_information['statistics']['filtered']['torrentsCached']
-                )
+                and self._get_filtered_count_by_resolutions(self.preem_resolutions, stats['torrentsCached'])
                 >= self.preem_limit
             ):
                 return self.__preterm_block(pre_term_log_string)
             if (
                 self.preem_type == 1
-                and self._get_filtered_count_by_resolutions(
-                    self.preem_resolutions, self.sources_information['statistics']['filtered']['hosters']
-                )
+                and self._get_filtered_count_by_resolutions(self.preem_resolutions, stats['hosters'])
                 >= self.preem_limit
             ):
                 return self.__preterm_block(pre_term_log_string)
             if (
                 self.preem_type == 2
-                and self._get_filtered_count_by_resolutions(
-                    self.preem_resolutions, self.sources_information['statistics']['filtered']['torrentsCached']
-                )
-                + self._get_filtered_count_by_resolutions(
-                    self.preem_resolutions, self.sources_information['statistics']['filtered']['hosters']
-                )
+                and self._get_filtered_count_by_resolutions(self.preem_resolutions, stats['torrentsCached'])
+                + self._get_filtered_count_by_resolutions(self.preem_resolutions, stats['hosters'])
                 >= self.preem_limit
             ):
                 return self.__preterm_block(pre_term_log_string)
@@ -1078,7 +1457,7 @@ class Sources:
 
 
 class TorrentCacheCheck:
-    def __init__(self, scraper_class):
+    def __init__(self, scraper_class, from_cache=False):
         self.premiumize_cached = []
         self.realdebrid_cached = []
         self.all_debrid_cached = []
@@ -1087,6 +1466,7 @@ class TorrentCacheCheck:
         self.episode_strings = None
         self.season_strings = None
         self.scraper_class = scraper_class
+        self.from_cache = from_cache
         self.rd_api = real_debrid.RealDebrid()
 
     def store_torrent(self, torrent):
@@ -1103,22 +1483,14 @@ class TorrentCacheCheck:
             tor_key = torrent['hash'] + torrent['debrid_provider']
             sources_information['cached_hashes'].add(torrent['hash'])
             if tor_key in sources_information['torrentCacheSources']:
-                c_size = sources_information['torrentCacheSources'][tor_key].get('size', 0)
-                n_size = torrent.get('size', 0)
-                info = torrent.get('info', [])
-
-                if c_size < n_size:
-                    sources_information['torrentCacheSources'].update({tor_key: torrent})
-
-                    sources_information['torrentCacheSources'][tor_key]['info'].extend(
-                        [
-                            i
-                            for i in info
-                            if i not in sources_information['torrentCacheSources'][tor_key].get('info', [])
-                        ]
+                cached = sources_information['torrentCacheSources'][tor_key]
+                if cached.get('size', 0) < torrent.get('size', 0):
+                    sources_information['torrentCacheSources'][tor_key] = torrent.copy(
+                        info=cached.get('info', frozenset()) | torrent.get('info', frozenset())
                     )
             else:
                 sources_information['torrentCacheSources'].update({tor_key: torrent})
+            self.scraper_class.mark_arrivals([torrent], from_cache=self.from_cache)
         except AttributeError:
             return
 
@@ -1132,14 +1504,15 @@ class TorrentCacheCheck:
         :return: None
         :rtype: None
         """
+        # Workers store copies of the cached torrents, so the torrent list is shared instead of copied per worker
         if g.real_debrid_enabled() and g.get_bool_setting('rd.torrents'):
-            self.threads.put(self._realdebrid_worker, copy.deepcopy(torrent_list), info)
+            self.threads.put(self._realdebrid_worker, torrent_list, info)
 
         if g.premiumize_enabled() and g.get_bool_setting('premiumize.torrents'):
-            self.threads.put(self._premiumize_worker, copy.deepcopy(torrent_list))
+            self.threads.put(self._premiumize_worker, torrent_list)
 
         if g.all_debrid_enabled() and g.get_bool_setting('alldebrid.torrents'):
-            self.threads.put(self._all_debrid_worker, copy.deepcopy(torrent_list))
+            self.threads.put(self._all_debrid_worker, torrent_list)
         self.threads.wait_completion()
 
     def _all_debrid_worker(self, torrent_list):
@@ -1150,7 +1523,9 @@ class TorrentCacheCheck:
             if len(torrent_list) == 0:
                 return
 
-            cache_check = api.check_hash([i['hash'] for i in torrent_list])
+            cache_check = self.scraper_class.check_debrid_hashes(
+                'all_debrid', api.check_hash, [i['hash'] for i in torrent_list]
+            )
 
             if not cache_check:
                 return
@@ -1158,8 +1533,7 @@ class TorrentCacheCheck:
             for idx, i in enumerate(torrent_list):
                 try:
                     if cache_check['magnets'][idx]['instant'] is True:
-                        i['debrid_provider'] = 'all_debrid'
-                        self.store_torrent(i)
+                        self.store_torrent(i.copy(debrid_provider='all_debrid'))
                 except KeyError:
                     g.log(
                         "KeyError in AllDebrid Cache check worker. "
@@ -1175,7 +1549,7 @@ class TorrentCacheCheck:
         try:
             hash_list = [i['hash'] for i in torrent_list]
             api = real_debrid.RealDebrid()
-            real_debrid_cache = api.check_hash(hash_list)
+            real_debrid_cache = self.scraper_class.check_debrid_hashes('real_debrid', api.check_hash, hash_list)
 
             for i in torrent_list:
                 with contextlib.suppress(KeyError):
@@ -1193,8 +1567,8 @@ class TorrentCacheCheck:
         for storage_variant in real_debrid_cache[source['hash']]['rd']:
             if not self.rd_api.is_streamable_storage_type(storage_variant):
                 continue
-            source['debrid_provider'] = 'real_debrid'
-            self.store_torrent(source)
+            self.store_torrent(source.copy(debrid_provider='real_debrid'))
+            break
 
     def _handle_episode_rd_worker(self, source, real_debrid_cache, info):
         for storage_variant in real_debrid_cache[source['hash']]['rd']:
@@ -1203,8 +1577,7 @@ class TorrentCacheCheck:
                 continue
 
             if source_utils.get_best_episode_match('filename', storage_variant.values(), info):
-                source['debrid_provider'] = 'real_debrid'
-                self.store_torrent(source)
+                self.store_torrent(source.copy(debrid_provider='real_debrid'))
                 break
 
     def _premiumize_worker(self, torrent_list):
@@ -1212,12 +1585,13 @@ class TorrentCacheCheck:
             hash_list = [i['hash'] for i in torrent_list]
             if not hash_list:
                 return
-            premiumize_cache = premiumize.Premiumize().hash_check(hash_list)
+            premiumize_cache = self.scraper_class.check_debrid_hashes(
+                'premiumize', premiumize.Premiumize().hash_check, hash_list
+            )
             premiumize_cache = premiumize_cache['response']
             for count, i in enumerate(torrent_list):
                 if premiumize_cache[count] is True:
-                    i['debrid_provider'] = 'premiumize'
-                    self.store_torrent(i)
+                    self.store_torrent(i.copy(debrid_provider='premiumize'))
         except Exception:
             g.log_stacktrace()
 
@@ -1227,9 +1601,9 @@ class SourceWindowAdapter:
     Class to handle different window style for scraper module
     """
 
-    def __init__(self, item_information, scraper_sclass):
+    def __init__(self, item_information, scraper_sclass, silent=False):
         self.trakt_id = 0
-        self.silent = g.get_bool_runtime_setting('tempSilent')
+        self.silent = silent or g.get_bool_runtime_setting('tempSilent')
 
         try:
             self.display_style = g.get_int_setting('general.scrapedisplay')
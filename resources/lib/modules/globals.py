@@ -603,7 +603,12 @@ class GlobalVariables:
         self.CACHE_DB_PATH = tools.translate_path(os.path.join(self.ADDON_USERDATA_PATH, "cache.db"))
         self.TORRENT_CACHE = tools.translate_path(os.path.join(self.ADDON_USERDATA_PATH, "torrentCache.db"))
         self.TORRENT_ASSIST = tools.translate_path(os.path.join(self.ADDON_USERDATA_PATH, "torentAssist.db"))
+        self.SCRAPE_CACHE_DB_PATH = tools.translate_path(os.path.join(self.ADDON_USERDATA_PATH, "scrapeCache.db"))
+        self.SCRAPE_HISTORY_DB_PATH = tools.translate_path(os.path.join(self.ADDON_USERDATA_PATH, "scrapeHistory.db"))
         self.PROVIDER_CACHE_DB_PATH = tools.translate_path(os.path.join(self.ADDON_USERDATA_PATH, "providers.db"))
+        self.PROVIDER_STATS_DB_PATH = tools.translate_path(os.path.join(self.ADDON_USERDATA_PATH, "providerStats.db"))
+        self.CLOUD_INDEX_DB_PATH = tools.translate_path(os.path.join(self.ADDON_USERDATA_PATH, "cloudIndex.db"))
+        self.RATE_LIMITS_DB_PATH = tools.translate_path(os.path.join(self.ADDON_USERDATA_PATH, "rateLimits.db"))
         self.PREMIUMIZE_DB_PATH = tools.translate_path(os.path.join(self.ADDON_USERDATA_PATH, "premiumize.db"))
         self.TRAKT_SYNC_DB_PATH = tools.translate_path(os.path.join(self.ADDON_USERDATA_PATH, "traktSync.db"))
         self.SEARCH_HISTORY_DB_PATH = tools.translate_path(os.path.join(self.ADDON_USERDATA_PATH, "search.db"))
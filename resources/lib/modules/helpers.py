@@ -80,6 +80,19 @@ class SourcesHelper:
                 return
         return Sources(item_information).get_sources(overwrite_torrent_cache=overwrite_cache)
 
+    @staticmethod
+    def stream_sources_enabled():
+        """
+        Checks if sources should be streamed into source select while scraping is in progress
+        :return: True if streaming is enabled and a provider package is installed
+        :rtype: bool
+        """
+        return (
+            g.get_bool_setting("general.streamsources")
+            and not g.get_bool_runtime_setting('tempSilent')
+            and bool(ProviderCache().get_provider_packages())
+        )
+
     def sort_sources(self, item_information, sources_list):
         """
         Method to handle source filtering, sorting and notifications
@@ -0,0 +1,121 @@
+"""
+Registry of HTTP sessions shared by every API client in the interpreter.
+Sessions are keyed by host so instances of a client, and clients talking to the same host, reuse pooled keep-alive
+connections instead of opening new TCP/TLS connections.
+Hosts with a rate_limit policy share a token bucket across processes, see rate_limiter
+"""
+import threading
+from urllib import parse
+
+DEFAULT_POLICY = {
+    "pool_maxsize": 20,
+    "retries": {"total": 5, "backoff_factor": 0.1, "status_forcelist": [500, 502, 503, 504]},
+}
+
+# Pool sizes follow the number of threads that call a host at once, larger pools only keep more idle connections.
+# Rate limits are the published limits of each API, in requests per second with the burst allowed as capacity
+HOST_POLICIES = {
+    "api.trakt.tv": {
+        "pool_maxsize": 20,
+        # 1000 GET requests every 5 minutes
+        "rate_limit": {"rate": 3.3, "capacity": 20},
+        "retries": {
+            "total": 4,
+            "backoff_factor": 0.3,
+            "status_forcelist": [429, 500, 502, 503, 504, 520, 521, 522, 524, 530],
+        },
+    },
+    "api.themoviedb.org": {
+        "pool_maxsize": 80,
+        # Roughly 50 requests a second per IP
+        "rate_limit": {"rate": 40, "capacity": 40},
+        "retries": {"total": 5, "backoff_factor": 0.1, "status_forcelist": [429, 500, 503, 504, 520, 521, 522, 524]},
+    },
+    "api.thetvdb.com": {"pool_maxsize": 40},
+    "webservice.fanart.tv": {"pool_maxsize": 40},
+    "www.omdbapi.com": {
+        "pool_maxsize": 20,
+        "retries": {"total": 5, "backoff_factor": 0.1, "status_forcelist": [500, 503, 504, 520, 521, 522, 524]},
+    },
+    "api.real-debrid.com": {
+        "pool_maxsize": 10,
+        # 250 requests a minute
+        "rate_limit": {"rate": 4, "capacity": 10},
+    },
+    "www.premiumize.me": {"pool_maxsize": 10},
+    "api.alldebrid.com": {
+        "pool_maxsize": 10,
+        # 12 requests a second and 600 a minute
+        "rate_limit": {"rate": 10, "capacity": 12},
+        "retries": {"total": 5, "backoff_factor": 0.1, "status_forcelist": [429, 500, 502, 503, 504]},
+    },
+    "v2.sg.media-imdb.com": {
+        "pool_maxsize": 2,
+        "retries": {"total": 5, "backoff_factor": 0.1, "status_forcelist": [429, 500, 502, 503, 504]},
+    },
+}
+
+_lock = threading.Lock()
+_sessions = {}
+
+
+def _get_host(url):
+    if "//" not in url:
+        url = f"//{url}"
+    return (parse.urlsplit(url).hostname or "").lower()
+
+
+def _create_session(host):
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3 import Retry
+
+    policy = dict(DEFAULT_POLICY, **HOST_POLICIES.get(host, {}))
+    session = requests.Session()
+    # Each session only talks to its own host, so a single pool is needed
+    if rate_limit := policy.get("rate_limit"):
+        from resources.lib.modules import rate_limiter
+
+        limiter = rate_limiter.get_limiter(host, **rate_limit)
+        adapter = rate_limiter.RateLimitedAdapter(
+            limiter,
+            max_retries=rate_limiter.RateLimitedRetry(limiter=limiter, **policy["retries"]),
+            pool_connections=1,
+            pool_maxsize=policy["pool_maxsize"],
+        )
+    else:
+        adapter = HTTPAdapter(
+            max_retries=Retry(**policy["retries"]), pool_connections=1, pool_maxsize=policy["pool_maxsize"]
+        )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session(url):
+    """
+    Fetches the shared session for the host of a URL, creating it with the hosts pool size and retry policy on first use
+    :param url: URL or host name the session will be used for
+    :type url: str
+    :return: Session shared by all callers for the host
+    :rtype: requests.Session
+    """
+    host = _get_host(url)
+    if session := _sessions.get(host):
+        return session
+    with _lock:
+        if host not in _sessions:
+            _sessions[host] = _create_session(host)
+        return _sessions[host]
+
+
+def close_sessions():
+    """
+    Closes every shared session, dropping their pooled connections
+    :return: None
+    :rtype: None
+    """
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
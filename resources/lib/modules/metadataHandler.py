@@ -597,12 +597,19 @@ class MetadataHandler:
 
     # region movie
     def _update_movie(self, db_object):
+        tmdb_plan = self._plan_movie_tmdb(db_object)
         self._update_movie_trakt(db_object)
-        self._update_movie_tmdb(db_object)
+        self._update_movie_tmdb(db_object, tmdb_plan)
         self._update_movie_fanart(db_object)
-        self._update_movie_fallback(db_object)
-        self._update_movie_ratings(db_object)
-        self._update_movie_cast(db_object)
+        self._update_movie_fallback(db_object, tmdb_plan)
+        self._update_movie_ratings(db_object, tmdb_plan)
+        self._update_movie_cast(db_object, tmdb_plan)
+
+    def _plan_movie_tmdb(self, db_object):
+        tmdb_plan = self.tmdb_api.plan_movie(db_object.get("tmdb_id"))
+        if self.metadata_location == META_TMDB:
+            return tmdb_plan.add("info")
+        return tmdb_plan.add("art", "cast", "rating")
 
     def _update_movie_trakt(self, db_object):
         if (
@@ -624,16 +631,16 @@ class MetadataHandler:
         ):
             db_object["trakt_object"]["info"]["releases"] = self.trakt_api.get_movie_release_info(db_object["trakt_id"])
 
-    def _update_movie_tmdb(self, db_object):
+    def _update_movie_tmdb(self, db_object, tmdb_plan):
         if (
             (self.metadata_location == META_TMDB or self.movies_preferred_art_source == ART_TMDB)
             and (self._tmdb_needs_update(db_object) or self._force_update(db_object))
             and self._tmdb_id_valid(db_object)
         ):
             if self.metadata_location == META_TMDB:
-                tools.smart_merge_dictionary(db_object, self.tmdb_api.get_movie(db_object["tmdb_id"]))
+                tools.smart_merge_dictionary(db_object, tmdb_plan.get("info"))
             elif self.movies_preferred_art_source == ART_TMDB:
-                tools.smart_merge_dictionary(db_object, self.tmdb_api.get_movie_art(db_object["tmdb_id"]))
+                tools.smart_merge_dictionary(db_object, tmdb_plan.get("art"))
 
     def _update_movie_fanart(self, db_object):
         if self.fanarttv_api.fanart_support and (self._fanart_needs_update(db_object) or self._force_update(db_object)):
@@ -642,34 +649,41 @@ class MetadataHandler:
             if self._imdb_id_valid(db_object) and self._fanart_needs_update(db_object):
                 tools.smart_merge_dictionary(db_object, self.fanarttv_api.get_movie(db_object.get("imdb_id")))
 
-    def _update_movie_fallback(self, db_object):
+    def _update_movie_fallback(self, db_object, tmdb_plan):
         if (
             self.movies_preferred_art_source == ART_FANART
             and self.metadata_location != META_TMDB
             and not self._fanart_art_meta_up_to_par("movie", db_object)
             and self._tmdb_id_valid(db_object)
         ):
-            tools.smart_merge_dictionary(db_object, self.tmdb_api.get_movie_art(db_object["tmdb_id"]))
+            tools.smart_merge_dictionary(db_object, tmdb_plan.get("art"))
 
-    def _update_movie_ratings(self, db_object):
+    def _update_movie_ratings(self, db_object, tmdb_plan):
         if self._tmdb_id_valid(db_object) and self.metadata_location != META_TMDB:
-            tools.smart_merge_dictionary(db_object, self.tmdb_api.get_movie_rating(db_object["tmdb_id"]))
+            tools.smart_merge_dictionary(db_object, tmdb_plan.get("rating"))
 
-    def _update_movie_cast(self, db_object):
+    def _update_movie_cast(self, db_object, tmdb_plan):
         if self._tmdb_id_valid(db_object) and self.metadata_location != META_TMDB:
-            tools.smart_merge_dictionary(db_object, self.tmdb_api.get_movie_cast(db_object["tmdb_id"]))
+            tools.smart_merge_dictionary(db_object, tmdb_plan.get("cast"))
 
     # endregion
 
     # region tvshow
     def _update_tvshow(self, db_object):
+        tmdb_plan = self._plan_tvshow_tmdb(db_object)
         self._update_tvshow_trakt(db_object)
-        self._update_tvshow_tmdb(db_object)
+        self._update_tvshow_tmdb(db_object, tmdb_plan)
         self._update_tvshow_tvdb(db_object)
         self._update_tvshow_fanart(db_object)
-        self._update_tvshow_fallback(db_object)
-        # self._update_tvshow_rating(db_object)  # Commenting for now to reduce tvdb calls
-        self._update_tvshow_cast(db_object)
+        self._update_tvshow_fallback(db_object, tmdb_plan)
+        # self._update_tvshow_rating(db_object, tmdb_plan)  # Commenting for now to reduce tvdb calls
+        self._update_tvshow_cast(db_object, tmdb_plan)
+
+    def _plan_tvshow_tmdb(self, db_object):
+        tmdb_plan = self.tmdb_api.plan_show(db_object.get("tmdb_id"))
+        if self.metadata_location == META_TRAKT:
+            return tmdb_plan.add("art", "cast")
+        return tmdb_plan.add("info")
 
     def _update_tvshow_trakt(self, db_object):
         if (
@@ -688,16 +702,16 @@ class MetadataHandler:
 
             db_object["trakt_object"]["info"]["aliases"] = self.trakt_api.get_show_aliases(db_object["trakt_id"])
 
-    def _update_tvshow_tmdb(self, db_object):
+    def _update_tvshow_tmdb(self, db_object, tmdb_plan):
         if (
             (self.metadata_location == META_TMDB or self.tvshows_preferred_art_source == ART_TMDB)
             and (self._tmdb_needs_update(db_object) or self._force_update(db_object))
             and self._tmdb_id_valid(db_object)
         ):
             if self.metadata_location == META_TMDB:
-                tools.smart_merge_dictionary(db_object, self.tmdb_api.get_show(db_object["tmdb_id"]))
+                tools.smart_merge_dictionary(db_object, tmdb_plan.get("info"))
             elif self.tvshows_preferred_art_source == ART_TMDB:
-                tools.smart_merge_dictionary(db_object, self.tmdb_api.get_show_art(db_object["tmdb_id"]))
+                tools.smart_merge_dictionary(db_object, tmdb_plan.get("art"))
 
     def _update_tvshow_tvdb(self, db_object):
         if (
@@ -718,7 +732,7 @@ class MetadataHandler:
         ):
             tools.smart_merge_dictionary(db_object, self.fanarttv_api.get_show(db_object.get("tvdb_id")))
 
-    def _update_tvshow_fallback(self, db_object):
+    def _update_tvshow_fallback(self, db_object, tmdb_plan):
         if self._tvdb_id_valid(db_object):
             if (
                 self.metadata_location == META_TMDB
@@ -740,29 +754,29 @@ class MetadataHandler:
                 and not tools.safe_dict_get(db_object, "tmdb_object", "info")
                 and not self._tvdb_info_meta_up_to_par(db_object)
             ):
-                tools.smart_merge_dictionary(db_object, self.tmdb_api.get_show(db_object["tmdb_id"]))
+                tools.smart_merge_dictionary(db_object, tmdb_plan.get("info"))
             if (
                 self.tvshows_preferred_art_source != ART_TMDB
                 and self.metadata_location != META_TMDB
                 and not self._tmdb_art_meta_up_to_par("tvshow", db_object)
                 and not self._tvdb_art_meta_up_to_par("tvshow", db_object)
             ):
-                tools.smart_merge_dictionary(db_object, self.tmdb_api.get_show_art(db_object["tmdb_id"]))
+                tools.smart_merge_dictionary(db_object, tmdb_plan.get("art"))
 
-    def _update_tvshow_rating(self, db_object):
+    def _update_tvshow_rating(self, db_object, tmdb_plan):
         if not tools.safe_dict_get(db_object, "tmdb_object", "info") and self._tmdb_id_valid(db_object):
-            tools.smart_merge_dictionary(db_object, self.tmdb_api.get_show_rating(db_object["tmdb_id"]))
+            tools.smart_merge_dictionary(db_object, tmdb_plan.get("rating"))
         if not tools.safe_dict_get(db_object, "tvdb_object", "info") and self._tvdb_id_valid(db_object):
             tools.smart_merge_dictionary(db_object, self.tvdb_api.get_show_rating(db_object["tvdb_id"]))
 
-    def _update_tvshow_cast(self, db_object):
+    def _update_tvshow_cast(self, db_object, tmdb_plan):
         if (
             not tools.safe_dict_get(db_object, "tmdb_object", "cast")
             and self._tmdb_id_valid(db_object)
             and not tools.safe_dict_get(db_object, "tvdb_object", "cast")
             and self.metadata_location != META_TVDB
         ):
-            tools.smart_merge_dictionary(db_object, self.tmdb_api.get_show_cast(db_object["tmdb_id"]))
+            tools.smart_merge_dictionary(db_object, tmdb_plan.get("cast"))
         if (
             not tools.safe_dict_get(db_object, "tvdb_object", "cast")
             and self._tvdb_id_valid(db_object)
@@ -775,33 +789,30 @@ class MetadataHandler:
 
     # region season
     def _update_season(self, db_object):
-        self._update_season_tmdb(db_object)
+        tmdb_plan = self._plan_season_tmdb(db_object)
+        self._update_season_tmdb(db_object, tmdb_plan)
         self._update_season_tvdb(db_object)
         self._update_season_fanart(db_object)
-        self._update_season_fallback(db_object)
+        self._update_season_fallback(db_object, tmdb_plan)
+
+    def _plan_season_tmdb(self, db_object):
+        tmdb_plan = self.tmdb_api.plan_season(
+            db_object.get("tmdb_show_id"), tools.safe_dict_get(db_object, "trakt_object", "info", "season")
+        )
+        if self.metadata_location == META_TRAKT:
+            return tmdb_plan.add("art")
+        return tmdb_plan.add("info")
 
-    def _update_season_tmdb(self, db_object):
+    def _update_season_tmdb(self, db_object, tmdb_plan):
         if (
             (self.metadata_location == META_TMDB or self.tvshows_preferred_art_source == ART_TMDB)
             and (self._tmdb_needs_update(db_object) or self._force_update(db_object))
             and self._tmdb_show_id_valid(db_object)
         ):
             if self.metadata_location == META_TMDB:
-                tools.smart_merge_dictionary(
-                    db_object,
-                    self.tmdb_api.get_season(
-                        db_object["tmdb_show_id"],
-                        tools.safe_dict_get(db_object, "trakt_object", "info", "season"),
-                    ),
-                )
+                tools.smart_merge_dictionary(db_object, tmdb_plan.get("info"))
             elif self.tvshows_preferred_art_source == ART_TMDB:
-                tools.smart_merge_dictionary(
-                    db_object,
-                    self.tmdb_api.get_season_art(
-                        db_object["tmdb_show_id"],
-                        tools.safe_dict_get(db_object, "trakt_object", "info", "season"),
-                    ),
-                )
+                tools.smart_merge_dictionary(db_object, tmdb_plan.get("art"))
 
     def _update_season_tvdb(self, db_object):
         if (
@@ -831,20 +842,14 @@ class MetadataHandler:
                 ),
             )
 
-    def _update_season_fallback(self, db_object):
+    def _update_season_fallback(self, db_object, tmdb_plan):
         if self._tmdb_show_id_valid(db_object):
             if (
                 self.metadata_location == META_TVDB
                 and not tools.safe_dict_get(db_object, "tmdb_object", "info")
                 and not self._tvdb_info_meta_up_to_par(db_object)
             ):
-                tools.smart_merge_dictionary(
-                    db_object,
-                    self.tmdb_api.get_season(
-                        db_object["tmdb_show_id"],
-                        tools.safe_dict_get(db_object, "trakt_object", "info", "season"),
-                    ),
-                )
+                tools.smart_merge_dictionary(db_object, tmdb_plan.get("info"))
             if (
                 self.tvshows_preferred_art_source != ART_TMDB
                 and self.metadata_location != META_TMDB
@@ -877,25 +882,26 @@ class MetadataHandler:
 
     # region episode
     def _update_episode(self, db_object):
-        self._update_episode_tmdb(db_object)
+        tmdb_plan = self._plan_episode_tmdb(db_object)
+        self._update_episode_tmdb(db_object, tmdb_plan)
         self._update_episode_tvdb(db_object)
-        self._update_episode_fallback(db_object)
-        # self._update_episode_rating(db_object)  # Commenting for now to reduce tvdb calls
+        self._update_episode_fallback(db_object, tmdb_plan)
+        # self._update_episode_rating(db_object, tmdb_plan)  # Commenting for now to reduce tvdb calls
+
+    def _plan_episode_tmdb(self, db_object):
+        return self.tmdb_api.plan_episode(
+            db_object.get("tmdb_show_id"),
+            tools.safe_dict_get(db_object, "trakt_object", "info", "season"),
+            tools.safe_dict_get(db_object, "trakt_object", "info", "episode"),
+        ).add("info")
 
-    def _update_episode_tmdb(self, db_object):
+    def _update_episode_tmdb(self, db_object, tmdb_plan):
         if (
             (self.metadata_location == META_TMDB or self.tvshows_preferred_art_source == ART_TMDB)
             and (self._tmdb_needs_update(db_object) or self._force_update(db_object))
             and self._tmdb_show_id_valid(db_object)
         ):
-            tools.smart_merge_dictionary(
-                db_object,
-                self.tmdb_api.get_episode(
-                    db_object["tmdb_show_id"],
-                    tools.safe_dict_get(db_object, "trakt_object", "info", "season"),
-                    tools.safe_dict_get(db_object, "trakt_object", "info", "episode"),
-                ),
-            )
+            tools.smart_merge_dictionary(db_object, tmdb_plan.get("info"))
 
     def _update_episode_tvdb(self, db_object):
         if (
@@ -912,7 +918,7 @@ class MetadataHandler:
                 ),
             )
 
-    def _update_episode_fallback(self, db_object):
+    def _update_episode_fallback(self, db_object, tmdb_plan):
         if self._tvdb_show_id_valid(db_object) and (
             self.metadata_location == META_TMDB
             and not self._tmdb_info_meta_up_to_par(db_object)
@@ -933,39 +939,18 @@ class MetadataHandler:
                 and not tools.safe_dict_get(db_object, "tmdb_object", "info")
                 and not self._tvdb_info_meta_up_to_par(db_object)
             ):
-                tools.smart_merge_dictionary(
-                    db_object,
-                    self.tmdb_api.get_episode(
-                        db_object["tmdb_show_id"],
-                        tools.safe_dict_get(db_object, "trakt_object", "info", "season"),
-                        tools.safe_dict_get(db_object, "trakt_object", "info", "episode"),
-                    ),
-                )
+                tools.smart_merge_dictionary(db_object, tmdb_plan.get("info"))
             if (
                 self.tvshows_preferred_art_source != ART_TMDB
                 and self.metadata_location != META_TMDB
                 and not self._tmdb_art_meta_up_to_par("episode", db_object)
                 and not self._tvdb_art_meta_up_to_par("episode", db_object)
             ):
-                tools.smart_merge_dictionary(
-                    db_object,
-                    self.tmdb_api.get_episode_art(
-                        db_object["tmdb_show_id"],
-                        tools.safe_dict_get(db_object, "trakt_object", "info", "season"),
-                        tools.safe_dict_get(db_object, "trakt_object", "info", "episode"),
-                    ),
-                )
+                tools.smart_merge_dictionary(db_object, tmdb_plan.get("art"))
 
-    def _update_episode_rating(self, db_object):
+    def _update_episode_rating(self, db_object, tmdb_plan):
         if not tools.safe_dict_get(db_object, "tmdb_object", "info") and self._tmdb_show_id_valid(db_object):
-            tools.smart_merge_dictionary(
-                db_object,
-                self.tmdb_api.get_episode_rating(
-                    db_object["tmdb_show_id"],
-                    tools.safe_dict_get(db_object, "trakt_object", "info", "season"),
-                    tools.safe_dict_get(db_object, "trakt_object", "info", "episode"),
-                ),
-            )
+            tools.smart_merge_dictionary(db_object, tmdb_plan.get("rating"))
         if not tools.safe_dict_get(db_object, "tvdb_object", "info") and self._tvdb_show_id_valid(db_object):
             tools.smart_merge_dictionary(
                 db_object,
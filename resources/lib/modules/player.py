@@ -1,7 +1,5 @@
 import copy
-import importlib
 import json
-import sys
 import time
 from functools import cached_property
 from urllib import parse
@@ -15,6 +13,7 @@ from resources.lib.database.trakt_sync import bookmark
 from resources.lib.indexers import trakt
 from resources.lib.modules import smartPlay
 from resources.lib.modules.globals import g
+from resources.lib.modules.providers import registry as provider_registry
 
 
 class SerenPlayer(xbmc.Player):
@@ -336,10 +335,7 @@ class SerenPlayer(xbmc.Player):
         g.convert_info_dates(info)
 
         if isinstance(stream_link, dict) and stream_link["type"] == "adaptive":
-            if g.ADDON_USERDATA_PATH not in sys.path:
-                sys.path.append(g.ADDON_USERDATA_PATH)
-            provider = stream_link["provider_imports"]
-            provider_module = importlib.import_module(f"{provider[0]}.{provider[1]}")
+            provider_module = provider_registry.get_provider_module(stream_link["provider_imports"])
             if not hasattr(provider_module, "get_listitem") and hasattr(provider_module, "sources"):
                 provider_module = provider_module.sources()
             item = provider_module.get_listitem(stream_link)
@@ -0,0 +1,178 @@
+import collections
+import time
+
+import xbmc
+
+from resources.lib.common import tools
+from resources.lib.modules.globals import g
+
+PREDICTED_ITEM_KEY = "prescrape.queue.predicted"
+PAUSED_KEY = "prescrape.queue.paused"
+RUNNING_KEY = "prescrape.queue.running.{}"
+
+# Seconds between checks for items to pre-scrape
+CHECK_INTERVAL = 5
+# Seconds between refreshes of the Next Up candidates
+CANDIDATE_REFRESH = 15 * 60
+# Seconds before an item is pre-scraped again, matches the refresh period of the scrape cache
+RESCRAPE_AFTER = 60 * 60
+# Seconds a background scrape may run past the scraping timeout before it is assumed dead
+RUNNING_GRACE = 60
+
+
+def is_enabled():
+    return g.get_bool_setting("prescrape.queue.enabled")
+
+
+def is_paused():
+    return g.get_bool_runtime_setting(PAUSED_KEY)
+
+
+def _get_item_key(action_args):
+    return f"{action_args['mediatype']}_{action_args['trakt_id']}"
+
+
+def predict_show(trakt_show_id):
+    """
+    Marks the first unwatched episode of a show being browsed as the item most likely to be opened next
+    :param trakt_show_id: Trakt ID of the show being browsed
+    :type trakt_show_id: int
+    :return: None
+    :rtype: None
+    """
+    if not is_enabled():
+        return
+
+    from resources.lib.database.trakt_sync.shows import TraktSyncDatabase
+
+    if args := TraktSyncDatabase().get_first_unwatched_episode_args(trakt_show_id):
+        g.set_runtime_setting(PREDICTED_ITEM_KEY, args)
+
+
+def background_pre_scrape(action_args):
+    """
+    Scrapes an item in the background so its results are cached for when it is opened
+    :param action_args: Action args of the item to scrape
+    :type action_args: dict
+    :return: None
+    :rtype: None
+    """
+    from resources.lib.database.providerCache import ProviderCache
+    from resources.lib.modules.helpers import SourcesHelper
+
+    try:
+        # Without providers the helper asks the user to install some, which must not pop up from the background
+        if not is_paused() and ProviderCache().get_provider_packages():
+            SourcesHelper().get_sources(action_args)
+    finally:
+        g.clear_runtime_setting(RUNNING_KEY.format(_get_item_key(action_args)))
+
+
+class PreScrapeQueue:
+    """
+    Service side queue that pre-scrapes the top of the users Next Up list and the item they are most likely to open
+    next while nothing is playing.
+    Each pre-scrape runs in its own plugin invocation, limited by a concurrency and an hourly scrape budget
+    """
+
+    def __init__(self):
+        self._player = xbmc.Player()
+        self._running = {}
+        self._started = collections.deque()
+        self._last_scraped = {}
+        self._candidates = []
+        self._candidates_refreshed = 0
+        self._next_check = 0
+
+    def tick(self, monitor=None):
+        if monitor and monitor.abortRequested():
+            return
+
+        now = time.time()
+        if now < self._next_check:
+            return
+        self._next_check = now + CHECK_INTERVAL
+
+        if not is_enabled():
+            return
+
+        self._update_paused()
+        self._update_running(now)
+        if is_paused():
+            return
+
+        while self._started and self._started[0] < now - 3600:
+            self._started.popleft()
+
+        for args in self._get_candidates(now):
+            if (
+                len(self._running) >= g.get_int_setting("prescrape.queue.concurrency")
+                or len(self._started) >= g.get_int_setting("prescrape.queue.hourly")
+            ):
+                break
+            self._start(args, now)
+
+    def _update_paused(self):
+        playing = self._player.isPlaying()
+        if playing == is_paused():
+            return
+        if playing:
+            # Running scrapes cancel themselves when paused, retry them once playback has finished
+            for item_key in self._running:
+                self._last_scraped.pop(item_key, None)
+            g.set_runtime_setting(PAUSED_KEY, True)
+        else:
+            g.clear_runtime_setting(PAUSED_KEY)
+
+    def _update_running(self, now):
+        expired = now - g.get_int_setting("general.timeout") - RUNNING_GRACE
+        for item_key, started in list(self._running.items()):
+            if started < expired or not g.get_bool_runtime_setting(RUNNING_KEY.format(item_key)):
+                self._running.pop(item_key)
+                g.clear_runtime_setting(RUNNING_KEY.format(item_key))
+
+    def _get_candidates(self, now):
+        if now - self._candidates_refreshed > CANDIDATE_REFRESH:
+            self._candidates = self._get_nextup_args()
+            self._candidates_refreshed = now
+
+        candidates = []
+        if predicted := g.get_runtime_setting(PREDICTED_ITEM_KEY):
+            candidates.append(predicted)
+        candidates.extend(self._candidates)
+
+        for args in candidates:
+            action_args = tools.deconstruct_action_args(args)
+            if not isinstance(action_args, dict) or "trakt_id" not in action_args:
+                continue
+            item_key = _get_item_key(action_args)
+            if item_key in self._running or now - self._last_scraped.get(item_key, 0) < RESCRAPE_AFTER:
+                continue
+            yield args
+
+    @staticmethod
+    def _get_nextup_args():
+        count = g.get_int_setting("prescrape.queue.nextup")
+        if count <= 0:
+            return []
+
+        from resources.lib.database.trakt_sync.shows import TraktSyncDatabase
+
+        shows_database = TraktSyncDatabase()
+        episodes = shows_database.get_nextup_episodes(g.get_int_setting("nextup.sort") == 1)[:count]
+        episode_args = shows_database.get_episodes_list_args([i["trakt_id"] for i in episodes])
+        return [episode_args[i["trakt_id"]] for i in episodes if i["trakt_id"] in episode_args]
+
+    def _start(self, args, now):
+        item_key = _get_item_key(tools.deconstruct_action_args(args))
+        g.log(f"Pre-scraping {item_key} in the background", "debug")
+        self._running[item_key] = now
+        self._last_scraped[item_key] = now
+        self._started.append(now)
+        g.set_runtime_setting(RUNNING_KEY.format(item_key), True)
+        xbmc.executebuiltin(f'RunPlugin("plugin://{g.ADDON_ID}/?action=backgroundPreScrape&action_args={args}")')
+
+    def close(self):
+        for item_key in self._running:
+            g.clear_runtime_setting(RUNNING_KEY.format(item_key))
+        g.clear_runtime_setting(PAUSED_KEY)
@@ -1,3 +1,4 @@
+import compileall
 import importlib
 import json
 import os
@@ -182,6 +183,14 @@ class ProviderInstallManager(CustomProviders, ZipManager):
             except Exception as e:
                 raise FileIOError(f"{e} Failed to extract to folder - {folder}") from e
 
+    @staticmethod
+    def _compile_package(pack_name):
+        # Compile at install time so the first scrape after an install does not pay for it
+        for folder in ("providers", "providerModules"):
+            folder_path = os.path.join(g.ADDON_USERDATA_PATH, folder, pack_name)
+            if os.path.isdir(folder_path) and not compileall.compile_dir(folder_path, quiet=1):
+                g.log(f"Failed to compile some modules of {pack_name} in {folder}", "warning")
+
     def _install_zip(self):
         install_progress = None
         # self._remove_root_directory_from_file_paths()
@@ -214,6 +223,7 @@ class ProviderInstallManager(CustomProviders, ZipManager):
             install_progress.update(-1)
 
         self._extract_package_folders(pack_name)
+        self._compile_package(pack_name)
         self._destroy_created_temp_items()
         self._remove_legacy_meta_file(pack_name)
 
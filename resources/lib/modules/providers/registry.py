@@ -0,0 +1,77 @@
+"""
+Keeps the providers package and provider modules imported for the life of the interpreter.
+Imports are only dropped when an installed package changes version or is reinstalled
+"""
+import importlib
+import os
+import sys
+import threading
+
+from resources.lib.database.providerCache import ProviderCache
+from resources.lib.modules.globals import g
+
+_lock = threading.RLock()
+_signature = None
+_providers_package = None
+_provider_modules = {}
+
+
+def _ensure_path():
+    if g.ADDON_USERDATA_PATH not in sys.path:
+        sys.path.append(g.ADDON_USERDATA_PATH)
+
+
+def _get_signature():
+    meta_path = os.path.join(g.ADDON_USERDATA_PATH, "providerMeta")
+    signature = []
+    for package in ProviderCache().get_provider_packages():
+        try:
+            # Meta files are rewritten on every install, so this also catches reinstalls of the same version
+            modified = os.stat(os.path.join(meta_path, package["pack_name"], "meta.json")).st_mtime
+        except OSError:
+            modified = 0
+        signature.append((package["pack_name"], package["version"], modified))
+    return tuple(sorted(signature))
+
+
+def _purge_provider_modules():
+    for name in list(sys.modules):
+        if name.split(".", 1)[0] in ("providers", "providerModules"):
+            del sys.modules[name]
+    _provider_modules.clear()
+    importlib.invalidate_caches()
+
+
+def get_providers_package():
+    """
+    Fetches the providers package, importing it again along with every provider module if installed packages changed
+    :return: The providers package
+    :rtype: module
+    """
+    global _signature, _providers_package
+    with _lock:
+        _ensure_path()
+        signature = _get_signature()
+        if _providers_package is None or signature != _signature:
+            _purge_provider_modules()
+            _providers_package = importlib.import_module("providers")
+            _signature = signature
+        return _providers_package
+
+
+def get_provider_module(provider):
+    """
+    Fetches the module of a provider, importing it on first use
+    :param provider: Provider tuple of (import path, provider name, package)
+    :type provider: tuple|list
+    :return: The providers module
+    :rtype: module
+    """
+    key = (provider[0], provider[1])
+    if module := _provider_modules.get(key):
+        return module
+    with _lock:
+        if key not in _provider_modules:
+            _ensure_path()
+            _provider_modules[key] = importlib.import_module(f"{provider[0]}.{provider[1]}")
+        return _provider_modules[key]
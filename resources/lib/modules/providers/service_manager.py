@@ -14,7 +14,7 @@ class ProvidersServiceManager(CustomProviders, ThreadPool, MessageServer):
 
     def __init__(self):
         super().__init__()
-        ThreadPool.__init__(self)
+        ThreadPool.__init__(self, dedicated=True)
         MessageServer.__init__(self, 'SERVICE_MANAGER_INDEX', 'SERVICE_MANAGER')
         self.poll_database()
         self._registered_services = {}
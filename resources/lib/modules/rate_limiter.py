@@ -0,0 +1,225 @@
+"""
+Rate limiting of API hosts, shared by the service and every plugin invocation.
+Each host has a token bucket in the rate limits database, callers wait for a token before sending a request so bursts
+are smoothed out before the host starts rejecting them. Threads lease a few tokens at a time from the database so
+only a fraction of requests need a database round trip
+"""
+import datetime
+import email.utils
+import json
+import threading
+import time
+
+from requests.adapters import HTTPAdapter
+from urllib3 import Retry
+
+from resources.lib.modules.globals import g
+
+# Tokens leased from the shared bucket are only spent for this long, so an idle process can not hoard them
+LEASE_EXPIRY = 1.0
+# Fraction of a second of the host rate leased at once. Hosts with a low rate lease a single token, as tokens left in
+# a lease when a short lived plugin invocation exits are lost from the burst capacity of every other process
+LEASE_SECONDS = 0.25
+# Longest a caller waits for a token, past this the request is sent and left to the hosts own limiting
+MAX_WAIT = 30
+
+_lock = threading.Lock()
+_limiters = {}
+_database = None
+
+
+def _get_database():
+    global _database
+    if _database is None:
+        from resources.lib.database.rateLimits import RateLimits
+
+        _database = RateLimits()
+    return _database
+
+
+def parse_retry_after(value):
+    """
+    Parses a Retry-After header, given either as seconds or a HTTP date
+    :param value: Value of header
+    :type value: str
+    :return: Epoch the host may be called again, None if the header could not be parsed
+    :rtype: float|None
+    """
+    value = value.strip()
+    if value.isdigit():
+        return time.time() + int(value)
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def parse_x_ratelimit(value):
+    """
+    Parses the X-Ratelimit header sent by Trakt
+    :param value: Value of header, a JSON object with remaining and until
+    :type value: str
+    :return: Epoch the window resets if no requests remain in it, else None
+    :rtype: float|None
+    """
+    try:
+        limit = json.loads(value)
+        if limit.get("remaining", 1) > 0 or not limit.get("until"):
+            return None
+        return datetime.datetime.fromisoformat(limit["until"].replace("Z", "+00:00")).timestamp()
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+class HostRateLimiter:
+    """
+    Hands out tokens for a host, leasing them in small batches from the shared bucket
+    """
+
+    def __init__(self, host, rate, capacity):
+        """
+        :param host: Host name
+        :type host: str
+        :param rate: Requests per second allowed by the host
+        :type rate: float
+        :param capacity: Number of requests that may be sent in a burst
+        :type capacity: int
+        """
+        self.host = host
+        self.rate = rate
+        self.capacity = capacity
+        self.lease = max(1, int(rate * LEASE_SECONDS))
+        self._lock = threading.Lock()
+        self._tokens = 0
+        self._expires = 0
+
+    def _take(self):
+        with self._lock:
+            now = time.time()
+            if self._tokens and now < self._expires:
+                self._tokens -= 1
+                return True, 0
+            taken, wait = _get_database().acquire(self.host, self.rate, self.capacity, self.lease)
+            if not taken:
+                return False, wait
+            self._tokens = taken - 1
+            self._expires = now + LEASE_EXPIRY
+            return True, 0
+
+    def acquire(self):
+        """
+        Waits until a request may be sent to the host
+        :return: True if a token was taken, False if the wait was abandoned
+        :rtype: bool
+        """
+        deadline = time.time() + MAX_WAIT
+        try:
+            while not g.abort_requested():
+                taken, wait = self._take()
+                if taken:
+                    return True
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    g.log(f"Gave up waiting for rate limit of {self.host}", "warning")
+                    return False
+                if g.wait_for_abort(min(wait, remaining)):
+                    return False
+        except Exception as e:  # pylint: disable=broad-except
+            # A broken limits database must not stop requests from being sent
+            g.log(f"Failed to acquire rate limit token for {self.host}: {e}", "error")
+        return False
+
+    def block(self, until):
+        """
+        Stops requests to the host, in every process, until the given time
+        :param until: Epoch the host may be called again
+        :type until: float
+        :return: None
+        :rtype: None
+        """
+        g.log(f"{self.host} is rate limited for {until - time.time():.1f}s", "warning")
+        with self._lock:
+            self._tokens = 0
+        try:
+            _get_database().block(self.host, until)
+        except Exception as e:  # pylint: disable=broad-except
+            g.log(f"Failed to store rate limit of {self.host}: {e}", "error")
+
+    def update_from_response(self, response):
+        """
+        Blocks the host when a response tells the client to back off
+        :param response: Response from the host, either from requests or urllib3
+        :type response: requests.Response|urllib3.response.HTTPResponse
+        :return: True if the host was blocked else False
+        :rtype: bool
+        """
+        status = getattr(response, "status_code", None) or getattr(response, "status", None)
+        headers = response.headers
+        until = None
+        if status in (429, 503) and headers.get("Retry-After"):
+            until = parse_retry_after(headers["Retry-After"])
+        if until is None and headers.get("X-Ratelimit"):
+            until = parse_x_ratelimit(headers["X-Ratelimit"])
+        if until is None and status == 429:
+            until = time.time() + 1 / self.rate
+        if until is None or until <= time.time():
+            return False
+        self.block(until)
+        return True
+
+
+def get_limiter(host, rate, capacity):
+    """
+    Fetches the limiter of a host, creating it on first use
+    :param host: Host name
+    :type host: str
+    :param rate: Requests per second allowed by the host
+    :type rate: float
+    :param capacity: Number of requests that may be sent in a burst
+    :type capacity: int
+    :return: Limiter shared by every session of the host in this process
+    :rtype: HostRateLimiter
+    """
+    if limiter := _limiters.get(host):
+        return limiter
+    with _lock:
+        if host not in _limiters:
+            _limiters[host] = HostRateLimiter(host, rate, capacity)
+        return _limiters[host]
+
+
+class RateLimitedRetry(Retry):
+    """
+    Retry policy that takes a token from the limiter of the host before each retry, blocking the host instead of
+    sleeping when the host asks the client to back off
+    """
+
+    def __init__(self, *args, limiter=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.limiter = limiter
+
+    def new(self, **kw):
+        retry = super().new(**kw)
+        retry.limiter = self.limiter
+        return retry
+
+    def sleep(self, response=None):
+        if not (response and self.limiter.update_from_response(response)):
+            super().sleep(response)
+        self.limiter.acquire()
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """
+    Adapter that waits for a token from the limiter of the host before sending each request
+    """
+
+    def __init__(self, limiter, *args, **kwargs):
+        self.limiter = limiter
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):  # pylint: disable=arguments-differ
+        self.limiter.acquire()
+        response = super().send(request, **kwargs)
+        self.limiter.update_from_response(response)
+        return response
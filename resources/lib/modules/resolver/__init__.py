@@ -1,7 +1,6 @@
 """
 Resolver Module for resolving supplied source information into an object that can be played through Player module
 """
-import importlib
 import sys
 from urllib import parse
 
@@ -9,7 +8,9 @@ import requests
 import xbmcgui
 import xbmcvfs
 
+from resources.lib.common import source_utils
 from resources.lib.common.thread_pool import ThreadPool
+from resources.lib.database.scrapeHistory import ScrapeHistory
 from resources.lib.debrid.all_debrid import AllDebrid
 from resources.lib.debrid.premiumize import Premiumize
 from resources.lib.debrid.real_debrid import RealDebrid
@@ -17,6 +18,7 @@ from resources.lib.modules.exceptions import FileIdentification
 from resources.lib.modules.exceptions import ResolverFailure
 from resources.lib.modules.exceptions import UnexpectedResponse
 from resources.lib.modules.globals import g
+from resources.lib.modules.providers import registry as provider_registry
 from resources.lib.modules.resolver.torrent_resolvers import AllDebridResolver
 from resources.lib.modules.resolver.torrent_resolvers import PremiumizeResolver
 from resources.lib.modules.resolver.torrent_resolvers import RealDebridResolver
@@ -71,10 +73,13 @@ class Resolver:
         """
 
         stream_link = None
+        # Resolving can rewrite the source url, so identify it beforehand
+        source_identity = source_utils.get_source_identity(source)
 
         try:
             if source["type"] == "adaptive":
-                stream_link = source
+                # Providers build the list item of adaptive sources from a plain dictionary
+                stream_link = dict(source)
             elif source["type"] == "direct":
                 stream_link = source["url"]
             elif source["type"] == "torrent":
@@ -103,6 +108,7 @@ class Resolver:
                 stream_link = self._resolve_hoster_or_cloud(source, item_information)
 
             if stream_link:
+                self._record_played_source(item_information, source_identity)
                 return stream_link, source['release_title']
             g.log(f"Failed to resolve source: {source}", "error")
             return None, None
@@ -110,10 +116,16 @@ class Resolver:
             g.log(f'Failed to resolve source: {e}')
             return None, None
 
+    @staticmethod
+    def _record_played_source(item_information, source_identity):
+        try:
+            ScrapeHistory().record_played(item_information, source_identity)
+        except Exception as e:
+            g.log(f"Failed to record played source arrival: {e}", "error")
+
     @staticmethod
     def _handle_provider_imports_resolving(source):
-        provider = source["provider_imports"]
-        provider_module = importlib.import_module(f"{provider[0]}.{provider[1]}")
+        provider_module = provider_registry.get_provider_module(source["provider_imports"])
         if hasattr(provider_module, "source"):
             provider_module = provider_module.source()
 
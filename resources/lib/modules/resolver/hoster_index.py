@@ -0,0 +1,97 @@
+"""
+Index of the hoster domains supported by enabled debrid services, used to match hoster sources to debrid providers.
+The index is cached and only rebuilt when the hoster lists of the debrid services change
+"""
+import datetime
+from urllib import parse
+
+from resources.lib.common import tools
+from resources.lib.modules.globals import g
+
+CACHE_KEY = "hoster_domain_index"
+
+
+def get_url_hostname(url):
+    """
+    Extracts the lower cased hostname from a URL, also accepting URLs without a scheme
+    :param url: URL to extract hostname from
+    :type url: str
+    :return: Hostname, empty if none could be found
+    :rtype: str
+    """
+    url = str(url).strip()
+    if "//" not in url:
+        url = f"//{url}"
+    try:
+        return (parse.urlsplit(url).hostname or "").rstrip(".")
+    except ValueError:
+        return ""
+
+
+def _build_index(premium_hosters):
+    domains = {}
+    names = {}
+    for provider, hosters in premium_hosters.items():
+        for domain, name in hosters:
+            domain_providers = domains.setdefault(domain.lower(), [])
+            if provider not in domain_providers:
+                domain_providers.append(provider)
+            name_providers = names.setdefault(name.lower(), [])
+            if provider not in name_providers:
+                name_providers.append(provider)
+    return {"providers": list(premium_hosters), "domains": domains, "names": names}
+
+
+class HosterDomainIndex:
+    """
+    Maps hoster domains and names to the debrid providers supporting them
+    """
+
+    def __init__(self, hoster_domains):
+        premium_hosters = hoster_domains.get("premium", {})
+        signature = tools.md5_hash(premium_hosters)
+        index = g.CACHE.get(CACHE_KEY)
+        if index == g.CACHE.NOT_CACHED or index.get("signature") != signature:
+            index = _build_index(premium_hosters)
+            index["signature"] = signature
+            g.CACHE.set(CACHE_KEY, index, expiration=datetime.timedelta(days=7))
+        self.providers = index["providers"]
+        self.domains = index["domains"]
+        self.names = index["names"]
+
+    def get_domain_providers(self, url):
+        """
+        Fetches the debrid providers supporting the host of a URL, subdomains of supported domains are matched.
+        Debrid services may list the host at different levels, so every parent domain of the host is checked
+        :param url: URL of source
+        :type url: str
+        :return: List of debrid providers in the order the debrid services were queried
+        :rtype: list
+        """
+        labels = get_url_hostname(url).split(".")
+        matched = set()
+        for i in range(len(labels)):
+            matched.update(self.domains.get(".".join(labels[i:]), ()))
+        return [provider for provider in self.providers if provider in matched]
+
+    def is_premium_name(self, name):
+        """
+        Checks if a hoster name is supported by any debrid provider
+        :param name: Name of hoster
+        :type name: str
+        :return: True if supported else False
+        :rtype: bool
+        """
+        return str(name).lower() in self.names
+
+    def get_debrid_providers(self, source):
+        """
+        Fetches the debrid providers able to resolve a hoster source, matching on hoster name or URL host
+        :param source: Hoster source
+        :type source: dict
+        :return: List of debrid providers in the order the debrid services were queried
+        :rtype: list
+        """
+        matched = set(self.names.get(str(source["source"]).lower(), []))
+        matched.update(self.get_domain_providers(source["url"]))
+        return [provider for provider in self.providers if provider in matched]
@@ -146,42 +146,52 @@ def dispatch(params):
             if overwrite_cache and item_information['info']['mediatype'] == g.MEDIA_EPISODE:
                 g.clear_runtime_setting(f"last_resolved_release_title.{item_information['info']['trakt_show_id']}")
 
-            # Get Sources
-            sources_helper = helpers.SourcesHelper()
-            uncached, sources_list, ii = sources_helper.get_sources(action_args, overwrite_cache=overwrite_cache)
-            if background:
-                background.set_process_started()
-                background.set_text("")
-
-            # Sort sources
-            sources = sources_helper.sort_sources(ii, sources_list)
-            if sources is None:
-                return
-
-            # Select and resolve source
             if item_information['info']['mediatype'] == g.MEDIA_EPISODE:
                 source_select_style = "Episodes"
             else:
                 source_select_style = "Movie"
+            manual_select = g.get_int_setting(f"general.playstyle{source_select_style}") == 1 or source_select
 
-            if g.get_int_setting(f"general.playstyle{source_select_style}") == 1 or source_select:
-
+            sources_helper = helpers.SourcesHelper()
+            if manual_select and sources_helper.stream_sources_enabled():
+                # Open source select straight away and add sources to it as they are found
                 if background:
-                    background.set_text(g.get_language_string(30178))
+                    background.set_process_started()
+                    background.set_text("")
                 from resources.lib.modules import sourceSelect
 
-                xbmc.sleep(750)
+                stream_link = sourceSelect.source_select_stream(item_information, overwrite_cache=overwrite_cache)
+            else:
+                # Get Sources
+                uncached, sources_list, ii = sources_helper.get_sources(action_args, overwrite_cache=overwrite_cache)
                 if background:
+                    background.set_process_started()
                     background.set_text("")
-                stream_link = sourceSelect.source_select(uncached, sources, item_information)
-            else:
-                stream_link = helpers.Resolverhelper().resolve_silent_or_visible(
-                    sources, ii, pack_select, overwrite_cache=overwrite_cache
-                )
-                if stream_link is None:
-                    g.close_busy_dialog()
-                    g.close_all_dialogs()
-                    g.notification(g.ADDON_NAME, g.get_language_string(30032), time=5000)
+
+                # Sort sources
+                sources = sources_helper.sort_sources(ii, sources_list)
+                if sources is None:
+                    return
+
+                # Select and resolve source
+                if manual_select:
+
+                    if background:
+                        background.set_text(g.get_language_string(30178))
+                    from resources.lib.modules import sourceSelect
+
+                    xbmc.sleep(750)
+                    if background:
+                        background.set_text("")
+                    stream_link = sourceSelect.source_select(uncached, sources, item_information)
+                else:
+                    stream_link = helpers.Resolverhelper().resolve_silent_or_visible(
+                        sources, ii, pack_select, overwrite_cache=overwrite_cache
+                    )
+                    if stream_link is None:
+                        g.close_busy_dialog()
+                        g.close_all_dialogs()
+                        g.notification(g.ADDON_NAME, g.get_language_string(30032), time=5000)
 
             if not stream_link:
                 raise NoPlayableSourcesException
@@ -245,6 +255,11 @@ def dispatch(params):
 
         g.log("Pre-scraping completed")
 
+    elif action == "backgroundPreScrape":
+        from resources.lib.modules import pre_scrape_queue
+
+        pre_scrape_queue.background_pre_scrape(action_args)
+
     elif action == "authRealDebrid":
         from resources.lib.debrid import real_debrid
 
@@ -400,6 +415,11 @@ def dispatch(params):
 
         TorrentCache().clear_all()
 
+    elif action == "clearScrapeCache":
+        from resources.lib.database.scrapeCache import ScrapeCache
+
+        ScrapeCache().clear_all()
+
     elif action == "openSettings":
         xbmc.executebuiltin(f"Addon.OpenSettings({g.ADDON_ID})")
 
@@ -792,10 +812,22 @@ def dispatch(params):
 
         run_maintenance()
 
+    elif action == "showLearnedDeadlines":
+        from resources.lib.database.scrapeHistory import ScrapeHistory
+
+        ScrapeHistory().show_learned_deadlines()
+
+    elif action == "runBenchmark":
+        from resources.lib.common.benchmark import run_benchmark
+
+        run_benchmark(action_args)
+
     elif action == "torrentCacheCleanup":
+        from resources.lib.database import scrapeCache
         from resources.lib.database import torrentCache
 
         torrentCache.TorrentCache().do_cleanup()
+        scrapeCache.ScrapeCache().do_cleanup()
 
     elif action == "chooseTimeZone":
         from resources.lib.modules.manual_timezone import choose_timezone
@@ -32,3 +32,39 @@ def source_select(uncached_sources, source_list, item_information):
 
     finally:
         return selection
+
+
+def source_select_stream(item_information, overwrite_cache=False):
+    """
+    Opens source select straight away and adds sources to it as they are found by the scraper
+    :param item_information: Information on the item to scrape for
+    :type item_information: dict
+    :param overwrite_cache: Set to true to ignore locally cached torrents
+    :type overwrite_cache: bool
+    :return: The selected stream link if one was resolved
+    """
+    selection = None
+
+    try:
+        from resources.lib.gui.windows.source_select import SourceSelect
+        from resources.lib.modules.getSources import Sources
+
+        try:
+            window = SourceSelect(
+                *SkinManager().confirm_skin_path("source_select.xml"),
+                item_information=item_information,
+                scraper=Sources(item_information, streaming=True),
+                overwrite_cache=overwrite_cache
+            )
+            selection = window.doModal()
+        finally:
+            del window
+
+        if selection is None:
+            g.notification(g.ADDON_NAME, g.get_language_string(30032), time=5000)
+            raise NoPlayableSourcesException
+        if not selection:
+            g.cancel_playback()
+
+    finally:
+        return selection
@@ -1,12 +1,30 @@
+import heapq
+from collections import Counter
 from difflib import SequenceMatcher
 
 import xbmcgui
 
+from resources.lib.common.source_record import Source
+from resources.lib.common.source_utils import INFO_FLAGS
 from resources.lib.common.source_utils import get_accepted_resolution_set
+from resources.lib.common.source_utils import get_info_flags
 from resources.lib.common.tools import FixedSortPositionObject
 from resources.lib.modules.globals import g
 
 
+class SourceFeatures:
+    """
+    Values of a source that filtering and sorting depend on, computed once per source
+    """
+
+    __slots__ = ("flags", "filtered", "sort_key")
+
+    def __init__(self, flags, filtered):
+        self.flags = flags
+        self.filtered = filtered
+        self.sort_key = None
+
+
 class SourceSorter:
     """
     Handles sorting of sources according to users preferences
@@ -26,6 +44,8 @@ class SourceSorter:
         self.disable_dv = False
         self.disable_hdr = False
         self.filter_set = self._get_filters()
+        self.filter_mask = get_info_flags(self.filter_set)
+        self.hdr_filter_masks = self._get_hdr_filter_masks()
 
         # Size filter settings
         self.enable_size_limit = g.get_bool_setting("general.enablesizelimit")
@@ -39,6 +59,9 @@ class SourceSorter:
         # Sort Methods
         self._get_sort_methods()
 
+        # Features of each source seen, keyed by id and holding a reference to the source so the id isn't reused
+        self._features = {}
+
     def _get_filters(self):
         filter_string = g.get_setting("general.filters")
         current_filters = set() if filter_string is None else set(filter_string.split(","))
@@ -49,41 +72,58 @@ class SourceSorter:
 
         return current_filters.difference({"HDR", "DV"})
 
+    def _get_hdr_filter_masks(self):
+        """
+        Builds (required, excluded) flag mask pairs for the DV/HDR filters, a source is filtered if it has any of the
+        required flags and none of the excluded flags
+        """
+        masks = []
+        if self.disable_dv:
+            masks.append((INFO_FLAGS["DV"], INFO_FLAGS["HYBRID"]))
+        if self.disable_hdr:
+            masks.append((INFO_FLAGS["HDR"], INFO_FLAGS["HYBRID"]))
+        if self.disable_dv and self.disable_hdr:
+            masks.append((INFO_FLAGS["HYBRID"], 0))
+        return masks
+
+    def _get_features(self, source):
+        if (entry := self._features.get(id(source))) is None:
+            entry = self._features[id(source)] = (source, self._create_features(source))
+        return entry[1]
+
+    def _create_features(self, source):
+        flags = source.info_flags if isinstance(source, Source) else None
+        if flags is None:
+            flags = get_info_flags(source.get('info') or ())
+        filtered = (
+            self._is_quality_filtered(source)
+            or bool(flags & self.filter_mask)
+            or any(flags & required and not flags & excluded for required, excluded in self.hdr_filter_masks)
+            or (self.enable_size_limit and self._is_size_filtered(source))
+        )
+        return SourceFeatures(flags, filtered)
+
+    def _is_quality_filtered(self, source):
+        return (
+            source['quality'] not in self.resolution_set
+            and all(quality not in self.resolution_set for quality in source['quality'].split('/'))
+            and source['quality'] != "Unknown"
+        )
+
+    def _is_size_filtered(self, source):
+        size = source.get("size", 0)
+        if isinstance(size, (int, float)):
+            return not (self.size_minimum <= int(size) <= self.size_limit)
+        return isinstance(size, str) and size != "Variable"
+
     def filter_sources(self, source_list):
         # Iterate sources, yielding only those that are not filtered
+        features = self._features
         for source in source_list:
-            # Quality filter
-            if (
-                source['quality'] not in self.resolution_set
-                and all(quality not in self.resolution_set for quality in source['quality'].split('/'))
-                and source['quality'] != "Unknown"
-            ):
-                continue
-            # Info Filter
-            if self.filter_set & source['info']:
-                continue
-            # DV filter
-            if self.disable_dv and "DV" in source['info'] and "HYBRID" not in source['info']:
-                continue
-            # HDR Filter
-            if self.disable_hdr and "HDR" in source['info'] and "HYBRID" not in source['info']:
-                continue
-            # Hybrid Filter
-            if self.disable_dv and self.disable_hdr and "HYBRID" in source['info']:
-                continue
-            if self.enable_size_limit:
-                if (
-                    (
-                        isinstance(size := source.get("size", 0), (int, float))
-                        and not (self.size_minimum <= int(size) <= self.size_limit)
-                    )
-                    or isinstance(size, str)
-                    and size != "Variable"
-                ):
-                    continue
-
-            # If not filtered, yield source
-            yield source
+            if (entry := features.get(id(source))) is None:
+                entry = features[id(source)] = (source, self._create_features(source))
+            if not entry[1].filtered:
+                yield source
 
     def sort_sources(self, sources_list):
         """Takes in a list of sources and filters and sorts them according to Seren's sort settings
@@ -110,6 +150,22 @@ class SourceSorter:
                 return []
         return self._sort_sources(filtered_sources)
 
+    def merge_sources(self, sorted_sources, new_sources):
+        """Filters and sorts newly found sources and merges them into an already sorted list of sources
+
+        :param sorted_sources: list of sources previously sorted by this sorter
+        :type sorted_sources: list
+        :param new_sources: list of sources to add
+        :type new_sources: list
+        :return: sorted list of sources
+        :rtype: list
+        """
+        new_sources = list(self.filter_sources(new_sources))
+        if not new_sources:
+            return sorted_sources
+
+        return list(heapq.merge(sorted_sources, self._sort_sources(new_sources), key=self._get_sort_key))
+
     def _get_sort_methods(self):
         """
         Get Seren settings for sort methods
@@ -132,6 +188,7 @@ class SourceSorter:
                 f"last_resolved_release_title.{self.item_information['info']['trakt_show_id']}"
             )
             if self.last_release_name:
+                self.last_release_name_counts = Counter(self.last_release_name)
                 sort_methods.append((self._get_last_release_name_sort_key, False))
 
         for i in range(1, 9):
@@ -216,15 +273,21 @@ class SourceSorter:
         Sort a source list based on sort_methods defined by settings
         All sort method key methods should return key values for *descending* sort.  If a reversed sort is required,
         reverse is specified as a boolean for the second item of each tuple in sort_methods
+        Ties are broken by release title
         :param sources_list: The list of sources to sort
         :return: The list of sorted sources
         :rtype: list
         """
-        sources_list = sorted(sources_list, key=lambda s: s['release_title'])
-        return sorted(sources_list, key=self._get_sort_key_tuple, reverse=True)
+        return sorted(sources_list, key=self._get_sort_key)
 
-    def _get_sort_key_tuple(self, source):
-        return tuple(-sm(source) if reverse else sm(source) for (sm, reverse) in self.sort_methods if sm)
+    def _get_sort_key(self, source):
+        features = self._get_features(source)
+        if features.sort_key is None:
+            # Negated for a single ascending sort with the release title as tie breaker
+            features.sort_key = tuple(
+                sm(source) if reverse else -sm(source) for (sm, reverse) in self.sort_methods if sm
+            ) + (source['release_title'],)
+        return features.sort_key
 
     def _get_type_sort_key(self, source):
         return self.type_priorities.get(source.get("type"), -99)
@@ -264,15 +327,26 @@ class SourceSorter:
         return max(hdrp, dvp)
 
     def _get_last_release_name_sort_key(self, source):
-        sm = SequenceMatcher(None, self.last_release_name, source['release_title'], autojunk=False)
-        if sm.real_quick_ratio() < 1:
+        release_title = source['release_title']
+        length = len(release_title)
+
+        # A ratio of 1 for real_quick_ratio requires titles of the same length
+        if length != len(self.last_release_name):
             return 0
-        ratio = sm.ratio()
+        if not length:
+            return 1.0
+
+        # quick_ratio from shared character counts is an upper bound on ratio, so skip the matcher if it can't pass
+        shared = sum((self.last_release_name_counts & Counter(release_title)).values())
+        if shared / length < 0.85:
+            return 0
+
+        ratio = SequenceMatcher(None, self.last_release_name, release_title, autojunk=False).ratio()
         return 0 if ratio < 0.85 else ratio
 
     @staticmethod
     def _get_audio_channels_sort_key(source):
         audio_channels = None
         if info := source['info']:
-            audio_channels = {"2.0", "5.1", "7.1"} & info
+            audio_channels = {"2.0", "5.1", "7.1"}.intersection(info)
         return float(max(audio_channels)) if audio_channels else 0
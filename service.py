@@ -11,8 +11,10 @@ if tools.is_stub():
     # noinspection PyUnresolvedReferences
     from mock_kodi import MOCK
 
+from resources.lib.modules import http_sessions
 from resources.lib.modules.globals import g
 
+from resources.lib.modules.pre_scrape_queue import PreScrapeQueue
 from resources.lib.modules.seren_version import do_version_change
 from resources.lib.modules.serenMonitor import SerenMonitor
 from resources.lib.modules.smart_sleep import SmartSleepManager
@@ -33,12 +35,14 @@ g.log("#############  SERVICE ENTERED KEEP ALIVE  #################")
 
 monitor = SerenMonitor()
 smart_sleep_manager = SmartSleepManager()
+pre_scrape_queue = PreScrapeQueue()
 
 
 def wait_for_abort_with_ticks(monitor_handle, smart_sleep, timeout, interval=1):
     deadline = time.monotonic() + timeout
     while not monitor_handle.abortRequested():
         smart_sleep.tick(monitor_handle)
+        pre_scrape_queue.tick(monitor_handle)
         remaining = deadline - time.monotonic()
         if remaining <= 0:
             return False
@@ -65,6 +69,7 @@ try:
     g.wait_for_abort(30)  # Sleep for a half a minute to allow widget loads to complete.
     while not monitor.abortRequested():
         smart_sleep_manager.tick(monitor)
+        pre_scrape_queue.tick(monitor)
         xbmc.executebuiltin('RunPlugin("plugin://plugin.video.seren/?action=runMaintenance")')
         if wait_for_abort_with_ticks(monitor, smart_sleep_manager, 15):
             break
@@ -79,5 +84,7 @@ try:
             break
 finally:
     smart_sleep_manager.close()
+    pre_scrape_queue.close()
+    http_sessions.close_sessions()
     del monitor
     g.deinit()